@@ -0,0 +1,80 @@
+"""
+Design tools around Elliptic filters with minimal Q-factors (EMQF).
+
+Submodules and the public functions and classes listed in `__all__` are
+imported lazily on first attribute access, so ``import filterdesign``
+is cheap and e.g. matplotlib is only loaded when `filterplot` is used.
+Star imports only pull in `__all__`, not the submodules.
+"""
+
+import importlib
+
+_SUBMODULES = (
+    "bench",
+    "cache",
+    "crossover",
+    "design",
+    "emqf",
+    "export",
+    "filtering",
+    "filterplot",
+    "filterutils",
+    "halfband",
+    "hilbert",
+    "instrument",
+    "lookup",
+    "modulation",
+    "oversampling",
+    "prepared",
+    "qmf",
+    "response",
+    "sweep",
+)
+
+_ATTRIBUTES = {
+    "selectivity_factor": "emqf",
+    "emqfap": "emqf",
+    "emqfap_batch": "emqf",
+    "emqf_sos": "emqf",
+    "emqf_allpass_pair": "emqf",
+    "emqford": "emqf",
+    "emqford_batch": "emqf",
+    "DesignCache": "cache",
+    "PreparedDesign": "prepared",
+    "FilterDesign": "design",
+    "cascade": "filterutils",
+    "CascadeBuilder": "filterutils",
+    "SosFilter": "filtering",
+    "AllpassFilter": "filtering",
+    "LatticeAllpassFilter": "filtering",
+    "ModulatedEMQF": "modulation",
+    "HalfbandDecimator": "halfband",
+    "HilbertTransformer": "hilbert",
+    "CrossoverFilterbank": "crossover",
+    "OctaveFilterbank": "qmf",
+    "Upsampler": "oversampling",
+    "Downsampler": "oversampling",
+    "CoefficientTable": "lookup",
+    "export_emqf": "export",
+    "zpk_response": "response",
+    "sos_response": "response",
+    "design_sweep": "sweep",
+    "load_sweep": "sweep",
+}
+
+__all__ = list(_ATTRIBUTES)
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module("." + name, __name__)
+    if name in _ATTRIBUTES:
+        module = importlib.import_module("." + _ATTRIBUTES[name], __name__)
+        value = getattr(module, name)
+        globals()[name] = value  # skip __getattr__ on the next access
+        return value
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULES) | set(__all__))
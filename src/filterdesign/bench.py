@@ -0,0 +1,439 @@
+"""
+Benchmarks for the design and runtime hot paths of filterdesign.
+
+Run all benchmarks and store the results::
+
+    python -m filterdesign.bench --json results.json
+
+The ``import`` suite measures the start-up time of a fresh interpreter
+that imports a single module, i.e. the fixed cost of a worker process.
+
+Compare against a previously stored run, the exit code is 1 if any
+benchmark got slower than the threshold allows::
+
+    python -m filterdesign.bench --baseline results.json --threshold 1.25
+"""
+
+import argparse
+import functools
+import json
+import platform
+import subprocess
+import sys
+import timeit
+
+import numpy as np
+import scipy
+from scipy import signal
+
+from . import (
+    crossover,
+    emqf,
+    filtering,
+    filterutils,
+    halfband,
+    hilbert,
+    lookup,
+    modulation,
+    oversampling,
+    prepared,
+    qmf,
+    response,
+)
+
+ORDERS = (1, 2, 4, 8, 16, 32, 64)
+FS = 48000.0
+CUTOFF = 1000.0
+BLOCK_SIZE = 256
+N_CHANNELS = 8
+STREAMING_BLOCK_SIZES = (1, 16, 64, 256, 1024)
+STREAMING_CHANNELS = (1, 8, 64, 256)
+OVERSAMPLING_FACTORS = (2, 4, 8)
+
+
+def _odd(N):
+    return N if N % 2 else N + 1
+
+
+def _design_cases(N):
+    xi = emqf.selectivity_factor(N, 60)
+    N_batch = np.full(1000, N)
+    a_s_batch = np.linspace(40, 80, 1000)
+    yield "selectivity_factor", lambda: emqf.selectivity_factor(N, 60)
+    yield "emqf_analog_prototype_from_selectivity_factor", lambda: (
+        emqf.emqf_analog_prototype_from_selectivity_factor(N, xi)
+    )
+    yield "emqfap", lambda: emqf.emqfap(N, 60)
+    yield "emqfap_batch_1000", lambda: emqf.emqfap_batch(N_batch, a_s_batch)
+    yield "emqf_sos", lambda: emqf.emqf_sos(N, CUTOFF, FS)
+
+    def scipy_chain():
+        # the same design in separate SciPy steps, reference for emqf_sos
+        z, p, k = emqf.emqfap(N, 60, f3db=True)
+        wc = 2 * FS * np.tan(np.pi * CUTOFF / FS)
+        z, p, k = signal.lp2lp_zpk(z, p, k, wc)
+        return signal.zpk2sos(*signal.bilinear_zpk(z, p, k, FS))
+
+    yield "scipy_zpk2sos_chain", scipy_chain
+    design = prepared.PreparedDesign(N, 60)
+    sos = np.empty((design.n_sections, 6))
+    cutoffs = np.geomspace(20.0, 20000.0, 1000)
+    yield "PreparedDesign.sos", lambda: design.sos(CUTOFF, FS, out=sos)
+    yield "PreparedDesign.sos_1000", lambda: design.sos(cutoffs, FS)
+    yield "emqford", lambda: emqf.emqford(1000.0, 1200.0, 1.0, 60, fs=FS)
+
+
+def _cascade_cases(N):
+    # cascade of N first-order sections
+    zpk = (np.array([-1.0 + 0j]), np.array([0.5 + 0j]), 1.0)
+    sos = np.array([[1.0, 1.0, 0.0, 1.0, -0.5, 0.0]])
+    yield "cascade_zpk", lambda: filterutils.cascade(*([zpk] * max(N, 2)))
+    yield "cascade_sos", lambda: filterutils.cascade(*([sos] * max(N, 2)))
+
+
+def _response_cases(N):
+    zpk = emqf.emqfap(N, 60, f3db=True)
+    sos = emqf.emqf_sos(N, CUTOFF, FS)
+    w = np.logspace(-2, 2, 100000)
+    f = np.linspace(0, FS / 2, 100000)
+    yield "zpk_response_100k", lambda: response.zpk_response(zpk, w)
+    yield "sos_response_100k", lambda: response.sos_response(sos, f, fs=FS)
+
+
+def _runtime_cases(N):
+    x = np.random.default_rng(0).standard_normal((N_CHANNELS, BLOCK_SIZE))
+    out = np.empty_like(x)
+
+    sos_filter = filtering.SosFilter(
+        emqf.emqf_sos(N, CUTOFF, FS), n_channels=N_CHANNELS
+    )
+    yield "SosFilter.process", lambda: sos_filter.process(x, out=out)
+
+    allpass_sos = np.concatenate(emqf.emqf_allpass_pair(_odd(N), CUTOFF, FS))
+    for backend in ("scipy", "numba"):
+        try:
+            allpass_filter = filtering.AllpassFilter(
+                allpass_sos, n_channels=N_CHANNELS, backend=backend
+            )
+        except ImportError:
+            continue  # numba is an optional dependency
+        yield "AllpassFilter[{}].process".format(backend), (
+            lambda f=allpass_filter: f.process(x, out=out)
+        )
+
+    a0, a1 = halfband.halfband_allpass_coefficients(_odd(N))
+    decimator = halfband.HalfbandDecimator(a0, a1, n_channels=N_CHANNELS)
+    yield "HalfbandDecimator.process", lambda: decimator.process(x)
+
+    transformer = hilbert.HilbertTransformer(_odd(N), n_channels=N_CHANNELS)
+    yield "HilbertTransformer.process", lambda: transformer.process(x)
+
+    filterbank = crossover.CrossoverFilterbank(
+        [150.0, 800.0, 2500.0, 9000.0], fs=FS, N=_odd(N), n_channels=N_CHANNELS
+    )
+    yield "CrossoverFilterbank.process", lambda: filterbank.process(x)
+
+    octaves = qmf.OctaveFilterbank(4, N=_odd(N), n_channels=N_CHANNELS)
+    yield "OctaveFilterbank.analysis+synthesis", lambda: octaves.synthesis(
+        octaves.analysis(x)
+    )
+
+    if N >= 3:
+        modulated = modulation.ModulatedEMQF(_odd(N), CUTOFF, FS, n_channels=N_CHANNELS)
+        cutoffs = np.geomspace(CUTOFF, 2 * CUTOFF, BLOCK_SIZE)
+        yield "ModulatedEMQF.process", lambda: modulated.process(x, cutoff=cutoffs)
+
+    upsampler = oversampling.Upsampler(4, n_channels=N_CHANNELS)
+    yield "Upsampler[4].process", lambda: upsampler.process(x)
+
+    downsampler = oversampling.Downsampler(4, n_channels=N_CHANNELS)
+    yield "Downsampler[4].process", lambda: downsampler.process(x)
+
+    table = lookup.CoefficientTable(N, n_points=16)
+    sos = np.empty((table.n_sections, 6))
+    yield "CoefficientTable.lookup", lambda: table.lookup(CUTOFF, fs=FS, out=sos)
+
+
+def _streaming_cases(N):
+    # block size against throughput, see the ``samples`` of each result.
+    # AllpassFilter[scipy] runs its sections with sosfilt as reference.
+    sos = emqf.emqf_sos(N, CUTOFF, FS)
+    allpass_sos = np.concatenate(emqf.emqf_allpass_pair(_odd(N), CUTOFF, FS))
+    rng = np.random.default_rng(0)
+    for n_channels in STREAMING_CHANNELS:
+        for block_size in STREAMING_BLOCK_SIZES:
+            x = rng.standard_normal((n_channels, block_size))
+            out = np.empty_like(x)
+            info = dict(samples=n_channels * block_size)
+            name = "[channels={},block={}].process".format(n_channels, block_size)
+
+            sos_filter = filtering.SosFilter(sos, n_channels=n_channels)
+            process = functools.partial(sos_filter.process, x, out=out)
+            yield "SosFilter" + name, process, info
+
+            for backend in ("scipy", "numba"):
+                try:
+                    allpass_filter = filtering.AllpassFilter(
+                        allpass_sos, n_channels=n_channels, backend=backend
+                    )
+                except ImportError:
+                    continue  # numba is an optional dependency
+                process = functools.partial(allpass_filter.process, x, out=out)
+                yield "AllpassFilter[{}]".format(backend) + name, process, info
+
+
+def _group_delay(h):
+    """Group delay at a low frequency of the impulse response h in samples"""
+    w = 2 * np.pi * np.array([1e-3, 1.01e-3])
+    H = np.exp(-1j * np.outer(w, np.arange(len(h)))) @ h
+    return -np.angle(H[1] / H[0]) / (w[1] - w[0])
+
+
+def _resample_poly_filter(factor):
+    """FIR filter that `scipy.signal.resample_poly` designs by default"""
+    return signal.firwin(2 * 10 * factor + 1, 1.0 / factor, window=("kaiser", 5.0))
+
+
+def _oversampling_cases(N):
+    # N is ignored, see _ORDERLESS. Results carry the ``latency`` as group
+    # delay and the ``multiplies`` per channel, both at the base rate.
+    # resample_poly compensates the delay of its filter over the whole
+    # signal, a streaming polyphase FIR has that delay and needs all taps
+    # per base rate sample.
+    n = 4096
+    x = np.random.default_rng(0).standard_normal((N_CHANNELS, n))
+    impulse = np.zeros(n)
+    impulse[0] = 1.0
+    for factor in OVERSAMPLING_FACTORS:
+        upsampler = oversampling.Upsampler(factor, n_channels=N_CHANNELS)
+        downsampler = oversampling.Downsampler(factor, n_channels=N_CHANNELS)
+        y = upsampler.process(x)
+
+        h = oversampling.Upsampler(factor).process(impulse)
+        info = dict(samples=x.size, multiplies=upsampler.multiplies_per_sample)
+        info.update(latency=_group_delay(h) / factor)
+        process = functools.partial(upsampler.process, x)
+        yield "Upsampler[{}].process_{}".format(factor, n), process, info
+
+        h = oversampling.Downsampler(factor).process(impulse)
+        info = dict(info, latency=_group_delay(h))
+        process = functools.partial(downsampler.process, y)
+        yield "Downsampler[{}].process_{}".format(factor, n), process, info
+
+        h = _resample_poly_filter(factor)
+        info = dict(samples=x.size, multiplies=len(h))
+        info.update(latency=_group_delay(h) / factor)
+        process = functools.partial(signal.resample_poly, x, factor, 1, axis=-1)
+        yield "resample_poly[up={}]_{}".format(factor, n), process, info
+        process = functools.partial(signal.resample_poly, y, 1, factor, axis=-1)
+        yield "resample_poly[down={}]_{}".format(factor, n), process, info
+
+
+def _plot_cases(N):
+    try:
+        import matplotlib
+
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt
+        from . import filterplot
+    except ImportError:
+        return  # matplotlib is an optional dependency
+
+    zpk = emqf.emqfap(N, 60, f3db=True)
+    fig, ax = plt.subplots()
+
+    def plot():
+        ax.clear()
+        filterplot.plot_analog_filter_zpk(zpk, ax=ax)
+
+    yield "plot_analog_filter_zpk", plot
+
+
+IMPORTS = (
+    "filterdesign",
+    "filterdesign.emqf",
+    "filterdesign.cache",
+    "filterdesign.response",
+    "filterdesign.filtering",
+)
+
+
+def _import_cases(N):
+    # N is ignored, see _ORDERLESS
+    def interpreter(statement):
+        return lambda: subprocess.run([sys.executable, "-c", statement], check=True)
+
+    yield "python", interpreter("pass")
+    for module in IMPORTS:
+        yield "import " + module, interpreter("import " + module)
+
+
+SUITES = {
+    "design": _design_cases,
+    "cascade": _cascade_cases,
+    "response": _response_cases,
+    "runtime": _runtime_cases,
+    "streaming": _streaming_cases,
+    "oversampling": _oversampling_cases,
+    "plot": _plot_cases,
+    "import": _import_cases,
+}
+_ORDERLESS = {"oversampling", "import"}  # suites that are run once with N=0
+
+
+def _time(func, repeat, min_time):
+    func()  # warm up caches and JIT compilation
+    timer = timeit.Timer(func)
+    number = 1
+    while True:
+        t = timer.timeit(number)
+        if t >= min_time:
+            break
+        number *= 2 if t == 0 else max(2, int(1.2 * min_time / t))
+    return min([t] + timer.repeat(repeat=repeat - 1, number=number)) / number
+
+
+def run(orders=ORDERS, suites=tuple(SUITES), repeat: int = 5, min_time=0.05):
+    """
+    Run the benchmarks.
+
+    Parameters
+    ----------
+    orders : sequence of int
+        Filter orders every benchmark is run with. The ``import`` suite
+        does not depend on the order and runs once with N=0.
+    suites : sequence of str
+        Names of the benchmark suites to run, see `SUITES`.
+    repeat : int
+        Number of timing repetitions, the fastest is reported.
+    min_time : float
+        Minimum duration of a single repetition in seconds.
+
+    Returns
+    -------
+    results : list of dict
+        One dict per benchmark with the keys ``name``, ``N`` and
+        ``seconds`` (the time per call). Some benchmarks add keys, e.g.
+        ``samples`` for the number of samples processed per call.
+    """
+    results = list()
+    for suite in suites:
+        for N in [0] if suite in _ORDERLESS else orders:
+            for case in SUITES[suite](int(N)):
+                name, func = case[:2]
+                seconds = _time(func, repeat=repeat, min_time=min_time)
+                result = dict(name=name, N=int(N), seconds=seconds)
+                result.update(*case[2:])  # further keys of the benchmark
+                results.append(result)
+    return results
+
+
+def environment():
+    """Return versions of the interpreter and libraries as a dict."""
+    return dict(
+        python=platform.python_version(),
+        numpy=np.__version__,
+        scipy=scipy.__version__,
+        machine=platform.machine(),
+        platform=platform.platform(),
+    )
+
+
+def compare(results, baseline, threshold: float = 1.25):
+    """
+    Compare benchmark results against a baseline.
+
+    Parameters
+    ----------
+    results, baseline : list of dict
+        Results as returned by `run()`.
+    threshold : float
+        Maximum allowed ratio of the current and the baseline time.
+
+    Returns
+    -------
+    comparison : list of dict
+        One dict per benchmark present in both inputs with the keys
+        ``name``, ``N``, ``seconds``, ``baseline``, ``ratio`` and
+        ``regression``.
+    """
+    reference = {(r["name"], r["N"]): r["seconds"] for r in baseline}
+    comparison = list()
+    for r in results:
+        key = (r["name"], r["N"])
+        if key not in reference:
+            continue
+        ratio = r["seconds"] / reference[key]
+        comparison.append(
+            dict(
+                name=r["name"],
+                N=r["N"],
+                seconds=r["seconds"],
+                baseline=reference[key],
+                ratio=ratio,
+                regression=ratio > threshold,
+            )
+        )
+    return comparison
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m filterdesign.bench", description=__doc__.strip()
+    )
+    parser.add_argument("--orders", type=int, nargs="+", default=list(ORDERS))
+    parser.add_argument(
+        "--suites", nargs="+", choices=list(SUITES), default=list(SUITES)
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.05)
+    parser.add_argument("--json", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against this JSON file")
+    parser.add_argument("--threshold", type=float, default=1.25)
+    args = parser.parse_args(argv)
+
+    results = run(
+        orders=args.orders,
+        suites=args.suites,
+        repeat=args.repeat,
+        min_time=args.min_time,
+    )
+    for r in results:
+        line = "{:<48} N={:<3} {:>12.2f} us".format(
+            r["name"], r["N"], r["seconds"] * 1e6
+        )
+        if "samples" in r:
+            line += " {:>10.2f} Msamples/s".format(r["samples"] / r["seconds"] * 1e-6)
+        if "latency" in r:
+            line += " {:>8.2f} samples latency {:>5} multiplies".format(
+                r["latency"], r["multiplies"]
+            )
+        print(line)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(dict(environment=environment(), results=results), f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        comparison = compare(results, baseline, threshold=args.threshold)
+        regressions = [c for c in comparison if c["regression"]]
+        print()
+        for c in regressions:
+            print(
+                "REGRESSION {:<37} N={:<3} {:>6.2f}x slower".format(
+                    c["name"], c["N"], c["ratio"]
+                )
+            )
+        print(
+            "{} of {} benchmarks regressed beyond {:.2f}x".format(
+                len(regressions), len(comparison), args.threshold
+            )
+        )
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
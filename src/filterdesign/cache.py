@@ -0,0 +1,147 @@
+from collections import OrderedDict
+
+import numpy as np
+
+from . import emqf
+from .design import _read_only
+
+
+class DesignCache:
+    """
+    Memoizing cache for `emqf.emqfap()` designs with LRU eviction.
+
+    Parameters
+    ----------
+    maxsize : int
+        Maximum number of designs held in memory. The least recently used
+        design is evicted first.
+    decimals : int
+        Number of decimals the stopband attenuation is rounded to when
+        building the cache key.
+
+    Notes
+    -----
+    Cached zeros and poles are read-only arrays that are shared between all
+    callers. Use ``np.array(z)`` to obtain a writable copy.
+    """
+
+    def __init__(self, maxsize: int = 128, decimals: int = 6):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1.")
+        self.maxsize = int(maxsize)
+        self.decimals = int(decimals)
+        self.hits = 0
+        self.misses = 0
+        self._designs = OrderedDict()
+
+    def __len__(self):
+        return len(self._designs)
+
+    def __contains__(self, key):
+        return self._key(*key) in self._designs
+
+    def _key(self, N, stopband_attenuation=60, f3db=False):
+        a_s = round(float(stopband_attenuation), self.decimals)
+        return int(N), a_s, bool(f3db)
+
+    def _insert(self, key, zpk):
+        self._designs[key] = zpk
+        self._designs.move_to_end(key)
+        while len(self._designs) > self.maxsize:
+            self._designs.popitem(last=False)
+
+    def emqfap(self, N: int, stopband_attenuation: float = 60, f3db: bool = False):
+        """
+        Cached version of `emqf.emqfap()`.
+
+        Parameters
+        ----------
+        N : int
+            The order of the filter.
+        stopband_attenuation : float
+            Stopband attenuation given in dB as a positive number.
+        f3db : bool
+            The filter is normalized such that the gain magnitude is -3 dB at angular frequency 1.
+            Otherwise, the filter is normalized to the passband edge frequency.
+
+        Returns
+        -------
+        z, p, k : ndarray, ndarray, float
+            Zeros, poles, and system gain of the IIR filter transfer
+            function. Zeros and poles are read-only.
+        """
+        key = self._key(N, stopband_attenuation, f3db)
+        zpk = self._designs.get(key)
+        if zpk is not None:
+            self.hits += 1
+            self._designs.move_to_end(key)
+            return zpk
+
+        self.misses += 1
+        N, a_s, f3db = key
+        z, p, k = emqf.emqfap(N=N, stopband_attenuation=a_s, f3db=f3db)
+        zpk = _read_only(z), _read_only(p), float(k)
+        self._insert(key, zpk)
+        return zpk
+
+    def info(self):
+        """Return hit/miss counters and the current size as a dict."""
+        return dict(
+            hits=self.hits,
+            misses=self.misses,
+            size=len(self._designs),
+            maxsize=self.maxsize,
+        )
+
+    def clear(self):
+        """Remove all designs and reset the counters."""
+        self._designs.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def save(self, file):
+        """
+        Store all cached designs in a single ``.npz`` file.
+
+        Parameters
+        ----------
+        file : str or file-like
+            Destination, see `numpy.savez`.
+        """
+        keys = list(self._designs.keys())
+        designs = list(self._designs.values())
+
+        n_zeros = np.array([len(z) for z, p, k in designs], dtype=int)
+        n_poles = np.array([len(p) for z, p, k in designs], dtype=int)
+        empty = np.zeros(0, dtype=complex)
+        np.savez(
+            file,
+            N=np.array([key[0] for key in keys], dtype=int),
+            stopband_attenuation=np.array([key[1] for key in keys], dtype=float),
+            f3db=np.array([key[2] for key in keys], dtype=bool),
+            k=np.array([k for z, p, k in designs], dtype=float),
+            n_zeros=n_zeros,
+            n_poles=n_poles,
+            zeros=np.concatenate([empty] + [z for z, p, k in designs]),
+            poles=np.concatenate([empty] + [p for z, p, k in designs]),
+        )
+
+    def load(self, file):
+        """
+        Add the designs stored by `save()` to the cache.
+
+        Loaded designs count as most recently used, in the order they were
+        saved. Counters are not modified.
+
+        Parameters
+        ----------
+        file : str or file-like
+            Source, see `numpy.load`.
+        """
+        with np.load(file) as data:
+            zeros = np.split(data["zeros"], np.cumsum(data["n_zeros"])[:-1])
+            poles = np.split(data["poles"], np.cumsum(data["n_poles"])[:-1])
+            keys = zip(data["N"], data["stopband_attenuation"], data["f3db"])
+            for key, z, p, k in zip(keys, zeros, poles, data["k"]):
+                key = self._key(*key)
+                self._insert(key, (_read_only(z), _read_only(p), float(k)))
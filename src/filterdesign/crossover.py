@@ -0,0 +1,139 @@
+import numpy as np
+
+from . import emqf
+from .filtering import SosFilter
+
+
+def crossover_allpass_pairs(
+    crossovers, fs: float, N: int = 5, stopband_attenuation: float = 60
+):
+    """
+    Design the all-pass pairs of an EMQF crossover filterbank.
+
+    Parameters
+    ----------
+    crossovers : array_like
+        Crossover frequencies in ascending order, in the same units as `fs`.
+    fs : float
+        The sampling frequency of the digital system.
+    N : int
+        Order of the EMQF crossover filters. Must be odd.
+    stopband_attenuation : float
+        Stopband attenuation given in dB as a positive number.
+
+    Returns
+    -------
+    pairs : list of tuple
+        One ``(sos0, sos1)`` pair per crossover frequency, see
+        `emqf.emqf_allpass_pair()`. The lowpass and highpass of a crossover
+        are ``0.5 * (A0 + A1)`` and ``0.5 * (A0 - A1)``, and A0 is the
+        all-pass that compensates the phase of the bands below it.
+    """
+    crossovers = np.asarray(crossovers, dtype=float)
+    if crossovers.ndim != 1 or len(crossovers) == 0:
+        raise ValueError("crossovers must be a non-empty 1-D sequence.")
+    if np.any(np.diff(crossovers) <= 0):
+        raise ValueError("crossovers must be strictly increasing.")
+
+    return [
+        emqf.emqf_allpass_pair(
+            N=N, cutoff=cutoff, fs=fs, stopband_attenuation=stopband_attenuation
+        )
+        for cutoff in crossovers
+    ]
+
+
+class CrossoverFilterbank:
+    """
+    Streaming multichannel crossover filterbank built from EMQF all-pass pairs.
+
+    The input is split at the lowest crossover frequency first and the
+    upper band is split further. When a band is split, the bands below it
+    are passed through the A0 all-pass of that crossover, so all bands add
+    up to an all-pass filter of the input. A0 of a crossover is evaluated
+    for the band being split and all bands below it in a single call, so
+    each all-pass output is computed exactly once.
+
+    Parameters
+    ----------
+    crossovers : array_like
+        Crossover frequencies in ascending order, in the same units as `fs`.
+    fs : float
+        The sampling frequency of the digital system.
+    N : int
+        Order of the EMQF crossover filters. Must be odd.
+    stopband_attenuation : float
+        Stopband attenuation given in dB as a positive number.
+    n_channels : int
+        Number of channels. Input blocks have shape ``(n_channels, n)``.
+    """
+
+    def __init__(
+        self,
+        crossovers,
+        fs: float,
+        N: int = 5,
+        stopband_attenuation: float = 60,
+        n_channels: int = 1,
+    ):
+        self.n_channels = int(n_channels)
+        self.pairs = crossover_allpass_pairs(
+            crossovers, fs=fs, N=N, stopband_attenuation=stopband_attenuation
+        )
+        self.n_bands = len(self.pairs) + 1
+
+        # the A0 filter of the k'th crossover runs on k + 1 bands
+        self._a0 = [
+            SosFilter(sos0, n_channels=(k + 1) * self.n_channels)
+            for k, (sos0, sos1) in enumerate(self.pairs)
+        ]
+        self._a1 = [
+            SosFilter(sos1, n_channels=self.n_channels) for sos0, sos1 in self.pairs
+        ]
+
+    def reset(self):
+        """Clear the filter state."""
+        for filt in self._a0 + self._a1:
+            filt.reset()
+
+    def process(self, x, out=None):
+        """
+        Split a block of samples into bands.
+
+        Parameters
+        ----------
+        x : array_like
+            Input block with shape ``(n_channels, n)``, or ``(n,)`` for a
+            single channel.
+        out : ndarray, optional
+            Output buffer with shape ``(n_bands,) + x.shape``.
+
+        Returns
+        -------
+        bands : ndarray
+            Bands ordered from low to high frequency with shape
+            ``(n_bands,) + x.shape``.
+        """
+        x = np.asarray(x, dtype=float)
+        shape = (self.n_bands,) + x.shape
+        if out is None:
+            out = np.empty(shape, dtype=float)
+        elif out.shape != shape or not out.flags.c_contiguous:
+            raise ValueError("out must be C-contiguous with shape {}.".format(shape))
+
+        n = x.shape[-1]
+        bands = out.reshape(self.n_bands, self.n_channels, n)
+        bands[0] = x.reshape(self.n_channels, n)
+
+        for k, (a0, a1) in enumerate(zip(self._a0, self._a1)):
+            # bands[k] is split, bands[:k] are phase compensated
+            v = a1.process(bands[k])
+            stacked = bands[: k + 1].reshape((k + 1) * self.n_channels, n)
+            a0.process(stacked, out=stacked)
+            u = bands[k]
+            np.subtract(u, v, out=bands[k + 1])
+            bands[k + 1] *= 0.5
+            u += v
+            u *= 0.5
+
+        return out
@@ -0,0 +1,152 @@
+import numpy as np
+
+
+def _read_only(a, dtype=None):
+    """Read-only copy of `a`"""
+    a = np.array(a, dtype=dtype)
+    a.setflags(write=False)
+    return a
+
+
+class FilterDesign:
+    """
+    Compact container for an analog or digital filter design.
+
+    The design is stored once in its canonical zeros, poles and gain form.
+    The second-order sections, transfer function and state-space
+    representations are computed on first access and cached.
+
+    Parameters
+    ----------
+    z, p : array_like
+        Zeros and poles of the transfer function.
+    k : float
+        System gain.
+    fs : float, optional
+        Sampling frequency of a digital filter. Analog filters have no
+        sampling frequency (default).
+
+    Notes
+    -----
+    Zeros, poles and cached representations are read-only arrays that are
+    shared between all callers. Pickling only stores the canonical zpk
+    form, so designs are cheap to send to other processes; the caches are
+    rebuilt lazily on the receiving side.
+
+    `scipy.signal` is only imported when a conversion is requested.
+
+    A design unpacks and indexes like a zpk tuple, so it can be passed to
+    all functions taking zpk input, e.g. `filterutils.cascade()`::
+
+        z, p, k = design
+
+    Digital designs are also accepted as sections by
+    `filtering.SosFilter` and `response.sos_response()`.
+    """
+
+    __slots__ = ("z", "p", "k", "fs", "_sos", "_tf", "_ss")
+
+    def __init__(self, z, p, k, fs=None):
+        self.z = _read_only(np.ravel(z), complex)
+        self.p = _read_only(np.ravel(p), complex)
+        self.k = complex(k) if np.iscomplexobj(k) else float(k)
+        self.fs = None if fs is None else float(fs)
+        self._sos = None
+        self._tf = None
+        self._ss = None
+
+    @classmethod
+    def from_sos(cls, sos, fs=2.0):
+        """
+        Create a digital design from second-order sections.
+
+        The given sections are kept and returned by `sos`, so no
+        re-pairing of zeros and poles takes place.
+
+        Parameters
+        ----------
+        sos : ndarray
+            Second-order sections with shape ``(n_sections, 6)``.
+        fs : float
+            The sampling frequency of the digital system.
+
+        Returns
+        -------
+        design : FilterDesign
+        """
+        from scipy import signal
+
+        sos = np.array(sos, dtype=float)
+        if not (sos.ndim == 2 and sos.shape[1] == 6):
+            raise ValueError("sos must have shape (n_sections, 6).")
+        design = cls(*signal.sos2zpk(sos), fs=fs)
+        sos.setflags(write=False)
+        design._sos = sos
+        return design
+
+    def __iter__(self):
+        return iter(self.zpk)
+
+    def __len__(self):
+        return 3
+
+    def __getitem__(self, index):
+        return self.zpk[index]
+
+    def __reduce__(self):
+        return self.__class__, (self.z, self.p, self.k, self.fs)
+
+    def __repr__(self):
+        domain = "analog" if self.analog else "fs={}".format(self.fs)
+        return "{}(order={}, {})".format(self.__class__.__name__, self.order, domain)
+
+    @property
+    def analog(self):
+        """True for analog designs."""
+        return self.fs is None
+
+    @property
+    def order(self):
+        """Order of the filter, i.e. the number of poles."""
+        return max(len(self.p), len(self.z))
+
+    @property
+    def zpk(self):
+        """Zeros, poles and system gain as a tuple."""
+        return self.z, self.p, self.k
+
+    @property
+    def sos(self):
+        """Second-order sections, see `scipy.signal.zpk2sos`."""
+        if self._sos is None:
+            from scipy import signal
+
+            sos = signal.zpk2sos(self.z, self.p, self.k, analog=self.analog)
+            sos.setflags(write=False)
+            self._sos = sos
+        return self._sos
+
+    @property
+    def tf(self):
+        """Numerator and denominator polynomials, see `scipy.signal.zpk2tf`."""
+        if self._tf is None:
+            from scipy import signal
+
+            b, a = signal.zpk2tf(self.z, self.p, self.k)
+            b, a = np.real_if_close(b), np.real_if_close(a)
+            b.setflags(write=False)
+            a.setflags(write=False)
+            self._tf = b, a
+        return self._tf
+
+    @property
+    def ss(self):
+        """State-space matrices A, B, C, D, see `scipy.signal.zpk2ss`."""
+        if self._ss is None:
+            from scipy import signal
+
+            ss = tuple(np.real_if_close(m) for m in signal.zpk2ss(*self.zpk))
+            for m in ss:
+                m.setflags(write=False)
+            self._ss = ss
+        return self._ss
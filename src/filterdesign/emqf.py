@@ -1,27 +1,33 @@
 from __future__ import division
 from __future__ import with_statement
 
+import math
+
 import numpy as np
-from scipy.special import ellipk, ellipj
-from scipy.signal import freqs_zpk
+from scipy.special import ellipk, ellipkm1, ellipj
+
+from .filterutils import analog_zpk_response
 
 
-def selectivity_factor(N: int, stopband_attenuation: float):
+def selectivity_factor(N, stopband_attenuation, tol: float = np.finfo(float).eps):
     """
     Compute the selectivity factor (xi) for the EMQF filter of order N
     and stopband attenuation As.
 
     Parameters
     ----------
-    N : int
+    N : int or array_like of int
         The order of the filter.
-    stopband_attenuation : float
-        Stopband attenuation given in dB as a positive number.
+    stopband_attenuation : float or array_like
+        Stopband attenuation given in dB as a positive number. Broadcast
+        against `N`.
+    tol : float
+        Truncation tolerance of the theta function series.
 
     Returns
     -------
-    xi : float
-        Selectivity factor.
+    xi : float or ndarray
+        Selectivity factor. An array if any of the inputs is an array.
 
     Notes
     -----
@@ -29,49 +35,170 @@ def selectivity_factor(N: int, stopband_attenuation: float):
     M. D. Lutovac's Book "Filter Design for Signal Processing" (2000)
     9.7.2 Elliptic Minimal Q-Factor Transfer Functions, Design of
         Half-Band IIR Filters for Given Passband or Stopband Attenuation
+
+    Instead of truncated series the nome of the discrimination modulus is
+    computed from complete elliptic integrals and the selectivity modulus
+    is recovered from theta functions of its N'th root. This stays accurate
+    for high attenuations and orders.
     """
-    N = int(N)
-    a_s = float(stopband_attenuation)
+    if not 0 < tol < 1:
+        raise ValueError("tol must be between 0 and 1.")
+    if np.any(np.asarray(N) % 1 != 0):
+        raise ValueError("N must be an integer.")
+    if np.ndim(N) == 0 and np.ndim(stopband_attenuation) == 0:
+        N = int(N)
+        a_s = float(stopband_attenuation)
+        return float(_selectivity_factor(N, a_s, tol=tol))
 
-    L = np.power(10.0, a_s / 10) - 1
-    t = 0.5 * (
-        (1 - np.power(1 - (1 / np.power(L, 2)), 1 / 4))
-        / (1 + np.power(1 - (1 / np.power(L, 2)), 1 / 4))
-    )
-    q = t + 2 * np.power(t, 5) + 15 * np.power(t, 9) + 150 * np.power(t, 13)
-    g = np.exp(np.log(q) / N)  # natural logarithm
+    N = np.asarray(N).astype(int)
+    a_s = np.asarray(stopband_attenuation, dtype=float)
+    return _selectivity_factor(N, a_s, tol=tol)
 
-    # fmt: off
-    q_0 = (
-          (g + np.power(g,9) + np.power(g,25) + np.power(g,49) + np.power(g,81) + np.power(g,121) + np.power(g,169))
-        / (1 + 2 * (np.power(g,4) + np.power(g,16) + np.power(g,36) + np.power(g,64) + np.power(g,100) + np.power(g,144)))
-    )
-    # fmt: off
 
-    xi = 1 / np.sqrt(1 - np.power((1-2*q_0)/(1+2*q_0),4))
-    return xi
+def _log_nome(m, m1):
+    """
+    Natural logarithm of the Jacobi nome for the parameter m = k^2. The
+    complementary parameter m1 = 1 - m is passed separately to keep full
+    precision for m close to 0 or 1.
+    """
+    return -np.pi * ellipkm1(m) / ellipkm1(m1)
 
 
-def _X(N, xi, i):
-    """i'th zero of elliptic rational function"""
-    N = int(N)
-    xi = float(xi)
-    i = int(i)
+def _modulus_from_log_nome(log_q, tol=np.finfo(float).eps):
+    """
+    Elliptic modulus k and complementary modulus k' for the nome exp(log_q)
+    from the ratios of theta functions k = (theta2/theta3)^2 and
+    k' = (theta4/theta3)^2. Nomes larger than exp(-pi) are replaced by their
+    conjugate nome exp(pi^2 / log_q), which swaps k and k'. This way the
+    series converge to `tol` within a few terms. Scalars are evaluated with
+    the `math` module, arrays element-wise.
+    """
+    scalar = np.ndim(log_q) == 0
+    if scalar:
+        exp = math.exp
+        log_q = float(log_q)
+        conjugate = log_q > -math.pi
+        if conjugate:
+            log_q = math.pi**2 / min(log_q, -1e-300)
+    else:
+        exp = np.exp
+        conjugate = log_q > -np.pi
+        log_q = np.where(conjugate, np.pi**2 / np.minimum(log_q, -1e-300), log_q)
+
+    # q^(n^2) < tol for all n > n_max, given log_q <= -pi
+    n_max = math.isqrt(int(math.log(tol) / -math.pi)) + 2
+
+    theta2 = 2 * exp(0.25 * log_q)
+    theta3 = 1.0
+    theta4 = 1.0
+    for n in range(1, n_max + 1):
+        q_n2 = 2 * exp(n * n * log_q)
+        theta2 = theta2 + 2 * exp((n + 0.5) ** 2 * log_q)
+        theta3 = theta3 + q_n2
+        theta4 = theta4 - q_n2 if n % 2 else theta4 + q_n2
+
+    k = (theta2 / theta3) ** 2
+    kc = (theta4 / theta3) ** 2
+    if scalar:
+        return (kc, k) if conjugate else (k, kc)
+    return np.where(conjugate, kc, k), np.where(conjugate, k, kc)
+
+
+def _selectivity_factor(N, a_s, tol=np.finfo(float).eps):
+    """Element-wise `selectivity_factor()` for scalars or arrays N and a_s"""
+    # discrimination modulus 1/L with L = 10^(As/10) - 1
+    L = np.expm1(a_s * (np.log(10) / 10))
+    m_d = np.power(L, -2.0)
+    m1_d = (L - 1) * (L + 1) * m_d
+
+    # the selectivity nome is the N'th root of the discrimination nome
+    log_q = _log_nome(m_d, m1_d) / N
+    k, kc = _modulus_from_log_nome(log_q, tol=tol)
+    return 1 / k
+
+
+def _emqf_zeros_poles(N, xi, f3db):
+    """
+    Zeros and poles of a batch of EMQF prototypes sharing the order N.
 
+    xi is a 1-D array of selectivity factors. Returns z with shape
+    (len(xi), 2 * (N // 2)) and p with shape (len(xi), N), ordered as in
+    `emqf_analog_zeros_poles()`.
+    """
+    xi = np.asarray(xi, dtype=float)[:, np.newaxis]
+    n_pairs = N // 2
     order_is_odd = (N % 2) == 1
 
-    if order_is_odd and i == (N + 1) // 2:
-        return 0.0
-
+    # zeros X_i of the elliptic rational function, all i at once
     k = 1 / xi
-    m = k**2  # modulus m = k^2
-    u = ((2.0 * float(i) - 1.0) / float(N)) * ellipk(m)
+    m = np.power(k, 2)  # modulus m = k^2
+    i = np.arange(1, n_pairs + 1, dtype=float)
+    u = ((2.0 * i - 1.0) / float(N)) * ellipk(m)
 
     # according to https://en.wikipedia.org/wiki/Jacobi_elliptic_functions#Minor_functions
     # the following relationship can be used cd() = cn()/dn()
     sn, cn, dn, ph = ellipj(u, m)
-    cd = cn / dn
-    return -cd
+    X = -cn / dn
+
+    nominator = np.empty(X.shape, dtype=complex)
+    nominator.real = -np.sqrt(1.0 - np.power(X, 2)) * np.sqrt(
+        np.power(xi, 2) - np.power(X, 2)
+    )
+    nominator.imag = X * (xi + 1.0)
+    denominator = xi + np.power(X, 2)
+
+    H_pole = np.sqrt(xi) * (nominator / denominator)
+    H_zero = 1j * xi / X  # transfer function zero (Eq 12.373)
+    if f3db:
+        H_pole /= np.sqrt(xi)
+        H_zero /= np.sqrt(xi)
+
+    z = np.empty((xi.shape[0], 2 * n_pairs), dtype=complex)
+    p = np.empty((xi.shape[0], N), dtype=complex)
+    z[:, 0::2] = H_zero
+    z[:, 1::2] = H_zero.conjugate()
+    p[:, 0 : 2 * n_pairs : 2] = H_pole
+    p[:, 1 : 2 * n_pairs : 2] = H_pole.conjugate()
+    if order_is_odd:
+        # first order section with a zero at infinity
+        p[:, -1] = -1.0 if f3db else -np.sqrt(xi[:, 0])
+
+    return z, p
+
+
+def emqf_analog_zeros_poles(N: int, xi: float, f3db: bool = False):
+    """
+    Compute zeros and poles of the analog EMQF filter prototype.
+
+    This is the vectorized core of
+    `emqf_analog_prototype_from_selectivity_factor()`. All zeros of the
+    elliptic rational function are evaluated with a single `ellipk` and
+    `ellipj` call.
+
+    Parameters
+    ----------
+    N : int
+        The order of the filter.
+    xi : float
+        Selectivity factor xi. See also `selectivity_factor()`
+    f3db : bool
+        The filter is normalized such that the gain magnitude is -3 dB at angular frequency 1.
+
+    Returns
+    -------
+    z, p : ndarray, ndarray
+        Zeros and poles of the IIR filter transfer function. Complex
+        conjugate pairs are adjacent, starting with the pole/zero pair
+        closest to the passband edge. For odd N the real pole comes last.
+    """
+    N = int(N)
+    xi = float(xi)
+    f3db = bool(f3db)
+
+    if N < 1:
+        raise ValueError("N must be a positive integer.")
+    z, p = _emqf_zeros_poles(N=N, xi=np.array([xi]), f3db=f3db)
+    return z[0], p[0]
 
 
 def emqf_analog_prototype_from_selectivity_factor(
@@ -108,49 +235,14 @@ def emqf_analog_prototype_from_selectivity_factor(
     xi = float(xi)
     f3db = bool(f3db)
 
-    assert N > 0
-    order_is_odd = (N % 2) == 1
-
-    zeros, poles = list(), list()
-
-    up_to_including = N // 2
-    for i in range(1, up_to_including + 1):
-        X = _X(N=N, xi=xi, i=i)
-
-        nominator_re = -np.sqrt(1.0 - np.power(X, 2)) * np.sqrt(
-            np.power(xi, 2) - np.power(X, 2)
-        )
-        nominator_im = X * (xi + 1.0)
-        nominator = complex(nominator_re, nominator_im)
-
-        denominator = xi + np.power(X, 2)
-
-        S_minQ = np.sqrt(xi) * (nominator / denominator)
-
-        H_pole = S_minQ
-        H_zero = complex(0, 1) * xi / X  # transfer function zero (Eq 12.373)
-        if f3db:
-            H_pole /= np.sqrt(xi)
-            H_zero /= np.sqrt(xi)
-
-        poles.append(H_pole)
-        poles.append(H_pole.conjugate())
-        zeros.append(H_zero)
-        zeros.append(H_zero.conjugate())
-
-    if order_is_odd:
-        # add first order section. note that it has a zero at infinity
-        H_pole = -1.0 if f3db else -np.sqrt(xi)
-        poles.append(H_pole)
-
-    z = np.array(zeros, dtype=complex)
-    p = np.array(poles, dtype=complex)
+    # N is validated by emqf_analog_zeros_poles()
+    z, p = emqf_analog_zeros_poles(N=N, xi=xi, f3db=f3db)
     k = 1.0  # preliminary
 
     # compte gain factor
     f3db_location = 1.0 if f3db else np.sqrt(xi)
-    w, h = freqs_zpk(z, p, k, [f3db_location])
-    k *= 1.0 / abs(h[0]) * (1.0 / np.sqrt(2))
+    h = analog_zpk_response((z, p, k), f3db_location)
+    k *= 1.0 / abs(h) * (1.0 / np.sqrt(2))
 
     return z, p, k
 
@@ -177,3 +269,365 @@ def emqfap(N: int, stopband_attenuation: float = 60, f3db: bool = False):
     """
     xi = selectivity_factor(N=N, stopband_attenuation=stopband_attenuation)
     return emqf_analog_prototype_from_selectivity_factor(N=N, xi=xi, f3db=f3db)
+
+
+def emqfap_batch(N, stopband_attenuation=60, f3db: bool = False):
+    """
+    Vectorized version of `emqfap()` for many designs at once.
+
+    Parameters
+    ----------
+    N : array_like of int
+        The orders of the filters.
+    stopband_attenuation : array_like of float
+        Stopband attenuations given in dB as positive numbers. Broadcast
+        against `N`.
+    f3db : bool
+        The filters are normalized such that the gain magnitude is -3 dB at
+        angular frequency 1. Otherwise, the filters are normalized to the
+        passband edge frequency.
+
+    Returns
+    -------
+    z, p, k : ndarray, ndarray, ndarray
+        Zeros with shape ``shape + (max(N) - max(N) % 2,)``, poles with shape
+        ``shape + (max(N),)`` and system gains with shape ``shape``, where
+        ``shape`` is the broadcast shape of `N` and `stopband_attenuation`.
+        A design of order n occupies the first ``2 * (n // 2)`` zeros and the
+        first ``n`` poles of its row, the remaining entries are padded with
+        ``nan``.
+
+    Notes
+    -----
+    Designs are grouped by order so that each group needs a single `ellipk`
+    and `ellipj` evaluation. Each design yields the same values as `emqfap()`.
+    """
+    N, a_s = np.broadcast_arrays(
+        np.asarray(N), np.asarray(stopband_attenuation, dtype=float)
+    )
+    shape = N.shape
+    N = N.ravel()
+    a_s = a_s.ravel()
+    f3db = bool(f3db)
+
+    if not np.all(N == np.round(N)):
+        raise ValueError("Filter orders must be integers.")
+    N = N.astype(int)
+    if np.any(N < 1):
+        raise ValueError("Filter orders must be positive integers.")
+
+    xi = _selectivity_factor(N, a_s)
+
+    n_max = int(N.max()) if N.size else 0
+    z = np.full((N.size, 2 * (n_max // 2)), np.nan, dtype=complex)
+    p = np.full((N.size, n_max), np.nan, dtype=complex)
+    k = np.empty(N.size, dtype=float)
+
+    for order in np.unique(N):
+        order = int(order)
+        idx = np.flatnonzero(N == order)
+        z_, p_ = _emqf_zeros_poles(N=order, xi=xi[idx], f3db=f3db)
+
+        # gain factor in product form, see `filterutils.analog_zpk_response()`
+        f3db_location = 1.0 if f3db else np.sqrt(xi[idx])
+        s = 1j * np.reshape(f3db_location, (-1, 1))
+        h = np.prod(s - z_, axis=1) / np.prod(s - p_, axis=1)
+
+        z[idx, : z_.shape[1]] = z_
+        p[idx, :order] = p_
+        k[idx] = 1.0 / np.abs(h) * (1.0 / np.sqrt(2))
+
+    z = z.reshape(shape + z.shape[1:])
+    p = p.reshape(shape + p.shape[1:])
+    k = k.reshape(shape)
+    return z, p, k
+
+
+def _prod_ratio(a, b):
+    """prod(a) / prod(b) for len(a) <= len(b) without overflow of the products"""
+    return np.prod(a / b[: len(a)]) / np.prod(b[len(a) :])
+
+
+def emqf_sos(
+    N: int,
+    cutoff: float,
+    fs: float = 2.0,
+    btype: str = "lowpass",
+    stopband_attenuation: float = 60,
+    out=None,
+):
+    """
+    Design a digital EMQF filter and return it as second-order sections.
+
+    The analog prototype is frequency transformed with prewarping and
+    mapped by the bilinear transform section by section. Each complex
+    conjugate pole pair is paired with its own zero pair.
+
+    Parameters
+    ----------
+    N : int
+        The order of the filter.
+    cutoff : float
+        Frequency of the -3 dB point, in the same units as `fs`.
+    fs : float
+        The sampling frequency of the digital system.
+    btype : {'lowpass', 'highpass'}
+        The type of filter.
+    stopband_attenuation : float
+        Stopband attenuation given in dB as a positive number.
+    out : ndarray, optional
+        Buffer of shape ``((N + 1) // 2, 6)`` the sections are written to.
+
+    Returns
+    -------
+    sos : ndarray
+        Second-order sections with shape ``((N + 1) // 2, 6)``. As in
+        `scipy.signal.zpk2sos`, the system gain is applied to the first
+        section and the section with the poles closest to the unit circle
+        comes last.
+    """
+    N = int(N)
+    fs = float(fs)
+    cutoff = float(cutoff)
+
+    if N < 1:
+        raise ValueError("N must be a positive integer.")
+    if btype not in ("lowpass", "highpass"):
+        raise ValueError("btype must be 'lowpass' or 'highpass'.")
+    if not 0 < cutoff < fs / 2:
+        raise ValueError("cutoff must be between 0 and fs/2.")
+
+    n_sections = (N + 1) // 2
+    if out is None:
+        out = np.empty((n_sections, 6), dtype=float)
+    elif out.shape != (n_sections, 6):
+        raise ValueError("out must have shape ({}, 6).".format(n_sections))
+
+    xi = selectivity_factor(N=N, stopband_attenuation=stopband_attenuation)
+    z, p, k = emqf_analog_prototype_from_selectivity_factor(N=N, xi=xi, f3db=True)
+
+    # prewarped frequency transform
+    fs2 = 2.0 * fs
+    wc = fs2 * np.tan(np.pi * cutoff / fs)
+    if btype == "lowpass":
+        k *= np.power(wc, N % 2)
+        z_a, p_a = wc * z, wc * p
+        zero_at_infinity = -1.0  # maps to z = -1
+    else:
+        k *= np.real(_prod_ratio(-z, -p))
+        z_a, p_a = wc / z, wc / p
+        zero_at_infinity = 1.0  # zero at s = 0 maps to z = 1
+        if N % 2 == 1:
+            k *= fs2
+    k *= np.real(_prod_ratio(fs2 - z_a, fs2 - p_a))
+
+    # bilinear transform of one member of each conjugate pair
+    z_d = (fs2 + z_a[0::2]) / (fs2 - z_a[0::2])
+    p_d = (fs2 + p_a[0 : N - N % 2 : 2]) / (fs2 - p_a[0 : N - N % 2 : 2])
+
+    # sections with poles closest to the unit circle last
+    pairs = out[N % 2 :][::-1]
+    pairs[:, 0] = 1.0
+    pairs[:, 1] = -2.0 * z_d.real
+    pairs[:, 2] = np.power(np.abs(z_d), 2)
+    pairs[:, 3] = 1.0
+    pairs[:, 4] = -2.0 * p_d.real
+    pairs[:, 5] = np.power(np.abs(p_d), 2)
+    if N % 2 == 1:
+        p_real = np.real((fs2 + p_a[-1]) / (fs2 - p_a[-1]))
+        out[0] = [1.0, -zero_at_infinity, 0.0, 1.0, -p_real, 0.0]
+
+    out[0, :3] *= k
+    return out
+
+
+def _allpass_sos_from_poles(p):
+    """
+    All-pass sections with unity gain at DC from digital poles. A real pole
+    yields a first-order section, a complex pole stands for its conjugate
+    pair and yields a second-order section.
+    """
+    sos = np.zeros((len(p), 6), dtype=float)
+    is_real = p.imag == 0.0
+    a1 = np.where(is_real, -p.real, -2.0 * p.real)
+    a2 = np.where(is_real, 0.0, np.power(np.abs(p), 2))
+    sos[:, 0] = np.where(is_real, a1, a2)
+    sos[:, 1] = np.where(is_real, 1.0, a1)
+    sos[:, 2] = np.where(is_real, 0.0, 1.0)
+    sos[:, 3] = 1.0
+    sos[:, 4] = a1
+    sos[:, 5] = a2
+    return sos
+
+
+def emqf_allpass_pair(
+    N: int, cutoff: float, fs: float = 2.0, stopband_attenuation: float = 60
+):
+    """
+    Design the parallel all-pass realisation of a digital EMQF filter.
+
+    An odd-order EMQF lowpass and its complementary highpass are realised
+    as sum and difference of two all-pass filters,
+
+        lowpass = 0.5 * (A0 + A1),  highpass = 0.5 * (A0 - A1),
+
+    which are the filters returned by `emqf_sos()`. The pair is doubly
+    complementary, the bands add up to the all-pass A0 and their powers add
+    up to one.
+
+    Parameters
+    ----------
+    N : int
+        The order of the filter. Must be odd.
+    cutoff : float
+        Frequency of the -3 dB point, in the same units as `fs`.
+    fs : float
+        The sampling frequency of the digital system.
+    stopband_attenuation : float
+        Stopband attenuation given in dB as a positive number.
+
+    Returns
+    -------
+    sos0, sos1 : ndarray, ndarray
+        Second-order sections of the all-pass filters A0 and A1. A1 holds
+        the first-order section of the real pole.
+
+    Notes
+    -----
+    The analog prototype normalized to the -3 dB frequency has its poles on
+    the unit circle. Sorted by their imaginary part they are assigned
+    alternately to A1 and A0, starting with the real pole. The bilinear
+    transform maps the analog all-pass filters to digital all-pass filters.
+    """
+    N = int(N)
+    fs = float(fs)
+    cutoff = float(cutoff)
+
+    if N % 2 == 0:
+        raise ValueError("The all-pass realisation requires an odd order.")
+    if not 0 < cutoff < fs / 2:
+        raise ValueError("cutoff must be between 0 and fs/2.")
+
+    xi = selectivity_factor(N=N, stopband_attenuation=stopband_attenuation)
+    z, p = emqf_analog_zeros_poles(N=N, xi=xi, f3db=True)
+
+    # one pole per conjugate pair, sorted such that the real pole is first
+    p = np.concatenate([p[-1:], p[0 : N - 1 : 2]])
+    p = p[np.argsort(np.abs(p.imag))]
+
+    fs2 = 2.0 * fs
+    p_a = fs2 * np.tan(np.pi * cutoff / fs) * p
+    p_d = (fs2 + p_a) / (fs2 - p_a)
+    p_d[0] = p_d[0].real
+
+    return _allpass_sos_from_poles(p_d[1::2]), _allpass_sos_from_poles(p_d[0::2])
+
+
+def _emqford(selectivity, gpass, gstop):
+    """Array version of `emqford()` for the prewarped ratio ws/wp"""
+    selectivity, gpass, gstop = np.broadcast_arrays(
+        np.asarray(selectivity, dtype=float),
+        np.asarray(gpass, dtype=float),
+        np.asarray(gstop, dtype=float),
+    )
+
+    if np.any(selectivity <= 1.0):
+        raise ValueError("The stopband edge must lie beyond the passband edge.")
+    if np.any(gpass <= 0.0) or np.any(gstop <= 0.0):
+        raise ValueError("gpass and gstop must be positive.")
+
+    # EMQF filters satisfy (10^(Ap/10) - 1) * (10^(As/10) - 1) = 1
+    L = np.maximum(
+        np.expm1(gstop * np.log(10) / 10), 1 / np.expm1(gpass * np.log(10) / 10)
+    )
+    stopband_attenuation = 10 * np.log10(1 + L)
+
+    # degree equation of elliptic filters in terms of the nomes of the
+    # discrimination modulus 1/L and the selectivity modulus 1/xi
+    m_d = np.power(L, -2.0)
+    log_q_d = _log_nome(m_d, (L - 1) * (L + 1) * m_d)
+    m_s = np.power(selectivity, -2.0)
+    log_q_s = _log_nome(m_s, (selectivity - 1) * (selectivity + 1) * m_s)
+
+    # tolerance keeps specs met exactly by an order from being rounded up
+    N = np.ceil(log_q_d / log_q_s - 1e-9).astype(int)
+    N = np.maximum(N, 1)
+    xi = _selectivity_factor(N, stopband_attenuation)
+    return N, xi, stopband_attenuation
+
+
+def _selectivity(wp, ws, analog, fs):
+    wp = np.asarray(wp, dtype=float)
+    ws = np.asarray(ws, dtype=float)
+    if not analog:
+        fs = 2.0 if fs is None else float(fs)
+        if np.any(np.maximum(wp, ws) >= fs / 2):
+            raise ValueError("Band edges must be below fs/2.")
+        wp = np.tan(np.pi * wp / fs)  # prewarp
+        ws = np.tan(np.pi * ws / fs)
+    return np.where(wp < ws, ws / wp, wp / ws)
+
+
+def emqford(wp, ws, gpass: float, gstop: float, analog: bool = False, fs=None):
+    """
+    EMQF filter order selection.
+
+    Return the lowest order EMQF lowpass or highpass filter that loses no
+    more than `gpass` dB in the passband and has at least `gstop` dB
+    attenuation in the stopband. The order follows in closed form from the
+    degree equation, no trial designs are computed.
+
+    Parameters
+    ----------
+    wp, ws : float
+        Passband and stopband edge frequencies. A lowpass is assumed for
+        ``wp < ws`` and a highpass otherwise. For digital filters, they are
+        in the same units as `fs`, for analog filters in rad/s.
+    gpass : float
+        The maximum loss in the passband (dB).
+    gstop : float
+        The minimum attenuation in the stopband (dB).
+    analog : bool
+        When True, return an analog filter, otherwise a digital filter.
+    fs : float
+        The sampling frequency of the digital system. Defaults to 2 as in
+        `scipy.signal.ellipord`.
+
+    Returns
+    -------
+    N : int
+        The lowest order that meets the specs.
+    xi : float
+        Selectivity factor of the order N design. It is the ratio of the
+        (prewarped) stopband and passband edge, smaller or equal to the
+        spec.
+    stopband_attenuation : float
+        Stopband attenuation to design for, see `emqfap()`. Since the
+        passband loss of EMQF filters is tied to their stopband attenuation
+        it is at least `gstop` and large enough to meet `gpass`.
+
+    Notes
+    -----
+    The discrimination modulus of EMQF filters is ``1/L`` with
+    ``L = 10^(As/10) - 1``, the selectivity modulus is ``1/xi``. The order
+    is the ratio of the logarithms of their Jacobi nomes, compare the nome
+    series in `selectivity_factor()`.
+    """
+    selectivity = _selectivity(wp, ws, analog, fs)
+    N, xi, stopband_attenuation = _emqford(selectivity, gpass, gstop)
+    return int(N), float(xi), float(stopband_attenuation)
+
+
+def emqford_batch(wp, ws, gpass, gstop, analog: bool = False, fs=None):
+    """
+    Vectorized version of `emqford()` for arrays of specs.
+
+    All arguments except `analog` are broadcast against each other.
+
+    Returns
+    -------
+    N, xi, stopband_attenuation : ndarray, ndarray, ndarray
+        See `emqford()`, with the broadcast shape of the arguments.
+    """
+    selectivity = _selectivity(wp, ws, analog, fs)
+    return _emqford(selectivity, gpass, gstop)
@@ -0,0 +1,367 @@
+"""
+Export EMQF designs as float32 or fixed-point coefficient sets.
+
+Fixed-point coefficients share one Q-format per coefficient set: the
+number of fractional bits is the largest that still represents the
+biggest coefficient magnitude, e.g. Q1.14 for a Q15 set with ``|a1| < 2``.
+"""
+
+import itertools
+import warnings
+
+import numpy as np
+
+from . import emqf
+from . import response
+
+FORMATS = ("float32", "q15", "q31")
+STRUCTURES = ("auto", "sos", "allpass")
+
+_BITS = {"q15": 16, "q31": 32}
+_INTEGER_TYPES = {"q15": np.int16, "q31": np.int32}
+
+
+def quantize(coefficients, fmt: str):
+    """
+    Quantize coefficients to float32 or fixed point.
+
+    Parameters
+    ----------
+    coefficients : array_like
+        The coefficients, e.g. second-order sections.
+    fmt : {'float32', 'q15', 'q31'}
+        Target format.
+
+    Returns
+    -------
+    values : ndarray
+        float32 values, or int16 / int32 values for fixed point.
+    frac_bits : int or None
+        Number of fractional bits of the fixed-point values, such that
+        ``values / 2**frac_bits`` approximates `coefficients`. None for
+        float32.
+    """
+    c = np.asarray(coefficients, dtype=float)
+    if fmt == "float32":
+        return c.astype(np.float32), None
+    if fmt not in _BITS:
+        raise ValueError("fmt must be one of {}.".format(", ".join(FORMATS)))
+
+    bits = _BITS[fmt]
+    peak = np.max(np.abs(c), initial=0.0)
+    int_bits = int(np.floor(np.log2(peak))) + 1 if peak >= 1 else 0
+    frac_bits = bits - 1 - int_bits
+    if frac_bits < 0:
+        raise ValueError("Coefficients are too large for {}.".format(fmt))
+
+    limit = 2 ** (bits - 1)
+    q = np.clip(np.round(c * 2.0**frac_bits), -limit, limit - 1)
+    return q.astype(_INTEGER_TYPES[fmt]), frac_bits
+
+
+def dequantize(values, frac_bits):
+    """
+    Convert quantized coefficients back to float64.
+
+    Parameters
+    ----------
+    values : ndarray
+        Values as returned by `quantize()`.
+    frac_bits : int or None
+        Number of fractional bits, None for floating point values.
+
+    Returns
+    -------
+    coefficients : ndarray
+    """
+    values = np.asarray(values, dtype=float)
+    return values if frac_bits is None else values / 2.0**frac_bits
+
+
+def scale_sections(sos, n_points: int = 2048):
+    """
+    Distribute the gain of a cascade over its sections with L-infinity
+    scaling.
+
+    Each numerator is scaled such that the peak magnitude of the cascade up
+    to and including that section is one, except for the last section
+    which restores the overall gain. This bounds intermediate signals in
+    fixed point and keeps all numerators of similar size, instead of
+    concentrating a tiny gain in the first section.
+
+    Parameters
+    ----------
+    sos : ndarray
+        Second-order sections with shape ``(n_sections, 6)``.
+    n_points : int
+        Number of frequencies the peak magnitudes are evaluated at.
+
+    Returns
+    -------
+    sos : ndarray
+        Scaled copy of the sections with the same overall response.
+    """
+    sos = np.array(sos, dtype=float)
+    f = np.linspace(0, 1, n_points)
+    # cumulative peak gains of the unscaled cascade
+    magnitude, _, _ = response.sos_response(sos[:, np.newaxis], f)
+    peaks = np.max(np.cumprod(magnitude, axis=0), axis=-1)
+
+    applied = 1.0
+    for i in range(len(sos) - 1):
+        sos[i, :3] /= peaks[i] * applied
+        applied = 1.0 / peaks[i]
+    sos[-1, :3] /= applied
+    return sos
+
+
+def pair_sections(sos, n_points: int = 2048):
+    """
+    Pair poles and zeros of a cascade by distance and order the sections
+    by their peak gain.
+
+    Starting with the poles closest to the unit circle, each pole pair
+    takes the remaining zero pair of the same order that is closest to
+    it. The sections are then sorted by increasing peak magnitude, so the
+    most resonant section comes last, as in `scipy.signal.zpk2sos`. The
+    system gain is applied to the first section.
+
+    Parameters
+    ----------
+    sos : ndarray
+        Second-order sections with shape ``(n_sections, 6)``.
+    n_points : int
+        Number of frequencies the peak magnitudes are evaluated at.
+
+    Returns
+    -------
+    sos : ndarray
+        Re-paired and re-ordered sections with the same overall response.
+    """
+    sos = np.asarray(sos, dtype=float)
+    gain = np.prod(sos[:, 0] / sos[:, 3])
+    numerators = list(sos[:, :3] / sos[:, :1])
+    denominators = sos[:, 3:] / sos[:, 3:4]
+    radii = [np.max(np.abs(np.roots(a)), initial=0.0) for a in denominators]
+
+    paired = np.empty_like(sos)
+    for row, a in zip(paired, denominators[np.argsort(radii)[::-1]]):
+        pole = np.roots(np.trim_zeros(a, "b"))[0]
+        candidates = [i for i, b in enumerate(numerators) if (b[2] == 0) == (a[2] == 0)]
+        distances = [
+            np.min(np.abs(np.roots(np.trim_zeros(numerators[i], "b")) - pole))
+            for i in candidates
+        ]
+        row[:3] = numerators.pop(candidates[int(np.argmin(distances))])
+        row[3:] = a
+
+    f = np.linspace(0, 1, n_points)
+    magnitude, _, _ = response.sos_response(paired[:, np.newaxis], f)
+    paired = paired[np.argsort(np.max(magnitude, axis=-1), kind="stable")]
+    paired[0, :3] *= gain
+    return paired
+
+
+def _round_sections(values, sos, frac_bits, w, allpass=False):
+    """
+    Re-round the quantized sections of `values` in place.
+
+    Section by section, every combination of rounding the coefficients
+    down or up is compared, and the one with stable poles whose cascade
+    response up to that section is closest to the exact one is kept. The
+    numerators of symmetric sections and of all-pass sections stay
+    symmetric and mirrored, respectively, so their zeros stay on the unit
+    circle and their magnitude stays unity.
+    """
+    scale = 2.0**frac_bits
+    info = np.iinfo(values.dtype)
+    h_exact = np.ones(len(w), dtype=complex)
+    h_quantized = np.ones(len(w), dtype=complex)
+    free = (4, 5) if allpass else (0, 1, 4, 5)
+    for row, exact in zip(values, sos):
+        h_exact = h_exact * _response(exact[np.newaxis], "sos", 1, w)
+        choices = [sorted({np.floor(c * scale), np.ceil(c * scale)}) for c in exact]
+        candidates = list()
+        for combination in itertools.product(*(choices[i] for i in free)):
+            c = np.array(row, dtype=float)
+            c[list(free)] = combination
+            if allpass:
+                c[:3] = (c[4], scale, 0.0) if exact[5] == 0 else c[5:2:-1]
+            elif exact[2] == exact[0]:
+                c[2] = c[0]
+            poles = np.roots(c[3:])
+            in_range = np.all((c >= info.min) & (c <= info.max))
+            if in_range and np.all(np.abs(poles) < 1):
+                candidates.append(c)
+        if not candidates:
+            continue
+        candidates = np.array(candidates)
+        h = h_quantized * _response(candidates[:, np.newaxis] / scale, "sos", 1, w)
+        best = int(np.argmin(np.max(np.abs(h - h_exact), axis=-1)))
+        row[:] = candidates[best]
+        h_quantized = h[best]
+
+
+def _response(coefficients, structure, sign, f):
+    if structure == "sos":
+        magnitude, phase, _ = response.sos_response(coefficients, f)
+        return magnitude * np.exp(1j * phase)
+    h0, h1 = (_response(c, "sos", 1, f) for c in coefficients)
+    return 0.5 * (h0 + sign * h1)
+
+
+def _max_pole_radius(sos):
+    a1, a2 = sos[:, 4], sos[:, 5]
+    roots = np.stack([np.roots([1.0, b, c]) for b, c in zip(a1, a2)])
+    return float(np.max(np.abs(roots)))
+
+
+def _candidate(N, cutoff, fs, btype, stopband_attenuation, structure, fmt, f, h_ref):
+    w = 2 * f / fs
+    if structure == "sos":
+        sos = emqf.emqf_sos(
+            N, cutoff, fs=fs, btype=btype, stopband_attenuation=stopband_attenuation
+        )
+        sos = scale_sections(pair_sections(sos))
+        # all sections share one Q-format
+        values, frac_bits = quantize(sos, fmt)
+        if frac_bits is not None:
+            _round_sections(values, sos, frac_bits, w)
+        coefficients, sign = dequantize(values, frac_bits), 1
+        all_sections = coefficients
+    else:
+        pair = emqf.emqf_allpass_pair(
+            N, cutoff, fs=fs, stopband_attenuation=stopband_attenuation
+        )
+        values, frac_bits = quantize(np.concatenate(pair), fmt)
+        values = (values[: len(pair[0])], values[len(pair[0]) :])
+        if frac_bits is not None:
+            for v, sos in zip(values, pair):
+                _round_sections(v, sos, frac_bits, w, allpass=True)
+        coefficients = tuple(dequantize(v, frac_bits) for v in values)
+        sign = 1 if btype == "lowpass" else -1
+        all_sections = np.concatenate(coefficients)
+
+    h = _response(coefficients, structure, sign, w)
+    with np.errstate(divide="ignore"):
+        error_db = np.abs(20 * np.log10(np.abs(h) / np.abs(h_ref)))
+    passband = f <= cutoff if btype == "lowpass" else f >= cutoff
+    return dict(
+        structure=structure,
+        fmt=fmt,
+        coefficients=values,
+        frac_bits=frac_bits,
+        sign=sign,
+        max_error=float(np.max(np.abs(h - h_ref))),
+        max_passband_error_db=float(np.max(error_db[passband])),
+        max_pole_radius=_max_pole_radius(all_sections),
+    )
+
+
+def export_emqf(
+    N: int,
+    cutoff: float,
+    fs: float = 2.0,
+    btype: str = "lowpass",
+    stopband_attenuation: float = 60,
+    fmt: str = "float32",
+    structure: str = "auto",
+    n_points: int = 4096,
+    tolerance: float = 0.01,
+):
+    """
+    Design a digital EMQF filter and export quantized coefficients.
+
+    Parameters
+    ----------
+    N : int
+        The order of the filter.
+    cutoff : float
+        Frequency of the -3 dB point, in the same units as `fs`.
+    fs : float
+        The sampling frequency of the digital system.
+    btype : {'lowpass', 'highpass'}
+        The type of filter.
+    stopband_attenuation : float
+        Stopband attenuation given in dB as a positive number.
+    fmt : {'float32', 'q15', 'q31'}
+        Coefficient format, see `quantize()`.
+    structure : {'auto', 'sos', 'allpass'}
+        Direct-form second-order sections with L-infinity scaling (see
+        `scale_sections()`), the parallel all-pass pair of
+        `emqf.emqf_allpass_pair()` (odd orders only), or the one of both
+        with the smaller response error.
+    n_points : int
+        Number of frequencies the response error is evaluated at.
+    tolerance : float
+        A RuntimeWarning is issued if the ``max_error`` of the export
+        exceeds this value.
+
+    Returns
+    -------
+    export : dict
+        With the keys
+
+        - ``structure``: 'sos' or 'allpass'
+        - ``fmt``: the coefficient format
+        - ``coefficients``: quantized sections, for 'allpass' a tuple of
+          the sections of A0 and A1
+        - ``frac_bits``: fractional bits of fixed-point coefficients, or
+          None
+        - ``sign``: the filter is ``0.5 * (A0 + sign * A1)`` for 'allpass'
+        - ``max_error``: maximum deviation of the complex frequency
+          response from the unquantized design
+        - ``max_passband_error_db``: maximum magnitude deviation in dB in
+          the passband
+        - ``max_pole_radius``: the quantized filter is stable if this is
+          below one
+
+    Notes
+    -----
+    Direct-form sections are re-paired and ordered with `pair_sections()`
+    before scaling. Fixed-point coefficients are then rounded down or up
+    section by section, whichever keeps the response closest to the
+    design.
+
+    The all-pass structure stays all-pass under coefficient quantization,
+    so the passband of the combined filter cannot exceed unity gain and
+    typically degrades much less than direct-form sections with poles
+    close to the unit circle.
+
+    Neither structure can place poles closer to the unit circle than the
+    coefficient resolution allows. With Q15 this limits the cutoff to
+    roughly above ``fs / 100``, and higher for high orders. Exports that
+    exceed `tolerance` issue a warning.
+    """
+    N = int(N)
+    if btype not in ("lowpass", "highpass"):
+        raise ValueError("btype must be 'lowpass' or 'highpass'.")
+    if structure not in STRUCTURES:
+        raise ValueError("structure must be one of {}.".format(", ".join(STRUCTURES)))
+    if structure == "allpass" and N % 2 == 0:
+        raise ValueError("The all-pass structure requires an odd order.")
+
+    sos = emqf.emqf_sos(
+        N, cutoff, fs=fs, btype=btype, stopband_attenuation=stopband_attenuation
+    )
+    f = np.geomspace(fs * 1e-5, fs / 2, n_points)
+    h_ref = _response(sos, "sos", 1, 2 * f / fs)
+
+    if structure == "auto":
+        structures = ["sos", "allpass"] if N % 2 else ["sos"]
+    else:
+        structures = [structure]
+    candidates = [
+        _candidate(N, cutoff, fs, btype, stopband_attenuation, s, fmt, f, h_ref)
+        for s in structures
+    ]
+    best = min(candidates, key=lambda c: c["max_error"])
+    if best["max_error"] > tolerance:
+        warnings.warn(
+            "The {} export deviates by up to {:.3g} from the design, more than "
+            "the tolerance of {:.3g}. Use a wider format or a higher cutoff "
+            "relative to fs.".format(fmt, best["max_error"], tolerance),
+            RuntimeWarning,
+            stacklevel=2,
+        )
+    return best
@@ -0,0 +1,468 @@
+import numpy as np
+from scipy import signal
+
+from .filterutils import _as_sos, _is_sos_format
+
+_jit_kernels = dict()
+
+
+def _compiled(kernel):
+    """`kernel` compiled with numba, None if numba is missing."""
+    if kernel not in _jit_kernels:
+        try:
+            import numba
+        except ImportError:
+            return None  # numba is an optional dependency
+        _jit_kernels[kernel] = numba.njit(cache=True, nogil=True)(kernel)
+    return _jit_kernels[kernel]
+
+
+def _sos_kernel(sos, x, y, state):
+    """
+    Run a cascade of second-order sections with a0 = 1 in transposed
+    direct form II, writing into y and updating state in place. The state
+    has the layout of `scipy.signal.sosfilt`, (n_sections, n_channels, 2).
+    """
+    for ch in range(x.shape[0]):
+        for n in range(x.shape[1]):
+            v = x[ch, n]
+            for k in range(sos.shape[0]):
+                u = sos[k, 0] * v + state[k, ch, 0]
+                state[k, ch, 0] = sos[k, 1] * v - sos[k, 4] * u + state[k, ch, 1]
+                state[k, ch, 1] = sos[k, 2] * v - sos[k, 5] * u
+                v = u
+            y[ch, n] = v
+
+
+class SosFilter:
+    """
+    Streaming multichannel filter for second-order sections.
+
+    The filter state of all channels is held in one contiguous array of
+    shape ``(n_sections, n_channels, 2)`` that persists between calls to
+    `process()`, so a signal can be filtered in blocks of arbitrary size.
+
+    With numba installed, a dedicated kernel updates the state in place and
+    writes directly into the output, so `process()` does not allocate when
+    an `out` buffer is given. Otherwise `scipy.signal.sosfilt` is used,
+    which allocates its result and the new state on every call.
+
+    Parameters
+    ----------
+    sos : ndarray or FilterDesign
+        Second-order sections with shape ``(n_sections, 6)``, e.g. from
+        `emqf.emqf_sos()` or `filterutils.cascade()`, or a digital
+        `design.FilterDesign`.
+    n_channels : int
+        Number of channels. Input blocks have shape ``(n_channels, n)``,
+        or ``(n,)`` for a single channel.
+    dtype : dtype
+        Data type of the coefficients, state and output. Either float32 or
+        float64.
+    backend : {'auto', 'numba', 'scipy'}
+        Use the numba kernel, `scipy.signal.sosfilt`, or numba if it is
+        installed.
+    """
+
+    def __init__(self, sos, n_channels: int = 1, dtype=np.float64, backend="auto"):
+        sos = _as_sos(sos)
+        if not _is_sos_format(sos):
+            raise TypeError("Input is not sos structured data.")
+        if backend not in ("auto", "numba", "scipy"):
+            raise ValueError("backend must be 'auto', 'numba' or 'scipy'.")
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in (np.float32, np.float64):
+            raise ValueError("dtype must be float32 or float64.")
+
+        self._kernel = None if backend == "scipy" else _compiled(_sos_kernel)
+        if backend == "numba" and self._kernel is None:
+            raise ImportError("The numba backend requires numba.")
+        self.backend = "scipy" if self._kernel is None else "numba"
+
+        self.sos = np.array(sos, dtype=self.dtype, order="C")
+        # the kernel expects a0 = 1, as sosfilt normalizes internally
+        self._sos = np.ascontiguousarray(self.sos / self.sos[:, 3:4])
+        self.n_channels = int(n_channels)
+        self.state = np.zeros((len(self.sos), self.n_channels, 2), dtype=self.dtype)
+
+    def reset(self):
+        """Clear the filter state."""
+        self.state.fill(0.0)
+
+    def process(self, x, out=None):
+        """
+        Filter a block of samples.
+
+        Parameters
+        ----------
+        x : array_like
+            Input block with shape ``(n_channels, n)``, or ``(n,)`` for a
+            single channel. Any n including 1 is allowed.
+        out : ndarray, optional
+            Output buffer with the shape of `x` and the filter dtype. May
+            be `x` itself.
+
+        Returns
+        -------
+        y : ndarray
+            Filtered block, `out` if given.
+        """
+        x = np.asarray(x, dtype=self.dtype)
+        if out is None:
+            out = np.empty(x.shape, dtype=self.dtype)
+        elif out.shape != x.shape or out.dtype != self.dtype:
+            raise ValueError("out must have the shape of x and the filter dtype.")
+
+        x2d = x[np.newaxis, :] if x.ndim == 1 else x
+        if x2d.ndim != 2 or x2d.shape[0] != self.n_channels:
+            raise ValueError("Expected {} channels.".format(self.n_channels))
+
+        if x2d.shape[1] == 0 or len(self.sos) == 0:
+            out[...] = x  # sosfilt rejects empty input
+            return out
+
+        if self._kernel is not None:
+            y2d = out[np.newaxis, :] if out.ndim == 1 else out
+            self._kernel(self._sos, x2d, y2d, self.state)
+            return out
+
+        y, self.state[...] = signal.sosfilt(self.sos, x2d, axis=-1, zi=self.state)
+        out[...] = y.reshape(x.shape)
+        return out
+
+
+def _allpass_kernel(c1, c2, second_order, x, y, state):
+    """
+    Run a cascade of all-pass sections sample by sample.
+
+    First-order sections (c1 + z^-1) / (1 + c1 z^-1) need one multiply,
+    second-order sections (c2 + c1 z^-1 + z^-2) / (1 + c1 z^-1 + c2 z^-2)
+    need two. The state with shape (n_channels, n_sections, 4) holds
+    x[n-1], x[n-2], y[n-1], y[n-2] of each section.
+    """
+    for ch in range(x.shape[0]):
+        for n in range(x.shape[1]):
+            v = x[ch, n]
+            for k in range(len(c1)):
+                if second_order[k]:
+                    u = c2[k] * (v - state[ch, k, 3])
+                    u += c1[k] * (state[ch, k, 0] - state[ch, k, 2])
+                    u += state[ch, k, 1]
+                    state[ch, k, 1] = state[ch, k, 0]
+                    state[ch, k, 3] = state[ch, k, 2]
+                else:
+                    u = c1[k] * (v - state[ch, k, 2]) + state[ch, k, 0]
+                state[ch, k, 0] = v
+                state[ch, k, 2] = u
+                v = u
+            y[ch, n] = v
+
+
+def _compiled_allpass_kernel():
+    """The all-pass kernel compiled with numba, None if numba is missing."""
+    return _compiled(_allpass_kernel)
+
+
+def _allpass_sections(sos):
+    """
+    Split all-pass sos into c1, c2, a second-order flag per section and
+    the overall sign, as sections may be negated all-passes.
+    """
+    sos = np.asarray(sos, dtype=float)
+    second_order = (sos[:, 2] != 0) | (sos[:, 5] != 0)
+    sign = np.where(second_order, sos[:, 2], sos[:, 1])
+    b = sos[:, :3] / sign[:, np.newaxis]
+    a = sos[:, 3:]
+    first = ~second_order
+    is_allpass = (
+        np.allclose(np.abs(sign), 1.0)
+        and np.allclose(a[:, 0], 1.0)
+        and np.allclose(b[second_order, :2], a[second_order, :0:-1])
+        and np.allclose(b[first, 0], a[first, 1])
+        and np.allclose(b[first, 2], 0.0)
+    )
+    if not is_allpass:
+        raise ValueError("sos are not all-pass sections with a0 = 1.")
+    c1 = a[:, 1]
+    c2 = a[:, 2]
+    return c1, c2, second_order, float(np.prod(np.sign(sign)))
+
+
+class AllpassFilter:
+    """
+    Streaming multichannel cascade of first- and second-order all-pass
+    sections.
+
+    With numba installed, a dedicated kernel runs each section with one
+    (first-order) or two (second-order) multiplies per sample. Otherwise
+    the equivalent sections are run by `SosFilter`.
+
+    Parameters
+    ----------
+    sos : ndarray or FilterDesign
+        All-pass sections ``[a, 1, 0, 1, a, 0]`` and
+        ``[a2, a1, 1, 1, a1, a2]``, e.g. from `emqf.emqf_allpass_pair()`,
+        or their negatives, or a digital `design.FilterDesign` with such
+        sections.
+    n_channels : int
+        Number of channels. Input blocks have shape ``(n_channels, n)``,
+        or ``(n,)`` for a single channel.
+    dtype : dtype
+        Data type of the coefficients, state and output. Either float32 or
+        float64.
+    backend : {'auto', 'numba', 'scipy'}
+        Use the numba kernel, `scipy.signal.sosfilt`, or numba if it is
+        installed.
+    """
+
+    def __init__(self, sos, n_channels: int = 1, dtype=np.float64, backend="auto"):
+        sos = _as_sos(sos)
+        if not _is_sos_format(sos):
+            raise TypeError("Input is not sos structured data.")
+        if backend not in ("auto", "numba", "scipy"):
+            raise ValueError("backend must be 'auto', 'numba' or 'scipy'.")
+
+        self.n_channels = int(n_channels)
+        self._kernel = None if backend == "scipy" else _compiled_allpass_kernel()
+        if backend == "numba" and self._kernel is None:
+            raise ImportError("The numba backend requires numba.")
+
+        c1, c2, second_order, sign = _allpass_sections(sos)
+        if self._kernel is None:
+            self.backend = "scipy"
+            self._filter = SosFilter(
+                sos, n_channels=n_channels, dtype=dtype, backend="scipy"
+            )
+            self.dtype = self._filter.dtype
+            return
+
+        self.backend = "numba"
+        self.dtype = np.dtype(dtype)
+        if self.dtype not in (np.float32, np.float64):
+            raise ValueError("dtype must be float32 or float64.")
+        self._c1 = c1.astype(self.dtype)
+        self._c2 = c2.astype(self.dtype)
+        self._second_order = second_order
+        self._negate = sign < 0
+        self.state = np.zeros((self.n_channels, len(c1), 4), dtype=self.dtype)
+
+    def reset(self):
+        """Clear the filter state."""
+        if self.backend == "scipy":
+            self._filter.reset()
+        else:
+            self.state.fill(0.0)
+
+    def process(self, x, out=None):
+        """
+        Filter a block of samples.
+
+        Parameters
+        ----------
+        x : array_like
+            Input block with shape ``(n_channels, n)``, or ``(n,)`` for a
+            single channel. Any n including 1 is allowed.
+        out : ndarray, optional
+            Output buffer with the same shape as `x`. May be `x` itself.
+
+        Returns
+        -------
+        y : ndarray
+            Filtered block, `out` if given.
+        """
+        if self.backend == "scipy":
+            return self._filter.process(x, out=out)
+
+        x = np.asarray(x, dtype=self.dtype)
+        if out is None:
+            out = np.empty(x.shape, dtype=self.dtype)
+        elif out.shape != x.shape or out.dtype != self.dtype:
+            raise ValueError("out must have the shape of x and the filter dtype.")
+
+        x2d = x[np.newaxis, :] if x.ndim == 1 else x
+        if x2d.ndim != 2 or x2d.shape[0] != self.n_channels:
+            raise ValueError("Expected {} channels.".format(self.n_channels))
+
+        y2d = out[np.newaxis, :] if out.ndim == 1 else out
+        self._kernel(self._c1, self._c2, self._second_order, x2d, y2d, self.state)
+        if self._negate:
+            np.negative(out, out=out)
+        return out
+
+
+def _lattice_kernel(k, c, second_order, x, y, state):
+    """
+    Run a cascade of all-pass sections in normalized lattice form with
+    per-sample coefficients.
+
+    k has shape (n_samples, n_sections, 2) and holds the reflection
+    coefficients of the inner and outer lattice stage of each section,
+    c = sqrt(1 - k^2). First-order sections only use the inner stage. Each
+    stage is a rotation of its input and state, so the state energy cannot
+    grow, whatever the coefficients do. The state has shape
+    (n_channels, n_sections, 2).
+    """
+    for ch in range(x.shape[0]):
+        for n in range(x.shape[1]):
+            v = x[ch, n]
+            for i in range(len(second_order)):
+                if second_order[i]:
+                    f = c[n, i, 1] * v - k[n, i, 1] * state[ch, i, 1]
+                    u = k[n, i, 1] * v + c[n, i, 1] * state[ch, i, 1]
+                    g = k[n, i, 0] * f + c[n, i, 0] * state[ch, i, 0]
+                    state[ch, i, 0] = c[n, i, 0] * f - k[n, i, 0] * state[ch, i, 0]
+                    state[ch, i, 1] = g
+                else:
+                    u = k[n, i, 0] * v + c[n, i, 0] * state[ch, i, 0]
+                    state[ch, i, 0] = c[n, i, 0] * v - k[n, i, 0] * state[ch, i, 0]
+                v = u
+            y[ch, n] = v
+
+
+def _lattice_vectorized(k, c, second_order, x, y, state):
+    """`_lattice_kernel()` with numpy operations over all channels"""
+    for n in range(x.shape[1]):
+        v = x[:, n]
+        for i in range(len(second_order)):
+            s = state[:, i]
+            if second_order[i]:
+                f = c[n, i, 1] * v - k[n, i, 1] * s[:, 1]
+                u = k[n, i, 1] * v + c[n, i, 1] * s[:, 1]
+                g = k[n, i, 0] * f + c[n, i, 0] * s[:, 0]
+                s[:, 0] = c[n, i, 0] * f - k[n, i, 0] * s[:, 0]
+                s[:, 1] = g
+            else:
+                u = k[n, i, 0] * v + c[n, i, 0] * s[:, 0]
+                s[:, 0] = c[n, i, 0] * v - k[n, i, 0] * s[:, 0]
+            v = u
+        y[:, n] = v
+
+
+class LatticeAllpassFilter:
+    """
+    Streaming multichannel cascade of all-pass sections with time-varying
+    coefficients.
+
+    The sections run in normalized lattice form, parametrized by the
+    reflection coefficients ``k = a`` of first-order sections and
+    ``k1 = a1 / (1 + a2)``, ``k2 = a2`` of second-order sections. The
+    filter is stable for any trajectory of stable sections and switching
+    coefficients causes no transients from a mismatched state. For
+    constant coefficients it is the filter of `AllpassFilter`.
+
+    Parameters
+    ----------
+    sos : ndarray
+        Initial all-pass sections, see `AllpassFilter`. They also fix the
+        order and sign of each section.
+    n_channels : int
+        Number of channels. Input blocks have shape ``(n_channels, n)``,
+        or ``(n,)`` for a single channel.
+    backend : {'auto', 'numba', 'numpy'}
+        Use the numba kernel, a loop over samples with numpy operations
+        over all channels, or numba if it is installed.
+    """
+
+    def __init__(self, sos, n_channels: int = 1, backend="auto"):
+        if not _is_sos_format(sos):
+            raise TypeError("Input is not sos structured data.")
+        if backend not in ("auto", "numba", "numpy"):
+            raise ValueError("backend must be 'auto', 'numba' or 'numpy'.")
+
+        self.n_channels = int(n_channels)
+        kernel = None if backend == "numpy" else _compiled(_lattice_kernel)
+        if backend == "numba" and kernel is None:
+            raise ImportError("The numba backend requires numba.")
+        self.backend = "numpy" if kernel is None else "numba"
+        self._kernel = _lattice_vectorized if kernel is None else kernel
+
+        c1, c2, self._second_order, sign = _allpass_sections(sos)
+        self._negate = sign < 0
+        self.reflection = self._reflection(c1, c2)
+        self.state = np.zeros((self.n_channels, len(c1), 2))
+
+    def _reflection(self, c1, c2):
+        k = np.zeros(c1.shape + (2,))
+        k[..., 0] = np.where(self._second_order, c1 / (1 + c2), c1)
+        k[..., 1] = c2
+        if not np.all(np.abs(k) < 1):
+            raise ValueError("The all-pass sections are not stable.")
+        return k
+
+    def _trajectory(self, sos):
+        """Reflection coefficients of sections with shape (..., n_sections, 6)"""
+        sos = np.asarray(sos, dtype=float)
+        n_sections = len(self._second_order)
+        if sos.ndim not in (2, 3) or sos.shape[-2:] != (n_sections, 6):
+            raise ValueError(
+                "sos must have shape (n_sections, 6) or (n, n_sections, 6)."
+            )
+        c1, c2, second_order, _ = _allpass_sections(sos.reshape(-1, 6))
+        if np.any(second_order.reshape(-1, n_sections) != self._second_order):
+            raise ValueError("The order of the sections must not change.")
+        return self._reflection(c1.reshape(sos.shape[:-1]), c2.reshape(sos.shape[:-1]))
+
+    def reset(self):
+        """Clear the filter state."""
+        self.state.fill(0.0)
+
+    def process(self, x, sos=None, out=None):
+        """
+        Filter a block of samples.
+
+        Parameters
+        ----------
+        x : array_like
+            Input block with shape ``(n_channels, n)``, or ``(n,)`` for a
+            single channel.
+        sos : ndarray, optional
+            New sections. With shape ``(n_sections, 6)`` the reflection
+            coefficients ramp linearly from the current ones to the new
+            ones, reached at the last sample of the block. With shape
+            ``(n, n_sections, 6)`` the coefficients of every sample.
+            Without, the current coefficients are kept. New sections
+            must match the length of the block, i.e. an empty block only
+            takes an empty trajectory.
+        out : ndarray, optional
+            Output buffer with the same shape as `x`. May be `x` itself.
+
+        Returns
+        -------
+        y : ndarray
+            Filtered block, `out` if given.
+        """
+        x = np.asarray(x, dtype=float)
+        if out is None:
+            out = np.empty(x.shape)
+        elif out.shape != x.shape or out.dtype != np.float64:
+            raise ValueError("out must have the shape of x and dtype float64.")
+
+        x2d = x[np.newaxis, :] if x.ndim == 1 else x
+        if x2d.ndim != 2 or x2d.shape[0] != self.n_channels:
+            raise ValueError("Expected {} channels.".format(self.n_channels))
+        n = x2d.shape[1]
+
+        if sos is None:
+            k = np.broadcast_to(self.reflection, (n,) + self.reflection.shape)
+        else:
+            target = self._trajectory(sos)
+            if target.ndim == 2:
+                if not n:
+                    raise ValueError("A ramp to new sections needs a sample.")
+                # convex combinations of stable sections are stable
+                ramp = np.arange(1, n + 1).reshape(-1, 1, 1) / n
+                k = self.reflection + ramp * (target - self.reflection)
+                target = target[np.newaxis]
+            elif len(target) == n:
+                k = target
+            else:
+                raise ValueError("Expected the sections of {} samples.".format(n))
+            if n:
+                self.reflection = target[-1].copy()
+
+        c = np.sqrt((1 - k) * (1 + k))
+        y2d = out[np.newaxis, :] if out.ndim == 1 else out
+        self._kernel(k, c, self._second_order, x2d, y2d, self.state)
+        if self._negate:
+            np.negative(out, out=out)
+        return out
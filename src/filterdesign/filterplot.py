@@ -3,6 +3,8 @@ import matplotlib.pyplot as plt
 import numpy as np
 from scipy import signal
 
+from . import response
+
 
 def pole_zero_plot(zpk, unitcircle=False, ax=None):
     """
@@ -64,9 +66,10 @@ def plot_analog_filter_zpk(zpk, ax=None):
     if ax == None:
         ax = plt.gca()
     z, p, k = zpk
-    b, a = signal.zpk2tf(z, p, k)
-    w, h = signal.freqs(b, a, 2000)
-    ax.semilogx(w, 20 * np.log10(abs(h)))
+    w = signal.findfreqs(z, p, 2000, kind="zp")
+    magnitude, phase, group_delay = response.zpk_response((z, p, k), w)
+    with np.errstate(divide="ignore"):
+        ax.semilogx(w, 20 * np.log10(magnitude))
     ax.set_title("Filter frequency response")
     ax.set_xlabel("Frequency [radians / second]")
     ax.set_ylabel("Amplitude [dB]")
@@ -1,6 +1,8 @@
 import numpy as np
 from functools import reduce
 
+from .design import FilterDesign
+
 
 def _is_zpk_format(zpk):
     if not len(zpk) == 3:
@@ -32,21 +34,13 @@ def _is_sos_format(sos):
     return True
 
 
-def _cascade_zpk_pair(zpk_a, zpk_b):
-    if not (_is_zpk_format(zpk_a) or _is_zpk_format(zpk_b)):
-        raise TypeError("One of the inputs is not zpk structured data.")
-
-    z = np.concatenate([zpk_a[0], zpk_b[0]], axis=None)
-    p = np.concatenate([zpk_a[1], zpk_b[1]], axis=None)
-    k = zpk_a[2] * zpk_b[2]
-    return z, p, k
-
-
-def _cascade_sos_pair(sos_a, sos_b):
-    if not (_is_sos_format(sos_a) or _is_sos_format(sos_b)):
-        raise TypeError("One of the inputs is not sos structured data.")
-
-    return np.concatenate([sos_a, sos_b], axis=0)
+def _as_sos(sos):
+    """Sections of a digital `design.FilterDesign`, other input unchanged"""
+    if isinstance(sos, FilterDesign):
+        if sos.analog:
+            raise ValueError("An analog design has no digital sections.")
+        return sos.sos
+    return sos
 
 
 def cascade(*args):
@@ -54,15 +48,162 @@ def cascade(*args):
     *args
         Two or more zpk or sos sections that should be cascaded.
         Note that zpk and sos cannot be mixed.
+
+    All sections are validated once and joined with a single allocation,
+    so cascading M sections takes time linear in M.
     """
     valid_zpk_cascade = all(map(_is_zpk_format, args))
     if valid_zpk_cascade:
-        return reduce(_cascade_zpk_pair, args)
+        z = np.concatenate([zpk[0] for zpk in args], axis=None)
+        p = np.concatenate([zpk[1] for zpk in args], axis=None)
+        k = reduce(lambda a, b: a * b, [zpk[2] for zpk in args])
+        return z, p, k
 
     valid_sos_cascade = all(map(_is_sos_format, args))
     if valid_sos_cascade:
-        return reduce(_cascade_sos_pair, args)
+        return np.concatenate(args, axis=0)
 
     raise TypeError(
         "Input is neither a consistent zpk cascade nor a consistent sos cascade."
     )
+
+
+class CascadeBuilder:
+    """
+    Incrementally build a cascade of zpk or sos sections.
+
+    Sections are appended into preallocated buffers that grow
+    geometrically, so existing data is only moved when the capacity is
+    exceeded and building a cascade of M sections takes linear time.
+    The format (zpk or sos) is fixed by the first appended section.
+
+    Parameters
+    ----------
+    capacity : int
+        Initial number of sos rows, or zeros and poles, to preallocate.
+    """
+
+    def __init__(self, capacity: int = 16):
+        self._capacity = max(int(capacity), 1)
+        self._format = None
+        self.clear()
+
+    def __len__(self):
+        """Number of sections appended so far."""
+        return self._n_sections
+
+    def clear(self):
+        """Remove all sections. The format is chosen again on the next append."""
+        self._format = None
+        self._n_sections = 0
+        self._sos = np.empty((self._capacity, 6))
+        self._n_sos = 0
+        self._zeros = np.empty(self._capacity, dtype=complex)
+        self._poles = np.empty(self._capacity, dtype=complex)
+        self._n_zeros = 0
+        self._n_poles = 0
+        self._k = 1
+
+    @staticmethod
+    def _reserve(buffer, used, extra):
+        if used + extra <= len(buffer):
+            return buffer
+        shape = (max(2 * len(buffer), used + extra),) + buffer.shape[1:]
+        grown = np.empty(shape, dtype=buffer.dtype)
+        grown[:used] = buffer[:used]
+        return grown
+
+    def append(self, section):
+        """
+        Append a zpk or sos section to the cascade.
+
+        Parameters
+        ----------
+        section : tuple or ndarray
+            Zeros, poles and system gain, or second-order sections with
+            shape ``(n_sections, 6)``.
+
+        Returns
+        -------
+        self : CascadeBuilder
+        """
+        if _is_zpk_format(section):
+            section_format = "zpk"
+        elif _is_sos_format(section):
+            section_format = "sos"
+        else:
+            raise TypeError("Input is neither zpk nor sos structured data.")
+        if self._format not in (None, section_format):
+            raise TypeError("zpk and sos sections cannot be mixed.")
+        self._format = section_format
+
+        if section_format == "sos":
+            n = len(section)
+            self._sos = self._reserve(self._sos, self._n_sos, n)
+            self._sos[self._n_sos : self._n_sos + n] = section
+            self._n_sos += n
+        else:
+            z, p, k = section
+            z, p = np.ravel(z), np.ravel(p)
+            self._zeros = self._reserve(self._zeros, self._n_zeros, len(z))
+            self._zeros[self._n_zeros : self._n_zeros + len(z)] = z
+            self._n_zeros += len(z)
+            self._poles = self._reserve(self._poles, self._n_poles, len(p))
+            self._poles[self._n_poles : self._n_poles + len(p)] = p
+            self._n_poles += len(p)
+            self._k = self._k * k
+        self._n_sections += 1
+        return self
+
+    def result(self):
+        """
+        Return a copy of the cascade built so far.
+
+        Returns
+        -------
+        zpk or sos : tuple or ndarray
+            The cascade in the format of the appended sections.
+        """
+        if self._format is None:
+            raise ValueError("No sections have been appended.")
+        if self._format == "sos":
+            return self._sos[: self._n_sos].copy()
+        z = self._zeros[: self._n_zeros].copy()
+        p = self._poles[: self._n_poles].copy()
+        return z, p, self._k
+
+
+def analog_zpk_response(zpk, w):
+    """
+    Evaluate the frequency response of an analog zpk filter.
+
+    The response is evaluated directly in product form, i.e. without
+    converting the filter to polynomial (b, a) representation.
+
+    Parameters
+    ----------
+    zpk : tuple
+        Zeros, poles and system gain of the filter.
+    w : array_like
+        Angular frequencies [rad/s] at which the response is evaluated.
+
+    Returns
+    -------
+    h : ndarray
+        Complex frequency response with the same shape as `w`.
+    """
+    z, p, k = zpk
+    z, p = np.ravel(z), np.ravel(p)
+    s = 1j * np.asarray(w, dtype=float)
+
+    # one zero and one pole factor at a time, so that the partial products
+    # stay bounded for high orders
+    n = min(len(z), len(p))
+    h = np.full(s.shape, k, dtype=complex)
+    for zero, pole in zip(z[:n], p[:n]):
+        h *= (s - zero) / (s - pole)
+    for zero in z[n:]:
+        h *= s - zero
+    for pole in p[n:]:
+        h /= s - pole
+    return h
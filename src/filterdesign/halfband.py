@@ -0,0 +1,152 @@
+import numpy as np
+
+from . import emqf
+from .filtering import AllpassFilter
+
+
+def halfband_allpass_coefficients(N: int, stopband_attenuation: float = 60):
+    """
+    Compute the polyphase all-pass decomposition of an EMQF half-band filter.
+
+    The digital half-band lowpass with cutoff at a quarter of the sampling
+    frequency is realised as
+
+        H(z) = 0.5 * (A0(z^2) + z^-1 * A1(z^2))
+
+    where each branch is a cascade of first-order all-pass sections
+    ``(a + z^-1) / (1 + a z^-1)`` evaluated at z^2.
+
+    Parameters
+    ----------
+    N : int
+        The order of the filter. Must be odd.
+    stopband_attenuation : float
+        Stopband attenuation given in dB as a positive number.
+
+    Returns
+    -------
+    a0, a1 : ndarray, ndarray
+        All-pass coefficients of the two branches in ascending order.
+
+    Notes
+    -----
+    The analog prototype normalized to the -3 dB frequency has all its
+    poles on the unit circle. With the bilinear transform to a quarter of
+    the sampling frequency the pole pair -sigma +/- j omega maps to the
+    imaginary axis at +/- j sqrt(a) with a = (1 - sigma) / (1 + sigma).
+    The coefficients are sorted and assigned alternately to the branches.
+    """
+    N = int(N)
+    if N % 2 == 0:
+        raise ValueError("Half-band EMQF filters must have odd order.")
+
+    z, p, k = emqf.emqfap(N=N, stopband_attenuation=stopband_attenuation, f3db=True)
+    sigma = -p[0 : N - 1 : 2].real
+    a = np.sort((1.0 - sigma) / (1.0 + sigma))
+    return a[0::2], a[1::2]
+
+
+def _allpass_sos(a):
+    """First-order all-pass sections (a + z^-1) / (1 + a z^-1) as sos"""
+    a = np.asarray(a, dtype=float)
+    sos = np.zeros((len(a), 6), dtype=float)
+    sos[:, 0] = a
+    sos[:, 1] = 1.0
+    sos[:, 3] = 1.0
+    sos[:, 4] = a
+    return sos
+
+
+class HalfbandDecimator:
+    """
+    Streaming decimation by two with an EMQF half-band filter.
+
+    Both all-pass branches run at the decimated rate on `AllpassFilter`,
+    so each input sample pair costs one multiply for each of the
+    ``len(a0) + len(a1)`` first-order sections.
+
+    Parameters
+    ----------
+    a0, a1 : array_like
+        All-pass coefficients, see `halfband_allpass_coefficients()`.
+    n_channels : int
+        Number of channels. Input blocks have shape ``(n_channels, n)``,
+        or ``(n,)`` for a single channel.
+    backend : {'auto', 'numba', 'scipy'}
+        Backend of the all-pass branches, see `filtering.AllpassFilter`.
+    """
+
+    def __init__(self, a0, a1, n_channels: int = 1, backend: str = "auto"):
+        self.n_channels = int(n_channels)
+        self._branch0 = AllpassFilter(
+            _allpass_sos(a0), n_channels=self.n_channels, backend=backend
+        )
+        self._branch1 = AllpassFilter(
+            _allpass_sos(a1), n_channels=self.n_channels, backend=backend
+        )
+        self.reset()
+
+    def reset(self):
+        """Clear the filter state."""
+        self._branch0.reset()
+        self._branch1.reset()
+        self._odd = np.zeros((self.n_channels, 1))  # previous odd sample
+        self._pending = np.zeros((self.n_channels, 0))  # leftover input sample
+
+    def _branches(self, x):
+        x = np.asarray(x, dtype=float)
+        squeeze = x.ndim == 1
+        if squeeze:
+            x = x[np.newaxis, :]
+        if x.shape[0] != self.n_channels:
+            raise ValueError("Expected {} channels.".format(self.n_channels))
+
+        if self._pending.shape[1]:
+            x = np.concatenate([self._pending, x], axis=1)
+        n_even = x.shape[1] - x.shape[1] % 2
+        self._pending = x[:, n_even:]
+
+        # polyphase components: u[m] = x[2m] and v[m] = x[2m-1]
+        u = x[:, 0:n_even:2]
+        v = np.concatenate([self._odd, x[:, 1:n_even:2]], axis=1)
+        self._odd = v[:, -1:]
+        v = v[:, :-1]
+
+        u = self._branch0.process(u)
+        v = self._branch1.process(v)
+        if squeeze:
+            u, v = u[0], v[0]
+        return u, v
+
+    def process(self, x):
+        """
+        Filter and decimate a block of samples.
+
+        Parameters
+        ----------
+        x : array_like
+            Input block at the full rate. An odd trailing sample is kept
+            for the next call.
+
+        Returns
+        -------
+        y : ndarray
+            Lowpass filtered output at the decimated rate.
+        """
+        u, v = self._branches(x)
+        return 0.5 * (u + v)
+
+    def split(self, x):
+        """
+        Split a block of samples into decimated lowpass and highpass bands.
+
+        The highpass band ``0.5 * (A0 - A1)`` is power-complementary to the
+        lowpass band. Like `process()`, an odd trailing sample is kept.
+
+        Returns
+        -------
+        low, high : ndarray, ndarray
+            Lowpass and highpass outputs at the decimated rate.
+        """
+        u, v = self._branches(x)
+        return 0.5 * (u + v), 0.5 * (u - v)
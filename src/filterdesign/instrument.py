@@ -0,0 +1,192 @@
+"""
+Opt-in instrumentation of the design stages in `emqf` and `filterutils`.
+
+While enabled, the functions listed in `STAGES` are replaced by wrappers
+that record call counts, wall time and the size of the returned arrays.
+Disabling restores the original functions, so instrumentation costs
+nothing when it is off.
+
+    >>> from filterdesign import emqf, instrument
+    >>> with instrument.recording() as stats:
+    ...     sos = emqf.emqf_sos(9, 1000.0, fs=48000.0)
+    >>> stats["emqf.selectivity_factor"]["calls"]
+    1
+
+Calls made through references obtained before `enable()`, e.g. a function
+bound to a local name, are not recorded.
+"""
+
+import contextlib
+import functools
+import importlib
+import json
+import threading
+import time
+
+import numpy as np
+
+# attributes that are replaced, as "module.name" relative to the package.
+# Paths to an already listed object share its stage, e.g. the
+# `analog_zpk_response` imported into `emqf`.
+STAGES = (
+    "emqf.emqfap",
+    "emqf.emqfap_batch",
+    "emqf.emqf_sos",
+    "emqf.emqf_allpass_pair",
+    "emqf.emqford",
+    "emqf.emqford_batch",
+    "emqf.selectivity_factor",
+    "emqf._selectivity_factor",
+    "emqf.emqf_analog_prototype_from_selectivity_factor",
+    "emqf.emqf_analog_zeros_poles",
+    "emqf._emqf_zeros_poles",
+    "emqf.ellipk",
+    "emqf.ellipkm1",
+    "emqf.ellipj",
+    "filterutils.analog_zpk_response",
+    "emqf.analog_zpk_response",
+    "filterutils.cascade",
+)
+
+_lock = threading.Lock()
+_local = threading.local()
+_stats = dict()
+_patched = list()  # (namespace, name, original) to restore
+
+
+def _nbytes(value):
+    """Size of the arrays in a return value"""
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sum(_nbytes(v) for v in value)
+    return 0
+
+
+def _wrap(stage, func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = list()
+        stack.append(0.0)  # time spent in instrumented callees
+        result = None
+        start = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+            return result
+        finally:
+            seconds = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += seconds
+            with _lock:
+                entry = _stats.setdefault(stage, [0, 0.0, 0.0, 0])
+                entry[0] += 1
+                entry[1] += seconds
+                entry[2] += seconds - children
+                entry[3] += _nbytes(result)
+
+    return wrapper
+
+
+def is_enabled():
+    """Return True while the stages are instrumented."""
+    return bool(_patched)
+
+
+def enable():
+    """
+    Instrument all `STAGES`. Recorded statistics are kept, see `reset()`.
+    """
+    package = importlib.import_module(__package__)
+    modules = {
+        path: importlib.import_module("." + path.split(".")[0], __package__)
+        for path in STAGES
+    }
+    # concurrent calls must neither wrap twice nor lose the originals
+    with _lock:
+        if _patched:
+            return
+        wrappers = dict()  # id of the original -> wrapper, originals stay alive
+        for path in STAGES:
+            module, name = modules[path], path.split(".")[1]
+            original = getattr(module, name)
+            if id(original) not in wrappers:
+                wrappers[id(original)] = _wrap(path, original)
+            _patched.append((module, name, original))
+            setattr(module, name, wrappers[id(original)])
+
+        # public functions cached by the lazy loader of the package
+        for name, value in list(vars(package).items()):
+            if id(value) in wrappers:
+                _patched.append((package, name, value))
+                setattr(package, name, wrappers[id(value)])
+
+
+def disable():
+    """Restore the original functions. Recorded statistics are kept."""
+    with _lock:
+        while _patched:
+            namespace, name, original = _patched.pop()
+            setattr(namespace, name, original)
+
+
+def reset():
+    """Discard all recorded statistics."""
+    with _lock:
+        _stats.clear()
+
+
+def snapshot():
+    """
+    Return the recorded statistics.
+
+    Returns
+    -------
+    stats : dict
+        For every stage that was called, a dict with the keys
+
+        - ``calls``: number of calls
+        - ``seconds``: total wall time including instrumented callees
+        - ``self_seconds``: wall time excluding instrumented callees
+        - ``bytes``: total size of the returned arrays
+    """
+    with _lock:
+        return {
+            stage: dict(calls=calls, seconds=seconds, self_seconds=own, bytes=nbytes)
+            for stage, (calls, seconds, own, nbytes) in _stats.items()
+        }
+
+
+def to_json(**kwargs):
+    """
+    Return `snapshot()` as a JSON string.
+
+    Parameters
+    ----------
+    **kwargs
+        Passed on to `json.dumps`, e.g. ``indent``.
+    """
+    return json.dumps(snapshot(), **kwargs)
+
+
+@contextlib.contextmanager
+def recording():
+    """
+    Context manager that records the statistics of its body.
+
+    Statistics recorded before are discarded. The yielded dict is filled
+    with `snapshot()` on exit, and instrumentation is switched off again
+    unless it was enabled before.
+    """
+    was_enabled = is_enabled()
+    reset()
+    enable()
+    stats = dict()
+    try:
+        yield stats
+    finally:
+        if not was_enabled:
+            disable()
+        stats.update(snapshot())
@@ -0,0 +1,167 @@
+import math
+
+import numpy as np
+
+from . import emqf
+
+KINDS = ("lowpass", "highpass", "allpass")
+
+
+def _design(N, cutoff, kind, stopband_attenuation):
+    if kind == "allpass":
+        return np.concatenate(
+            emqf.emqf_allpass_pair(
+                N, cutoff, fs=1.0, stopband_attenuation=stopband_attenuation
+            )
+        )
+    return emqf.emqf_sos(
+        N, cutoff, fs=1.0, btype=kind, stopband_attenuation=stopband_attenuation
+    )
+
+
+class CoefficientTable:
+    """
+    Precomputed EMQF coefficients for fast cutoff modulation.
+
+    Second-order sections are designed on a grid of logarithmically spaced
+    normalized cutoff frequencies. `lookup()` linearly interpolates between
+    the two nearest grid points, which takes a few microseconds and is
+    suitable for per-block parameter updates.
+
+    Parameters
+    ----------
+    N : int
+        The order of the filter. Must be odd for ``kind="allpass"``.
+    stopband_attenuation : float
+        Stopband attenuation given in dB as a positive number.
+    kind : {'lowpass', 'highpass', 'allpass'}
+        Tabulate `emqf.emqf_sos()` lowpass or highpass sections, or the
+        all-pass pair of `emqf.emqf_allpass_pair()`.
+    n_points : int
+        Number of grid points.
+    f_min, f_max : float
+        Range of the grid as cutoff frequency divided by the sampling
+        frequency, ``0 < f_min < f_max < 0.5``.
+
+    Notes
+    -----
+    Interpolated filters are always stable: within each section the
+    denominators of neighbouring grid points are stable, and the set of
+    stable ``[1, a1, a2]`` is convex. The structure of the all-pass
+    sections is linear in its coefficients, so interpolated all-pass
+    sections stay exactly all-pass.
+    """
+
+    def __init__(
+        self,
+        N: int,
+        stopband_attenuation: float = 60,
+        kind: str = "lowpass",
+        n_points: int = 1024,
+        f_min: float = 1e-4,
+        f_max: float = 0.45,
+    ):
+        if kind not in KINDS:
+            raise ValueError("kind must be one of {}.".format(", ".join(KINDS)))
+        if not 0 < f_min < f_max < 0.5:
+            raise ValueError("Expected 0 < f_min < f_max < 0.5.")
+        if n_points < 2:
+            raise ValueError("n_points must be at least 2.")
+
+        self.N = int(N)
+        self.stopband_attenuation = float(stopband_attenuation)
+        self.kind = kind
+        cutoffs = np.geomspace(f_min, f_max, int(n_points))
+        sos = [_design(self.N, f, kind, stopband_attenuation) for f in cutoffs]
+        self._set_grid(cutoffs, np.stack(sos))
+
+    def _set_grid(self, cutoffs, sos):
+        self.cutoffs = cutoffs
+        self.sos = sos
+        self._f_min, self._f_max = float(cutoffs[0]), float(cutoffs[-1])
+        self._log_f_min = math.log(self._f_min)
+        log_range = math.log(self._f_max) - self._log_f_min
+        self._inv_step = (len(cutoffs) - 1) / log_range
+
+    @property
+    def n_sections(self):
+        """Number of sections returned by `lookup()`."""
+        return self.sos.shape[1]
+
+    def lookup(self, cutoff: float, fs: float = 1.0, out=None):
+        """
+        Interpolate the sections for a cutoff frequency.
+
+        Parameters
+        ----------
+        cutoff : float
+            Frequency of the -3 dB point, or the crossover frequency of the
+            all-pass pair, in the same units as `fs`.
+        fs : float
+            The sampling frequency of the digital system.
+        out : ndarray, optional
+            Buffer of shape ``(n_sections, 6)`` the sections are written
+            to. Avoids all allocations.
+
+        Returns
+        -------
+        sos : ndarray or (ndarray, ndarray)
+            Second-order sections, `out` if given. For ``kind="allpass"``
+            the two branches ``(sos0, sos1)`` as views into the sections.
+        """
+        f = cutoff / fs
+        if not self._f_min <= f <= self._f_max:
+            raise ValueError("cutoff is outside of the table range.")
+        position = (math.log(f) - self._log_f_min) * self._inv_step
+        i = min(int(position), len(self.sos) - 2)
+
+        if out is None:
+            out = np.empty(self.sos.shape[1:])
+        np.subtract(self.sos[i + 1], self.sos[i], out=out)
+        out *= position - i
+        out += self.sos[i]
+
+        if self.kind == "allpass":
+            n0 = (self.N // 2 + 1) // 2
+            return out[:n0], out[n0:]
+        return out
+
+    def save(self, file):
+        """
+        Store the table in a ``.npz`` file.
+
+        Parameters
+        ----------
+        file : str or file-like
+            Destination, see `numpy.savez`.
+        """
+        np.savez(
+            file,
+            N=self.N,
+            stopband_attenuation=self.stopband_attenuation,
+            kind=self.kind,
+            cutoffs=self.cutoffs,
+            sos=self.sos,
+        )
+
+    @classmethod
+    def load(cls, file):
+        """
+        Read a table stored by `save()` without designing any filter.
+
+        Parameters
+        ----------
+        file : str or file-like
+            Source, see `numpy.load`.
+
+        Returns
+        -------
+        table : CoefficientTable
+        """
+        with np.load(file) as data:
+            table = cls.__new__(cls)
+            table.N = int(data["N"])
+            table.stopband_attenuation = float(data["stopband_attenuation"])
+            table.kind = str(data["kind"])
+            table._set_grid(data["cutoffs"], data["sos"])
+        return table
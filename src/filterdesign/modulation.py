@@ -0,0 +1,104 @@
+import numpy as np
+
+from .filtering import LatticeAllpassFilter
+from .prepared import PreparedDesign
+
+
+class ModulatedEMQF:
+    """
+    Streaming EMQF lowpass or highpass with a time-varying cutoff
+    frequency.
+
+    The filter is realised as ``0.5 * (A0 + A1)`` or ``0.5 * (A0 - A1)``
+    with both all-pass branches in normalized lattice form, see
+    `filtering.LatticeAllpassFilter`. It stays stable under any cutoff
+    trajectory and needs no crossfade between two filter instances. New
+    coefficients come from a `prepared.PreparedDesign`.
+
+    Parameters
+    ----------
+    N : int
+        The order of the filter. Must be odd and at least 3.
+    cutoff : float
+        Initial frequency of the -3 dB point, in the same units as `fs`.
+    fs : float
+        The sampling frequency of the digital system.
+    btype : {'lowpass', 'highpass'}
+        The type of filter.
+    stopband_attenuation : float
+        Stopband attenuation given in dB as a positive number.
+    n_channels : int
+        Number of channels. Input blocks have shape ``(n_channels, n)``,
+        or ``(n,)`` for a single channel.
+    backend : {'auto', 'numba', 'numpy'}
+        See `filtering.LatticeAllpassFilter`.
+
+    Notes
+    -----
+    For a constant cutoff the output is that of `emqf.emqf_sos()`.
+    """
+
+    def __init__(
+        self,
+        N: int,
+        cutoff: float,
+        fs: float = 2.0,
+        btype: str = "lowpass",
+        stopband_attenuation: float = 60,
+        n_channels: int = 1,
+        backend="auto",
+    ):
+        if btype not in ("lowpass", "highpass"):
+            raise ValueError("btype must be 'lowpass' or 'highpass'.")
+        if N < 3:
+            raise ValueError("N must be at least 3.")
+        self.fs = float(fs)
+        self.sign = 1.0 if btype == "lowpass" else -1.0
+        self.design = PreparedDesign(N, stopband_attenuation)
+
+        sos0, sos1 = self.design.allpass_pair(cutoff, fs=self.fs)
+        self._branch0 = LatticeAllpassFilter(sos0, n_channels, backend=backend)
+        self._branch1 = LatticeAllpassFilter(sos1, n_channels, backend=backend)
+        self.n_channels = self._branch0.n_channels
+        self.cutoff = float(cutoff)
+
+    def reset(self):
+        """Clear the filter state. The cutoff frequency is kept."""
+        self._branch0.reset()
+        self._branch1.reset()
+
+    def process(self, x, cutoff=None):
+        """
+        Filter a block of samples.
+
+        Parameters
+        ----------
+        x : array_like
+            Input block with shape ``(n_channels, n)``, or ``(n,)`` for a
+            single channel.
+        cutoff : float or array_like, optional
+            A new cutoff frequency that is approached smoothly over the
+            block and reached at its last sample, or one cutoff frequency
+            per sample with shape ``(n,)``. Without, the cutoff is kept.
+
+        Returns
+        -------
+        y : ndarray
+            Filtered block.
+        """
+        sos0 = sos1 = None
+        if cutoff is not None:
+            cutoff = np.asarray(cutoff, dtype=float)
+            if cutoff.ndim > 1:
+                raise ValueError("cutoff must be a scalar or one-dimensional.")
+            sos0, sos1 = self.design.allpass_pair(
+                cutoff if cutoff.ndim else float(cutoff), fs=self.fs
+            )
+
+        y = self._branch0.process(x, sos0)
+        y1 = self._branch1.process(x, sos1)
+        y += self.sign * y1
+        y *= 0.5
+        if cutoff is not None and cutoff.size:
+            self.cutoff = float(cutoff.reshape(-1)[-1])
+        return y
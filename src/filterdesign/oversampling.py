@@ -0,0 +1,280 @@
+import itertools
+import math
+
+import numpy as np
+
+from . import emqf
+from .filtering import AllpassFilter
+from .halfband import HalfbandDecimator, _allpass_sos, halfband_allpass_coefficients
+
+
+def _attenuation(N, selectivity):
+    """Largest stopband attenuation in dB of an order N EMQF filter"""
+    # degree equation, the discrimination nome is the N'th power of the
+    # selectivity nome, see `emqf.emqford()`
+    m_s = selectivity**-2
+    log_q = emqf._log_nome(m_s, (selectivity - 1) * (selectivity + 1) * m_s)
+    k, _ = emqf._modulus_from_log_nome(N * log_q)
+    return 10 * math.log10(1 + 1 / k)
+
+
+def _odd_order(wp, stopband_attenuation):
+    """Lowest odd order with the attenuation and transition band (wp, 1/wp)"""
+    # EMQF half-bands have complementary passband and stopband ripple. The
+    # loss is tiny for high attenuations, log1p keeps it exact enough that
+    # it does not raise the attenuation returned by emqford().
+    ripple = 1 / math.expm1(stopband_attenuation * math.log(10) / 10)
+    gpass = 10 * math.log1p(ripple) / math.log(10)
+    N, _, _ = emqf.emqford(wp, 1 / wp, gpass, stopband_attenuation, analog=True)
+    return N if N % 2 else N + 1
+
+
+def halfband_stages(factor: int, passband: float = 0.4, stopband_attenuation=90):
+    """
+    Design the cascade of EMQF half-band filters for a power-of-two
+    resampling factor.
+
+    Stage k (counted from the base rate) runs at ``2**k`` times the base
+    rate, where the signal occupies an ever smaller fraction of the band,
+    so later stages get by with lower orders. The images or aliases that
+    leak through the stages add up in power. The attenuation is allocated
+    to the stages such that their sum stays below `stopband_attenuation`
+    at the least total multiplies: a stage whose order has attenuation to
+    spare lets another, more expensive stage use a lower order.
+
+    Parameters
+    ----------
+    factor : int
+        Resampling factor, a power of two.
+    passband : float
+        Passband edge as a fraction of the base sampling rate,
+        ``0 < passband < 0.5``.
+    stopband_attenuation : float
+        Attenuation of the images or aliases of all stages together in dB.
+
+    Returns
+    -------
+    stages : list of (ndarray, ndarray)
+        All-pass coefficients ``(a0, a1)`` of each stage, see
+        `halfband.halfband_allpass_coefficients()`, starting at the base
+        rate. Each stage has the highest attenuation its order achieves
+        with the transition band it needs.
+    """
+    factor = int(factor)
+    if factor < 2 or factor & (factor - 1):
+        raise ValueError("factor must be a power of two.")
+    if not 0 < passband < 0.5:
+        raise ValueError("passband must be between 0 and 0.5.")
+
+    n_stages = int(math.log2(factor))
+    wp = [math.tan(math.pi * passband / 2**k) for k in range(1, n_stages + 1)]
+    weights = [2**k for k in range(n_stages)]  # stage k runs at 2**(k - 1)
+
+    def cost(orders):
+        """Multiplies per base rate sample"""
+        return sum((N - 1) // 2 * w for N, w in zip(orders, weights))
+
+    # every stage alone must meet the attenuation, and splitting the leakage
+    # equally meets it for all stages together. No stage can be raised
+    # beyond the cost of the equal split.
+    lowest = [_odd_order(w, stopband_attenuation) for w in wp]
+    equal_split = stopband_attenuation + 10 * math.log10(n_stages)
+    budget = cost([_odd_order(w, equal_split) for w in wp]) - cost(lowest)
+    orders = [range(N, N + 2 * (budget // w) + 1, 2) for N, w in zip(lowest, weights)]
+
+    best = None
+    for candidate in itertools.product(*orders):
+        if cost(candidate) - cost(lowest) > budget:
+            continue
+        attenuation = [_attenuation(N, 1 / w**2) for N, w in zip(candidate, wp)]
+        leakage = sum(10 ** (-a / 10) for a in attenuation)
+        if leakage > 10 ** (-stopband_attenuation / 10) * (1 + 1e-9):
+            continue
+        if best is None or (cost(candidate), leakage) < best[:2]:
+            best = cost(candidate), leakage, candidate, attenuation
+
+    _, _, candidate, attenuation = best
+    return [halfband_allpass_coefficients(N, a) for N, a in zip(candidate, attenuation)]
+
+
+def _stage_latency(a0, a1):
+    """Group delay at DC of 0.5 * (A0(z^2) + z^-1 A1(z^2)) in samples"""
+    delay0 = np.sum(2 * (1 - a0) / (1 + a0))
+    delay1 = 1 + np.sum(2 * (1 - a1) / (1 + a1))
+    return 0.5 * (delay0 + delay1)
+
+
+class _Resampler:
+    def __init__(self, factor, passband, stopband_attenuation, n_channels):
+        self.factor = int(factor)
+        self.n_channels = int(n_channels)
+        self.stages = halfband_stages(factor, passband, stopband_attenuation)
+
+    @property
+    def latency(self):
+        """Group delay at DC in samples of the base rate."""
+        return sum(
+            _stage_latency(a0, a1) / 2**k
+            for k, (a0, a1) in enumerate(self.stages, start=1)
+        )
+
+    @property
+    def multiplies_per_sample(self):
+        """Multiplies per channel and sample of the base rate."""
+        # one per first-order section with the all-pass kernel, the biquads
+        # of scipy.signal.sosfilt take five
+        per_section = 1 if self.backend == "numba" else 5
+        # both branches run at the rate of the lower side of their stage
+        return per_section * sum(
+            (len(a0) + len(a1)) * 2 ** (k - 1)
+            for k, (a0, a1) in enumerate(self.stages, start=1)
+        )
+
+    def _check(self, x):
+        x = np.asarray(x, dtype=float)
+        x2d = x[np.newaxis, :] if x.ndim == 1 else x
+        if x2d.ndim != 2 or x2d.shape[0] != self.n_channels:
+            raise ValueError("Expected {} channels.".format(self.n_channels))
+        return x, x2d
+
+
+class Upsampler(_Resampler):
+    """
+    Streaming upsampling by a power of two with cascaded EMQF half-band
+    interpolators.
+
+    Each 2x stage runs both all-pass branches at its input rate and
+    interleaves their outputs, ``y[2m] = A0 x[m]`` and
+    ``y[2m + 1] = A1 x[m]``.
+
+    Parameters
+    ----------
+    factor : int
+        Upsampling factor, a power of two.
+    passband : float
+        Passband edge as a fraction of the input sampling rate.
+    stopband_attenuation : float
+        Image attenuation in dB, see `halfband_stages()`.
+    n_channels : int
+        Number of channels. Input blocks have shape ``(n_channels, n)``,
+        or ``(n,)`` for a single channel.
+    backend : {'auto', 'numba', 'scipy'}
+        Backend of the all-pass branches, see `filtering.AllpassFilter`.
+    """
+
+    def __init__(
+        self,
+        factor: int,
+        passband: float = 0.4,
+        stopband_attenuation: float = 90,
+        n_channels: int = 1,
+        backend: str = "auto",
+    ):
+        super().__init__(factor, passband, stopband_attenuation, n_channels)
+        self._branches = [
+            (
+                AllpassFilter(
+                    _allpass_sos(a0), n_channels=self.n_channels, backend=backend
+                ),
+                AllpassFilter(
+                    _allpass_sos(a1), n_channels=self.n_channels, backend=backend
+                ),
+            )
+            for a0, a1 in self.stages
+        ]
+        self.backend = self._branches[0][0].backend
+
+    def reset(self):
+        """Clear the filter state."""
+        for branches in self._branches:
+            for branch in branches:
+                branch.reset()
+
+    def process(self, x):
+        """
+        Upsample a block of samples.
+
+        Parameters
+        ----------
+        x : array_like
+            Input block with shape ``(n_channels, n)`` or ``(n,)``.
+
+        Returns
+        -------
+        y : ndarray
+            Output block with ``factor * n`` samples per channel.
+        """
+        x, y = self._check(x)
+        for branch0, branch1 in self._branches:
+            u = branch0.process(y)
+            v = branch1.process(y)
+            y = np.empty((self.n_channels, 2 * y.shape[1]))
+            y[:, 0::2] = u
+            y[:, 1::2] = v
+        return y[0] if x.ndim == 1 else y
+
+
+class Downsampler(_Resampler):
+    """
+    Streaming downsampling by a power of two with cascaded EMQF half-band
+    decimators, see `halfband.HalfbandDecimator`.
+
+    Parameters
+    ----------
+    factor : int
+        Downsampling factor, a power of two.
+    passband : float
+        Passband edge as a fraction of the output sampling rate.
+    stopband_attenuation : float
+        Alias attenuation in dB, see `halfband_stages()`.
+    n_channels : int
+        Number of channels. Input blocks have shape ``(n_channels, n)``,
+        or ``(n,)`` for a single channel.
+    backend : {'auto', 'numba', 'scipy'}
+        Backend of the all-pass branches, see `filtering.AllpassFilter`.
+
+    Notes
+    -----
+    The stages run in reverse order of `halfband_stages()`, from the
+    highest rate down to the output rate. Input samples that do not fill
+    a complete output sample are kept for the next call.
+    """
+
+    def __init__(
+        self,
+        factor: int,
+        passband: float = 0.4,
+        stopband_attenuation: float = 90,
+        n_channels: int = 1,
+        backend: str = "auto",
+    ):
+        super().__init__(factor, passband, stopband_attenuation, n_channels)
+        self._decimators = [
+            HalfbandDecimator(a0, a1, n_channels=self.n_channels, backend=backend)
+            for a0, a1 in reversed(self.stages)
+        ]
+        self.backend = self._decimators[0]._branch0.backend
+
+    def reset(self):
+        """Clear the filter state."""
+        for decimator in self._decimators:
+            decimator.reset()
+
+    def process(self, x):
+        """
+        Downsample a block of samples.
+
+        Parameters
+        ----------
+        x : array_like
+            Input block with shape ``(n_channels, n)`` or ``(n,)``.
+
+        Returns
+        -------
+        y : ndarray
+            Output block, ``n / factor`` samples per channel on average.
+        """
+        x, y = self._check(x)
+        for decimator in self._decimators:
+            y = decimator.process(y)
+        return y[0] if x.ndim == 1 else y
@@ -0,0 +1,254 @@
+import math
+
+import numpy as np
+
+from . import emqf
+
+
+class PreparedDesign:
+    """
+    EMQF design of fixed order and stopband attenuation, prepared for fast
+    cutoff and sampling frequency updates.
+
+    The analog prototype is computed once. With ``t = tan(pi * cutoff /
+    fs)`` every coefficient of the bilinear-transformed lowpass sections
+    is a polynomial of at most second degree in ``t``, so a digital
+    redesign is a small matrix product followed by a normalization, for
+    one or many cutoffs at once. Highpass filters follow from the lowpass
+    at ``1 / t`` by substituting ``-z`` for ``z``.
+
+    Parameters
+    ----------
+    N : int
+        The order of the filter.
+    stopband_attenuation : float
+        Stopband attenuation given in dB as a positive number.
+
+    Notes
+    -----
+    `sos()` returns the same sections as `emqf.emqf_sos()`, up to
+    rounding.
+    """
+
+    def __init__(self, N: int, stopband_attenuation: float = 60):
+        self.N = int(N)
+        self.stopband_attenuation = float(stopband_attenuation)
+        xi = emqf.selectivity_factor(self.N, self.stopband_attenuation)
+        self.z, self.p, self.k = emqf.emqf_analog_prototype_from_selectivity_factor(
+            self.N, xi, f3db=True
+        )
+        self.z.setflags(write=False)
+        self.p.setflags(write=False)
+        # gain of the highpass prototype s -> 1/s
+        self._k_highpass = self.k * np.real(emqf._prod_ratio(-self.z, -self.p))
+
+        # polynomial coefficients in t of each section, sections ordered
+        # as in `emqf.emqf_sos()`
+        odd = self.N % 2
+        n_pairs = self.N // 2
+        C = np.zeros((3, n_pairs + odd, 6))
+        if odd:
+            # t (1 + 1/z) / ((1 - p t) - (1 + p t) / z)
+            p_r = self.p[-1].real
+            C[1, 0, :2] = 1.0
+            C[:2, 0, 3] = 1.0, -p_r
+            C[:2, 0, 4] = -1.0, -p_r
+        # (s^2 + |z|^2) / (s^2 - 2 sigma s + |p|^2), s = (1 - 1/z) / (t (1 + 1/z))
+        z2 = np.abs(self.z[0::2]) ** 2
+        sigma = self.p[0 : 2 * n_pairs : 2].real
+        p2 = np.abs(self.p[0 : 2 * n_pairs : 2]) ** 2
+        pairs = C[:, odd:][:, ::-1]  # poles closest to the unit circle last
+        pairs[0] = [1.0, -2.0, 1.0, 1.0, -2.0, 1.0]
+        pairs[1, :, 3] = -2.0 * sigma
+        pairs[1, :, 5] = 2.0 * sigma
+        pairs[2, :, 0] = pairs[2, :, 2] = z2
+        pairs[2, :, 1] = 2.0 * z2
+        pairs[2, :, 3] = pairs[2, :, 5] = p2
+        pairs[2, :, 4] = 2.0 * p2
+        self._coefficients = C.reshape(3, -1)
+        self._denominators = np.ascontiguousarray(C[:, :, 3:]).reshape(3, -1)
+        # the same polynomials as (c0, c1, c2) per coefficient and section
+        self._polynomials = C.transpose(1, 2, 0).tolist()
+
+        # sections of the all-pass pair, see `emqf.emqf_allpass_pair()`:
+        # sorted by the imaginary part of their pole, alternately to A1 and A0
+        imag = np.abs(self.p[0 : 2 * n_pairs : 2].imag)[::-1]
+        order = np.argsort(np.concatenate([np.zeros(odd), imag]), kind="stable")
+        self._allpass_rows = order[1::2], order[0::2]
+        self._allpass_lists = order[1::2].tolist(), order[0::2].tolist()
+
+    @property
+    def n_sections(self):
+        """Number of sections returned by `sos()`."""
+        return (self.N + 1) // 2
+
+    @staticmethod
+    def _tan(cutoff, fs):
+        """tan(pi * cutoff / fs), a float for scalar cutoffs"""
+        # the isinstance check spares floats the comparatively slow np.ndim
+        if isinstance(cutoff, float) or np.ndim(cutoff) == 0:
+            f = float(cutoff) / fs
+            if not 0 < f < 0.5:
+                raise ValueError("cutoff must be between 0 and fs/2.")
+            return math.tan(math.pi * f)
+        f = np.asarray(cutoff, dtype=float) / fs
+        if not (np.all(f > 0) and np.all(f < 0.5)):
+            raise ValueError("cutoff must be between 0 and fs/2.")
+        return np.tan(np.pi * f)
+
+    def sos(self, cutoff, fs: float = 2.0, btype: str = "lowpass", out=None):
+        """
+        Second-order sections for one or many cutoff frequencies.
+
+        Parameters
+        ----------
+        cutoff : float or array_like
+            Frequencies of the -3 dB point, in the same units as `fs`.
+        fs : float
+            The sampling frequency of the digital system.
+        btype : {'lowpass', 'highpass'}
+            The type of filter.
+        out : ndarray, optional
+            Buffer of shape ``cutoff.shape + (n_sections, 6)`` the sections
+            are written to.
+
+        Returns
+        -------
+        sos : ndarray
+            Second-order sections with shape ``cutoff.shape + (n_sections,
+            6)``, see `emqf.emqf_sos()`.
+        """
+        if btype not in ("lowpass", "highpass"):
+            raise ValueError("btype must be 'lowpass' or 'highpass'.")
+        t = self._tan(cutoff, fs)
+        if btype == "highpass":
+            t = 1.0 / t
+        scalar = isinstance(t, float)
+        shape = (() if scalar else t.shape) + (self.n_sections, 6)
+        if out is not None and (out.shape != shape or not out.flags.c_contiguous):
+            raise ValueError(
+                "out must be a contiguous array of shape {}.".format(shape)
+            )
+
+        if scalar:
+            # a single design in float arithmetic with one conversion to an
+            # array at the end, numpy calls would dominate for few sections
+            t2 = t * t
+            gain = float(self.k)
+            sections = list()
+            for polynomials in self._polynomials:
+                b0, b1, b2, a0, a1, a2 = [
+                    c0 + c1 * t + c2 * t2 for c0, c1, c2 in polynomials
+                ]
+                gain *= b0 / a0
+                sections += 1.0, b1 / b0, b2 / b0, 1.0, a1 / a0, a2 / a0
+            sections[:3] = gain, gain * sections[1], gain * sections[2]
+            if btype == "highpass":
+                sections[1::3] = [-c for c in sections[1::3]]
+            if out is None:
+                return np.array(sections).reshape(shape)
+            out.reshape(-1)[:] = sections
+            return out
+
+        if out is None:
+            out = np.empty(shape)
+        t = t.reshape(-1, 1)
+        t = np.concatenate([np.ones_like(t), t, t * t], axis=1)
+
+        # sections normalized to a0 = 1 and b0 = 1, the gain goes first
+        sections = np.dot(t, self._coefficients, out=out.reshape(len(t), -1))
+        sections = sections.reshape(-1, self.n_sections, 6)
+        sections /= sections[..., 3:4]
+        gains = sections[..., 0].copy()
+        sections[..., :3] /= gains[..., np.newaxis]
+        sections[:, 0, :3] *= (self.k * gains.prod(axis=-1))[:, np.newaxis]
+        if btype == "highpass":
+            sections[..., 1::3] *= -1.0
+        return out
+
+    def allpass_pair(self, cutoff, fs: float = 2.0):
+        """
+        Parallel all-pass realisations for one or many cutoff frequencies.
+
+        Parameters
+        ----------
+        cutoff : float or array_like
+            Frequencies of the -3 dB point, in the same units as `fs`.
+        fs : float
+            The sampling frequency of the digital system.
+
+        Returns
+        -------
+        sos0, sos1 : ndarray, ndarray
+            Sections of the all-pass filters A0 and A1 with shapes
+            ``cutoff.shape + (n, 6)``, see `emqf.emqf_allpass_pair()`.
+        """
+        if self.N % 2 == 0:
+            raise ValueError("The all-pass realisation requires an odd order.")
+        t = self._tan(cutoff, fs)
+
+        # only the denominators of the lowpass sections are needed, the
+        # real pole is the first section of A1
+        if isinstance(t, float):
+            t2 = t * t
+            a = list()
+            for polynomials in self._polynomials:
+                a0, a1, a2 = [c0 + c1 * t + c2 * t2 for c0, c1, c2 in polynomials[3:]]
+                a.append((a1 / a0, a2 / a0))
+            pair = list()
+            for rows in self._allpass_lists:
+                sections = list()
+                for row in rows:
+                    a1, a2 = a[row]
+                    sections += a2, a1, 1.0, 1.0, a1, a2
+                pair.append(sections)
+            pair[1][:3] = pair[1][4], 1.0, 0.0
+            return tuple(np.array(sections).reshape(-1, 6) for sections in pair)
+
+        powers = t.reshape(-1, 1)
+        powers = np.concatenate([np.ones_like(powers), powers, powers * powers], axis=1)
+        a = np.dot(powers, self._denominators).reshape(t.shape + (-1, 3))
+        a = a[..., 1:] / a[..., :1]
+        pair = list()
+        for rows in self._allpass_rows:
+            sos = np.empty(a.shape[:-2] + (len(rows), 6))
+            sos[..., 0] = sos[..., 5] = a[..., rows, 1]
+            sos[..., 1] = sos[..., 4] = a[..., rows, 0]
+            sos[..., 2] = sos[..., 3] = 1.0
+            pair.append(sos)
+        real = pair[1][..., 0, :]
+        real[..., 0] = real[..., 4]
+        real[..., 1] = 1.0
+        real[..., 2] = 0.0
+        return tuple(pair)
+
+    def zpk(self, cutoff, btype: str = "lowpass"):
+        """
+        Analog zeros, poles and gain for one or many cutoff frequencies.
+
+        Parameters
+        ----------
+        cutoff : float or array_like
+            Angular frequencies of the -3 dB point in rad/s.
+        btype : {'lowpass', 'highpass'}
+            The type of filter.
+
+        Returns
+        -------
+        z, p, k : ndarray, ndarray, float or ndarray
+            Zeros and poles with shape ``cutoff.shape + (n,)`` and gains
+            with the shape of `cutoff`, as `scipy.signal.lp2lp_zpk` or
+            `scipy.signal.lp2hp_zpk` of the prototype.
+        """
+        wc = np.asarray(cutoff, dtype=float)
+        if np.any(wc <= 0):
+            raise ValueError("cutoff must be positive.")
+        w = wc[..., np.newaxis]
+        if btype == "lowpass":
+            return w * self.z, w * self.p, self.k * np.power(wc, self.N % 2)
+        if btype == "highpass":
+            z = w / self.z
+            if self.N % 2:
+                z = np.concatenate([z, np.zeros(wc.shape + (1,))], axis=-1)
+            return z, w / self.p, self._k_highpass * np.ones_like(wc)
+        raise ValueError("btype must be 'lowpass' or 'highpass'.")
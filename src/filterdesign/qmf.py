@@ -0,0 +1,198 @@
+import numpy as np
+
+from .filtering import SosFilter
+from .halfband import HalfbandDecimator, _allpass_sos, halfband_allpass_coefficients
+
+
+def _delayed_allpass_sos(a0, a1):
+    """z^-1 A0(z^2) A1(z^2), the response of one analysis-synthesis level"""
+    a = np.concatenate([a0, a1])
+    sos = np.zeros((len(a) + 1, 6))
+    sos[:-1, 0] = a
+    sos[:-1, 2] = 1.0
+    sos[:-1, 3] = 1.0
+    sos[:-1, 5] = a
+    sos[-1] = [0.0, 1.0, 0.0, 1.0, 0.0, 0.0]
+    return sos
+
+
+class _UpsampledFilter:
+    """Run H(z^M) as H(z) on the M polyphase components of each channel."""
+
+    def __init__(self, sos, M, n_channels):
+        self.M = M
+        self._filter = SosFilter(sos, n_channels=n_channels * M)
+
+    def reset(self):
+        self._filter.reset()
+
+    def process(self, x):
+        n_channels, n = x.shape
+        phases = x.reshape(n_channels, n // self.M, self.M).transpose(0, 2, 1)
+        y = self._filter.process(phases.reshape(n_channels * self.M, -1))
+        y = y.reshape(n_channels, self.M, -1).transpose(0, 2, 1)
+        return y.reshape(n_channels, n)
+
+
+class OctaveFilterbank:
+    """
+    Octave-band QMF analysis and synthesis filterbank.
+
+    Each level splits the lowpass band of the previous level with the same
+    EMQF half-band filter into decimated lowpass and highpass bands, see
+    `halfband.HalfbandDecimator.split()`. Every level runs at its
+    decimated rate, so the total analysis cost is below twice the cost of
+    the first level.
+
+    Synthesis reverses the tree. The reconstruction has the magnitude of
+    the input and the phase of the all-pass `transfer_sos()` per level.
+    To align it with the reconstructed lowpass band, the highpass band of
+    every level is delayed by the responses of all deeper levels. This
+    compensation filters ``levels - 2 + 2**(1 - levels)`` samples with
+    `transfer_sos()` per input sample, so unlike analysis the synthesis
+    cost grows linearly with the number of levels.
+
+    Parameters
+    ----------
+    levels : int
+        Number of octave splits, resulting in ``levels + 1`` bands.
+    N : int
+        The order of the half-band filter. Must be odd.
+    stopband_attenuation : float
+        Stopband attenuation given in dB as a positive number.
+    n_channels : int
+        Number of channels. Input blocks have shape ``(n_channels, n)``,
+        or ``(n,)`` for a single channel.
+
+    Notes
+    -----
+    Block lengths must be multiples of ``2**levels``. Analysis and
+    synthesis keep separate states, so both can run on the same stream.
+    """
+
+    def __init__(
+        self,
+        levels: int,
+        N: int = 7,
+        stopband_attenuation: float = 60,
+        n_channels: int = 1,
+    ):
+        if levels < 1:
+            raise ValueError("levels must be at least 1.")
+        self.levels = int(levels)
+        self.n_channels = int(n_channels)
+        self.a0, self.a1 = halfband_allpass_coefficients(N, stopband_attenuation)
+
+        self._analysis = [
+            HalfbandDecimator(self.a0, self.a1, n_channels=self.n_channels)
+            for _ in range(self.levels)
+        ]
+        # synthesis branches, applied after the sum and difference
+        self._synthesis = [
+            (
+                SosFilter(_allpass_sos(self.a1), n_channels=self.n_channels),
+                SosFilter(_allpass_sos(self.a0), n_channels=self.n_channels),
+            )
+            for _ in range(self.levels)
+        ]
+        # the highpass band of level k waits for the deeper levels, which
+        # contribute transfer_sos(z^(2^j)) for j = 0 .. levels - k - 1
+        sos = _delayed_allpass_sos(self.a0, self.a1)
+        self._compensation = [
+            [_UpsampledFilter(sos, 2**j, self.n_channels) for j in range(depth)]
+            for depth in range(self.levels - 1, -1, -1)
+        ]
+
+    @property
+    def n_bands(self):
+        return self.levels + 1
+
+    def transfer_sos(self):
+        """
+        Second-order sections of the all-pass response ``z^-1 A0(z^2)
+        A1(z^2)`` of one analysis-synthesis level. The whole filterbank
+        has the response ``prod(H(z^(2^j)) for j in range(levels))``.
+        """
+        return _delayed_allpass_sos(self.a0, self.a1)
+
+    def reset(self):
+        """Clear the analysis and synthesis states."""
+        for decimator in self._analysis:
+            decimator.reset()
+        for branches in self._synthesis:
+            for branch in branches:
+                branch.reset()
+        for filters in self._compensation:
+            for f in filters:
+                f.reset()
+
+    def _check(self, x):
+        x = np.asarray(x, dtype=float)
+        x2d = x[np.newaxis, :] if x.ndim == 1 else x
+        if x2d.ndim != 2 or x2d.shape[0] != self.n_channels:
+            raise ValueError("Expected {} channels.".format(self.n_channels))
+        return x, x2d
+
+    def analysis(self, x):
+        """
+        Split a block of samples into octave bands.
+
+        Parameters
+        ----------
+        x : array_like
+            Input block with a length that is a multiple of
+            ``2**levels``.
+
+        Returns
+        -------
+        bands : list of ndarray
+            The highpass bands of levels 1 to `levels` followed by the
+            final lowpass band. Band k has ``n / 2**(k + 1)`` samples, the
+            last two bands have the same length.
+        """
+        x, x2d = self._check(x)
+        if x2d.shape[1] % 2**self.levels:
+            raise ValueError("Block length must be a multiple of 2**levels.")
+
+        bands = list()
+        low = x2d
+        for decimator in self._analysis:
+            low, high = decimator.split(low)
+            bands.append(high)
+        bands.append(low)
+        return [b[0] for b in bands] if x.ndim == 1 else bands
+
+    def synthesis(self, bands):
+        """
+        Reconstruct a block of samples from octave bands.
+
+        Parameters
+        ----------
+        bands : list of array_like
+            Bands as returned by `analysis()`.
+
+        Returns
+        -------
+        y : ndarray
+            Reconstructed block at the full rate.
+        """
+        if len(bands) != self.n_bands:
+            raise ValueError("Expected {} bands.".format(self.n_bands))
+        squeeze = np.ndim(bands[0]) == 1
+        bands = [self._check(b)[1] for b in bands]
+
+        low = bands[-1]
+        for level in range(self.levels - 1, -1, -1):
+            high = bands[level]
+            if low.shape != high.shape:
+                raise ValueError("Band lengths do not match the tree.")
+            for f in self._compensation[level]:
+                high = f.process(high)
+
+            branch_sum, branch_diff = self._synthesis[level]
+            u = branch_sum.process(low + high)
+            v = branch_diff.process(low - high)
+            low = np.empty((self.n_channels, 2 * u.shape[1]))
+            low[:, 0::2] = v
+            low[:, 1::2] = u
+        return low[0] if squeeze else low
@@ -0,0 +1,216 @@
+"""
+Frequency response evaluation directly from zeros/poles or second-order
+sections, without converting to polynomial (b, a) form.
+
+The response is accumulated as a sum of logarithms over all roots, which
+neither overflows for high orders nor needs phase unwrapping. Both
+functions evaluate a batch of filters at once and process the frequency
+grid in chunks to bound the memory use.
+"""
+
+import numpy as np
+
+from .filterutils import _as_sos
+
+_CHUNK_ELEMENTS = 1 << 18  # per filter and frequency, for automatic chunking
+
+
+def _chunks(n, n_filters, chunk_size):
+    if chunk_size is None:
+        chunk_size = max(_CHUNK_ELEMENTS // max(n_filters, 1), 1)
+    elif chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1.")
+    for start in range(0, n, int(chunk_size)):
+        yield slice(start, min(start + int(chunk_size), n))
+
+
+def _as_batch(roots, n_filters):
+    roots = np.asarray(roots, dtype=complex)
+    if roots.ndim == 1:
+        roots = np.broadcast_to(roots, (n_filters, len(roots)))
+    return roots
+
+
+def _factors(z, p, fill):
+    """
+    Yield each root as a column with the sign of its contribution. NaN
+    roots are replaced by `fill` and get a zero weight, so their
+    contribution vanishes without masking the full frequency grid.
+    """
+    for roots, sign in ((z, 1.0), (p, -1.0)):
+        for root in roots.T:
+            root = root[:, np.newaxis]
+            valid = ~np.isnan(root)
+            yield np.where(valid, root, fill), sign * valid
+
+
+def _accumulate(d, weight, out):
+    """Add weight * log(d) to the log magnitude and phase accumulators."""
+    log_magnitude, phase, _ = out
+    abs2 = d.real**2 + d.imag**2
+    log_magnitude += 0.5 * weight * np.log(abs2)
+    phase += weight * np.arctan2(d.imag, d.real)
+    return abs2
+
+
+def _analog(k, z, p, w, out):
+    # H(jw) = k prod(jw - z) / prod(jw - p)
+    group_delay = out[2]
+    s = 1j * w
+    for root, weight in _factors(z, p, fill=-1.0):
+        d = s - root
+        abs2 = _accumulate(d, weight, out)
+        group_delay += weight * root.real / abs2
+    _accumulate(k[:, np.newaxis].astype(complex), 1.0, out)
+
+
+def _digital(k, z, p, delay, theta, out):
+    # H(z) = k z^-delay prod(1 - z_i z^-1) / prod(1 - p_i z^-1)
+    phase, group_delay = out[1:]
+    z_inv = np.exp(-1j * theta)
+    for root, weight in _factors(z, p, fill=0.0):
+        rz = root * z_inv
+        d = 1.0 - rz
+        abs2 = _accumulate(d, weight, out)
+        group_delay -= weight * (rz.real * d.real + rz.imag * d.imag) / abs2
+    _accumulate(k[:, np.newaxis].astype(complex), 1.0, out)
+    phase -= delay[:, np.newaxis] * theta
+    group_delay += delay[:, np.newaxis]
+
+
+def _evaluate(func, args, w, n_filters, chunk_size, squeeze):
+    w = np.asarray(w, dtype=float)
+    shape = w.shape
+    w = w.ravel()
+    out = np.zeros((3, n_filters, len(w)))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for chunk in _chunks(len(w), n_filters, chunk_size):
+            func(*args, w[chunk], out=out[:, :, chunk])
+        log_magnitude, phase, group_delay = out
+        magnitude = np.exp(log_magnitude)
+
+    shape = shape if squeeze else (n_filters,) + shape
+    return (
+        magnitude.reshape(shape),
+        phase.reshape(shape),
+        group_delay.reshape(shape),
+    )
+
+
+def zpk_response(zpk, w, fs=None, chunk_size=None):
+    """
+    Evaluate the frequency response of one or many filters in zpk form.
+
+    Parameters
+    ----------
+    zpk : tuple
+        Zeros, poles and system gain. For a batch of filters the zeros and
+        poles have shape ``(n_filters, n)`` and the gain has shape
+        ``(n_filters,)``. NaN entries are ignored, so designs of different
+        order can be padded as returned by `emqf.emqfap_batch()`.
+    w : array_like
+        Frequencies at which the response is evaluated. Angular
+        frequencies [rad/s] for analog filters, or frequencies in the same
+        units as `fs` for digital filters.
+    fs : float, optional
+        Sampling frequency of a digital filter. If not given, the filter is
+        analog.
+    chunk_size : int, optional
+        Number of frequencies evaluated at once. By default the chunk size
+        is chosen such that temporary arrays stay small.
+
+    Returns
+    -------
+    magnitude, phase, group_delay : ndarray, ndarray, ndarray
+        Linear magnitude, phase in radians and group delay with shape
+        ``w.shape``, or ``(n_filters,) + w.shape`` for a batch. The group
+        delay is given in seconds for analog filters and in samples for
+        digital filters.
+
+    Notes
+    -----
+    The phase is a sum of the phases of all factors and therefore
+    continuous, except for jumps of pi at zeros on the frequency axis.
+    """
+    z, p, k = zpk
+    k = np.asarray(k)
+    squeeze = k.ndim == 0 and np.ndim(z) <= 1 and np.ndim(p) <= 1
+    n_filters = len(np.atleast_1d(k))
+    if np.ndim(z) == 2:
+        n_filters = max(n_filters, len(z))
+    if np.ndim(p) == 2:
+        n_filters = max(n_filters, len(p))
+
+    z = _as_batch(z, n_filters)
+    p = _as_batch(p, n_filters)
+    k = np.broadcast_to(k, (n_filters,))
+    if fs is None:
+        return _evaluate(_analog, (k, z, p), w, n_filters, chunk_size, squeeze)
+
+    delay = np.sum(~np.isnan(p), axis=1) - np.sum(~np.isnan(z), axis=1)
+    w = 2 * np.pi * np.asarray(w, dtype=float) / fs
+    args = (k, z, p, delay.astype(float))
+    return _evaluate(_digital, args, w, n_filters, chunk_size, squeeze)
+
+
+def _section_factors(c):
+    """
+    Factor c0 + c1 x + c2 x^2 with x = z^-1 into gain * x^delay times
+    prod(1 - r x) for all sections along the last axis.
+    """
+    c0, c1, c2 = c[..., 0], c[..., 1], c[..., 2]
+    delay = np.where(c0 != 0, 0, np.where(c1 != 0, 1, 2))
+    gain = np.choose(delay, [c0, c1, c2])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # roots of c0 z^2 + c1 z + c2 in a cancellation free form
+        sqrt = np.sqrt(c1.astype(complex) ** 2 - 4 * c0 * c2)
+        sqrt = np.where((np.conj(c1) * sqrt).real < 0, -sqrt, sqrt)
+        q = -0.5 * (c1 + sqrt)
+        r1 = np.where(q != 0, q / c0, 0.0)
+        r2 = np.where(q != 0, c2 / q, 0.0)
+        r_linear = -c2 / c1
+
+    r1 = np.where(delay == 0, r1, np.where(delay == 1, r_linear, np.nan))
+    r2 = np.where(delay == 0, r2, np.nan)
+    roots = np.stack([r1, r2], axis=-1).reshape(c.shape[:-2] + (2 * c.shape[-2],))
+    return np.prod(gain, axis=-1), roots, np.sum(delay, axis=-1)
+
+
+def sos_response(sos, w, fs=2.0, chunk_size=None):
+    """
+    Evaluate the frequency response of one or many digital filters in sos
+    form.
+
+    Parameters
+    ----------
+    sos : array_like or FilterDesign
+        Second-order sections with shape ``(n_sections, 6)``, or
+        ``(n_filters, n_sections, 6)`` for a batch of filters, or a digital
+        `design.FilterDesign`.
+    w : array_like
+        Frequencies at which the response is evaluated, in the same units
+        as `fs`.
+    fs : float
+        The sampling frequency of the digital system.
+    chunk_size : int, optional
+        Number of frequencies evaluated at once, see `zpk_response()`.
+
+    Returns
+    -------
+    magnitude, phase, group_delay : ndarray, ndarray, ndarray
+        Linear magnitude, phase in radians and group delay in samples with
+        shape ``w.shape``, or ``(n_filters,) + w.shape`` for a batch. An
+        empty cascade has unity magnitude and zero phase.
+    """
+    sos = np.asarray(_as_sos(sos), dtype=float)
+    if sos.ndim not in (2, 3) or sos.shape[-1] != 6:
+        raise ValueError("sos must have shape (n_sections, 6).")
+    squeeze = sos.ndim == 2
+    sos = sos.reshape((1 if squeeze else len(sos),) + sos.shape[-2:])
+
+    b_gain, z, b_delay = _section_factors(sos[..., :3])
+    a_gain, p, a_delay = _section_factors(sos[..., 3:])
+    w = 2 * np.pi * np.asarray(w, dtype=float) / fs
+    args = (b_gain / a_gain, z, p, (b_delay - a_delay).astype(float))
+    return _evaluate(_digital, args, w, len(sos), chunk_size, squeeze)
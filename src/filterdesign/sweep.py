@@ -0,0 +1,208 @@
+"""
+Parameter sweeps over `emqf.emqf_sos()` designs for building design
+tables.
+
+The grid of all combinations of order, stopband attenuation, cutoff and
+sampling frequency is split into chunks that are designed in a process
+pool. Results are written to memory-mapped ``.npy`` files in an output
+directory as soon as a chunk is finished, so the table never has to fit
+into memory and an interrupted sweep can be resumed.
+"""
+
+import multiprocessing
+import os
+import time
+
+import numpy as np
+
+from . import emqf
+
+PARAMETERS = ("N", "stopband_attenuation", "cutoff", "fs")
+IDENTITY_SECTION = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
+
+def _path(directory, name):
+    return os.path.join(directory, name + ".npy")
+
+
+def _grid(N, stopband_attenuation, cutoff, fs):
+    axes = [
+        np.atleast_1d(np.asarray(a, dtype=float)).ravel()
+        for a in (N, stopband_attenuation, cutoff, fs)
+    ]
+    if np.any(axes[0] != np.round(axes[0])) or np.any(axes[0] < 1):
+        raise ValueError("Filter orders must be positive integers.")
+    mesh = np.meshgrid(*axes, indexing="ij")
+    return [m.ravel() for m in mesh]
+
+
+def _design_chunk(task):
+    """Worker: design one chunk of the grid, returns the sections."""
+    index, N, a_s, cutoff, fs, btype, n_sections = task
+    start = time.perf_counter()
+    sos = np.empty((len(N), n_sections, 6))
+    sos[...] = IDENTITY_SECTION
+    for i in range(len(N)):
+        n = (int(N[i]) + 1) // 2
+        try:
+            emqf.emqf_sos(
+                int(N[i]),
+                cutoff[i],
+                fs=fs[i],
+                btype=btype,
+                stopband_attenuation=a_s[i],
+                out=sos[i, :n],
+            )
+        except ValueError:
+            sos[i] = np.nan  # e.g. cutoff above fs/2
+    return index, sos, time.perf_counter() - start
+
+
+def _open(directory, grid, n_sections, chunk_size, resume):
+    """Open the output arrays, reusing a matching previous sweep."""
+    n = len(grid[0])
+    n_chunks = -(-n // chunk_size)
+    if resume and os.path.exists(_path(directory, "done")):
+        previous = [
+            np.load(_path(directory, name), mmap_mode="r") for name in PARAMETERS
+        ]
+        sos = np.load(_path(directory, "sos"), mmap_mode="r+")
+        done = np.load(_path(directory, "done"), mmap_mode="r+")
+        same_grid = all(
+            len(a) == n and np.array_equal(a, b) for a, b in zip(previous, grid)
+        )
+        if same_grid and sos.shape == (n, n_sections, 6) and len(done) == n_chunks:
+            return sos, done
+        raise ValueError(
+            "The existing sweep in {!r} has different parameters.".format(directory)
+        )
+
+    os.makedirs(directory, exist_ok=True)
+    for name, values in zip(PARAMETERS, grid):
+        np.save(_path(directory, name), values)
+    sos = np.lib.format.open_memmap(
+        _path(directory, "sos"), mode="w+", dtype=float, shape=(n, n_sections, 6)
+    )
+    done = np.lib.format.open_memmap(
+        _path(directory, "done"), mode="w+", dtype=bool, shape=(n_chunks,)
+    )
+    return sos, done
+
+
+def design_sweep(
+    directory,
+    N,
+    stopband_attenuation,
+    cutoff,
+    fs,
+    btype: str = "lowpass",
+    chunk_size: int = 256,
+    processes=None,
+    resume: bool = True,
+    progress=None,
+):
+    """
+    Design digital EMQF filters for all combinations of the parameters.
+
+    Parameters
+    ----------
+    directory : str
+        Output directory. It receives one ``.npy`` file per parameter
+        holding the flattened grid, ``sos.npy`` with the designs and
+        ``done.npy`` with the completion flag of each chunk.
+    N : array_like of int
+        Filter orders.
+    stopband_attenuation : array_like
+        Stopband attenuations in dB.
+    cutoff : array_like
+        -3 dB frequencies, in the same units as `fs`.
+    fs : array_like
+        Sampling frequencies.
+    btype : {'lowpass', 'highpass'}
+        The type of all filters.
+    chunk_size : int
+        Number of designs per work item.
+    processes : int, optional
+        Number of worker processes, by default the number of CPUs. With 0
+        the designs are computed in the calling process.
+    resume : bool
+        Continue a previous sweep with the same parameters in `directory`
+        by skipping all finished chunks. Otherwise existing results are
+        overwritten.
+    progress : callable, optional
+        Called after each finished chunk as ``progress(info)`` with a dict
+        with the keys ``chunk``, ``n_done``, ``n_chunks`` and ``seconds``,
+        the time the worker spent on the chunk.
+
+    Returns
+    -------
+    table : dict
+        Read-only memory-mapped arrays as returned by `load_sweep()`.
+
+    Notes
+    -----
+    The grid is ordered like ``numpy.meshgrid(..., indexing="ij")`` of the
+    parameters in the order above. All designs share the shape
+    ``(n_sections, 6)`` of the highest order; lower orders are padded with
+    identity sections, so each entry can be filtered as is. Designs that
+    are not realizable, e.g. with a cutoff above ``fs / 2``, are NaN.
+    """
+    if btype not in ("lowpass", "highpass"):
+        raise ValueError("btype must be 'lowpass' or 'highpass'.")
+    chunk_size = int(chunk_size)
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1.")
+
+    grid = _grid(N, stopband_attenuation, cutoff, fs)
+    n_sections = (int(np.max(grid[0])) + 1) // 2
+    sos, done = _open(directory, grid, n_sections, chunk_size, resume)
+
+    def tasks():
+        for index in np.flatnonzero(~done):
+            chunk = slice(index * chunk_size, (index + 1) * chunk_size)
+            N, a_s, cutoff, fs = (a[chunk] for a in grid)
+            yield index, N, a_s, cutoff, fs, btype, n_sections
+
+    def store(result):
+        index, chunk_sos, seconds = result
+        sos[index * chunk_size : index * chunk_size + len(chunk_sos)] = chunk_sos
+        sos.flush()
+        done[index] = True  # only flagged once the sections are on disk
+        done.flush()
+        if progress is not None:
+            n_done = int(np.count_nonzero(done))
+            progress(
+                dict(
+                    chunk=int(index), n_done=n_done, n_chunks=len(done), seconds=seconds
+                )
+            )
+
+    if processes == 0:
+        for task in tasks():
+            store(_design_chunk(task))
+    else:
+        with multiprocessing.Pool(processes) as pool:
+            for result in pool.imap_unordered(_design_chunk, tasks()):
+                store(result)
+
+    del sos, done
+    return load_sweep(directory)
+
+
+def load_sweep(directory):
+    """
+    Open the results of `design_sweep()`.
+
+    Parameters
+    ----------
+    directory : str
+        Output directory of the sweep.
+
+    Returns
+    -------
+    table : dict
+        Read-only memory-mapped arrays with the keys of `PARAMETERS`,
+        ``sos`` and ``done``.
+    """
+    names = PARAMETERS + ("sos", "done")
+    return {name: np.load(_path(directory, name), mmap_mode="r") for name in names}
@@ -0,0 +1,62 @@
+import unittest
+
+import numpy as np
+from scipy import signal
+from filterdesign import bench, oversampling
+
+
+class TestBench(unittest.TestCase):
+    def test_run(self):
+        results = bench.run(
+            orders=[3], suites=["design", "runtime"], repeat=1, min_time=1e-4
+        )
+        names = {r["name"] for r in results}
+        self.assertIn("emqf_sos", names)
+        self.assertIn("scipy_zpk2sos_chain", names)
+        self.assertIn("SosFilter.process", names)
+        for r in results:
+            self.assertEqual(r["N"], 3)
+            self.assertGreater(r["seconds"], 0)
+
+    def test_streaming_suite(self):
+        results = bench.run(orders=[3], suites=["streaming"], repeat=1, min_time=0)
+        n_cases = len(bench.STREAMING_CHANNELS) * len(bench.STREAMING_BLOCK_SIZES)
+        self.assertGreaterEqual(len(results), 2 * n_cases)
+        names = {r["name"] for r in results}
+        self.assertIn("AllpassFilter[scipy][channels=8,block=16].process", names)
+        samples = bench.STREAMING_CHANNELS[-1] * bench.STREAMING_BLOCK_SIZES[-1]
+        self.assertEqual(results[-1]["samples"], samples)
+
+    def test_oversampling_suite(self):
+        results = bench.run(orders=[3], suites=["oversampling"], repeat=1, min_time=0)
+        self.assertEqual(len(results), 4 * len(bench.OVERSAMPLING_FACTORS))
+        latency = {r["name"].rsplit("_", 1)[0]: r["latency"] for r in results}
+        self.assertAlmostEqual(
+            latency["Upsampler[4].process"], oversampling.Upsampler(4).latency, 3
+        )
+        self.assertAlmostEqual(latency["resample_poly[up=4]"], 10.0)
+
+        # resample_poly filters with the reference design, delay compensated
+        x = np.random.default_rng(1).standard_normal(100)
+        h = bench._resample_poly_filter(4)
+        y = signal.upfirdn(4 * h, x, 4)[(len(h) - 1) // 2 :][:400]
+        np.testing.assert_allclose(signal.resample_poly(x, 4, 1), y, atol=1e-12)
+
+    def test_compare(self):
+        baseline = [dict(name="a", N=1, seconds=1.0), dict(name="b", N=1, seconds=1.0)]
+        results = [dict(name="a", N=1, seconds=1.1), dict(name="b", N=1, seconds=2.0)]
+        results.append(dict(name="c", N=1, seconds=1.0))  # not in baseline
+        comparison = bench.compare(results, baseline, threshold=1.25)
+        self.assertEqual(len(comparison), 2)
+        self.assertFalse(comparison[0]["regression"])
+        self.assertTrue(comparison[1]["regression"])
+        self.assertAlmostEqual(comparison[1]["ratio"], 2.0)
+
+    def test_import_suite(self):
+        results = bench.run(orders=[3, 5], suites=["import"], repeat=1, min_time=0)
+        self.assertEqual(len(results), len(bench.IMPORTS) + 1)
+        self.assertTrue(all(r["N"] == 0 for r in results))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import io
+import unittest
+
+import numpy as np
+from filterdesign import cache
+from filterdesign import emqf
+
+
+class TestDesignCache(unittest.TestCase):
+    def test_hits_and_misses(self):
+        c = cache.DesignCache(maxsize=4)
+        z, p, k = c.emqfap(N=5, stopband_attenuation=50)
+        z_, p_, k_ = c.emqfap(N=5, stopband_attenuation=50.0000000001)
+        self.assertIs(z, z_)
+        self.assertIs(p, p_)
+        self.assertDictEqual(c.info(), dict(hits=1, misses=1, size=1, maxsize=4))
+
+        c.emqfap(N=5, stopband_attenuation=50, f3db=True)
+        self.assertEqual(c.misses, 2)
+        self.assertIn((5, 50, True), c)
+
+    def test_same_result_as_emqfap(self):
+        c = cache.DesignCache()
+        for f3db in (False, True):
+            z, p, k = emqf.emqfap(N=7, stopband_attenuation=55.5, f3db=f3db)
+            z_, p_, k_ = c.emqfap(N=7, stopband_attenuation=55.5, f3db=f3db)
+            np.testing.assert_array_equal(z, z_)
+            np.testing.assert_array_equal(p, p_)
+            self.assertEqual(k, k_)
+
+    def test_lru_eviction(self):
+        c = cache.DesignCache(maxsize=2)
+        c.emqfap(N=3)
+        c.emqfap(N=4)
+        c.emqfap(N=3)  # N=4 is now least recently used
+        c.emqfap(N=5)
+        self.assertEqual(len(c), 2)
+        self.assertIn((3, 60, False), c)
+        self.assertNotIn((4, 60, False), c)
+        self.assertIn((5, 60, False), c)
+
+    def test_read_only(self):
+        c = cache.DesignCache()
+        z, p, k = c.emqfap(N=6)
+        with self.assertRaises(ValueError):
+            z[0] = 0.0
+        with self.assertRaises(ValueError):
+            p[0] = 0.0
+
+    def test_save_load(self):
+        c = cache.DesignCache()
+        designs = [(1, 40, True), (4, 60, False), (7, 55.55, True)]
+        for key in designs:
+            c.emqfap(*key)
+
+        f = io.BytesIO()
+        c.save(f)
+        f.seek(0)
+
+        c_ = cache.DesignCache()
+        c_.load(f)
+        self.assertEqual(len(c_), len(designs))
+        for key in designs:
+            z, p, k = c.emqfap(*key)
+            z_, p_, k_ = c_.emqfap(*key)
+            np.testing.assert_array_equal(z, z_)
+            np.testing.assert_array_equal(p, p_)
+            self.assertEqual(k, k_)
+            self.assertFalse(z_.flags.writeable)
+        self.assertEqual(c_.misses, 0)
+
+    def test_save_load_empty(self):
+        f = io.BytesIO()
+        cache.DesignCache().save(f)
+        f.seek(0)
+        c = cache.DesignCache()
+        c.load(f)
+        self.assertEqual(len(c), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+
+import numpy as np
+from scipy import signal
+from filterdesign import crossover
+
+
+def _allpass(sos, x):
+    return signal.sosfilt(sos, x, axis=-1) if len(sos) else x
+
+
+class TestCrossoverFilterbank(unittest.TestCase):
+    CROSSOVERS = [150, 800, 2500, 9000]
+    FS = 48000
+
+    def setUp(self):
+        self.rng = np.random.default_rng(3)
+
+    def test_bands_sum_to_allpass(self):
+        fb = crossover.CrossoverFilterbank(__class__.CROSSOVERS, fs=__class__.FS)
+        x = np.zeros(1 << 14)
+        x[0] = 1.0
+        bands = fb.process(x)
+        self.assertTupleEqual(bands.shape, (5, 1 << 14))
+
+        h = np.fft.rfft(bands.sum(axis=0))
+        np.testing.assert_allclose(np.abs(h), 1.0, atol=1e-6)
+
+    def test_matches_explicit_tree(self):
+        x = self.rng.standard_normal((2, 1000))
+        pairs = crossover.crossover_allpass_pairs(
+            __class__.CROSSOVERS, fs=__class__.FS, N=7
+        )
+        expected, rest = [], x
+        for k, (sos0, sos1) in enumerate(pairs):
+            u, v = _allpass(sos0, rest), _allpass(sos1, rest)
+            low = 0.5 * (u + v)
+            for sos0_, sos1_ in pairs[k + 1 :]:
+                low = _allpass(sos0_, low)
+            expected.append(low)
+            rest = 0.5 * (u - v)
+        expected.append(rest)
+
+        fb = crossover.CrossoverFilterbank(
+            __class__.CROSSOVERS, fs=__class__.FS, N=7, n_channels=2
+        )
+        np.testing.assert_allclose(fb.process(x), np.array(expected), atol=1e-12)
+
+    def test_block_processing(self):
+        x = self.rng.standard_normal((3, 600))
+        kwargs = dict(crossovers=[300, 3000], fs=__class__.FS, n_channels=3)
+        expected = crossover.CrossoverFilterbank(**kwargs).process(x)
+
+        fb = crossover.CrossoverFilterbank(**kwargs)
+        out = np.empty((3, 3, 100))
+        blocks = []
+        for start in range(0, 600, 100):
+            blocks.append(fb.process(x[:, start : start + 100], out=out).copy())
+        np.testing.assert_allclose(np.concatenate(blocks, axis=-1), expected)
+
+        fb.reset()
+        np.testing.assert_allclose(fb.process(x), expected)
+
+    def test_invalid_crossovers(self):
+        with self.assertRaises(ValueError):
+            crossover.CrossoverFilterbank([1000, 500], fs=__class__.FS)
+        with self.assertRaises(ValueError):
+            crossover.CrossoverFilterbank([], fs=__class__.FS)
+        with self.assertRaises(ValueError):
+            crossover.CrossoverFilterbank([1000], fs=__class__.FS, N=4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+import pickle
+import unittest
+
+import numpy as np
+from scipy import signal
+from filterdesign import design
+from filterdesign import emqf, filtering, filterutils, response
+
+
+class TestFilterDesign(unittest.TestCase):
+    def setUp(self):
+        self.zpk = emqf.emqfap(N=7, stopband_attenuation=60, f3db=True)
+
+    def test_analog(self):
+        d = design.FilterDesign(*self.zpk)
+        self.assertTrue(d.analog)
+        self.assertEqual(d.order, 7)
+        z, p, k = d
+        np.testing.assert_array_equal(p, self.zpk[1])
+        self.assertEqual(k, self.zpk[2])
+
+        b, a = signal.zpk2tf(*self.zpk)
+        np.testing.assert_allclose(d.tf[0], b.real)
+        np.testing.assert_allclose(d.tf[1], a.real)
+        self.assertIs(d.tf, d.tf)  # cached
+
+        w = np.logspace(-1, 1, 50)
+        _, h_tf = signal.freqs(*d.tf, worN=w)
+        b_ss, a_ss = signal.ss2tf(*d.ss)
+        _, h_ss = signal.freqs(b_ss[0], a_ss, worN=w)
+        np.testing.assert_allclose(h_ss, h_tf, rtol=1e-8)
+
+    def test_digital(self):
+        z, p, k = signal.bilinear_zpk(*self.zpk, fs=2.0)
+        d = design.FilterDesign(z, p, k, fs=2.0)
+        self.assertFalse(d.analog)
+        np.testing.assert_allclose(d.sos, signal.zpk2sos(z, p, k))
+        self.assertIs(d.sos, d.sos)
+        self.assertFalse(d.sos.flags.writeable)
+        self.assertFalse(d.z.flags.writeable)
+
+    def test_from_sos(self):
+        sos = emqf.emqf_sos(5, 1000, fs=48000)
+        d = design.FilterDesign.from_sos(sos, fs=48000)
+        np.testing.assert_array_equal(d.sos, sos)
+        _, h = signal.freqz_zpk(*d, worN=[500, 1000, 5000], fs=48000)
+        _, h_sos = signal.sosfreqz(sos, worN=[500, 1000, 5000], fs=48000)
+        np.testing.assert_allclose(h, h_sos, rtol=1e-9)
+
+        with self.assertRaises(ValueError):
+            design.FilterDesign.from_sos(np.ones(6))
+
+    def test_as_input(self):
+        d = design.FilterDesign(*self.zpk)
+        self.assertIs(d[1], d.p)
+        z, p, k = filterutils.cascade(d, d)
+        self.assertEqual(len(p), 14)
+        self.assertAlmostEqual(k, d.k**2)
+
+        digital = design.FilterDesign.from_sos(emqf.emqf_sos(5, 0.2), fs=2.0)
+        x = np.random.default_rng(0).standard_normal(64)
+        np.testing.assert_allclose(
+            filtering.SosFilter(digital, backend="scipy").process(x),
+            signal.sosfilt(np.array(digital.sos), x),
+        )
+        allpass = design.FilterDesign.from_sos(emqf.emqf_allpass_pair(5, 0.2)[0])
+        for backend in ("auto", "scipy"):
+            np.testing.assert_allclose(
+                filtering.AllpassFilter(allpass, backend=backend).process(x),
+                signal.sosfilt(np.array(allpass.sos), x),
+                atol=1e-12,
+            )
+        with self.assertRaises(ValueError):
+            filtering.AllpassFilter(d)
+        magnitude, _, _ = response.sos_response(digital, [0.2])
+        np.testing.assert_allclose(magnitude, np.sqrt(0.5), rtol=1e-6)
+        with self.assertRaises(ValueError):
+            response.sos_response(d, [0.2])
+
+    def test_pickle(self):
+        d = design.FilterDesign(*signal.bilinear_zpk(*self.zpk, fs=2.0), fs=2.0)
+        d.sos  # caches are not pickled
+        d_ = pickle.loads(pickle.dumps(d))
+        self.assertIsNone(d_._sos)
+        self.assertEqual(d_.fs, d.fs)
+        np.testing.assert_array_equal(d_.p, d.p)
+        np.testing.assert_allclose(d_.sos, d.sos)
+
+    def test_slots(self):
+        d = design.FilterDesign(*self.zpk)
+        with self.assertRaises(AttributeError):
+            d.foo = 1
+
+
+if __name__ == "__main__":
+    unittest.main()
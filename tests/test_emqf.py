@@ -3,6 +3,8 @@ import unittest
 # import numpy.testing as npt
 
 import numpy as np
+from scipy import signal
+from scipy import special
 from filterdesign import emqf
 
 
@@ -43,6 +45,55 @@ class TestSelectivityFactor(unittest.TestCase):
             xi = emqf.selectivity_factor(**kwargs)
             self.assertAlmostEqual(xi, verified_result, places=5)
 
+    def test_array_input(self):
+        N = [t["kwargs"]["N"] for t in __class__.TEST_SET]
+        a_s = [t["kwargs"]["stopband_attenuation"] for t in __class__.TEST_SET]
+        xi = emqf.selectivity_factor(N, a_s)
+        self.assertIsInstance(xi, np.ndarray)
+        for xi_, t in zip(xi, __class__.TEST_SET):
+            self.assertAlmostEqual(xi_, t["verified_result"], places=5)
+            self.assertAlmostEqual(xi_, emqf.selectivity_factor(**t["kwargs"]))
+
+    def test_first_order(self):
+        # for N=1 the selectivity factor equals L = 10^(As/10) - 1
+        for a_s in [10, 40, 100, 150, 200]:
+            xi = emqf.selectivity_factor(1, a_s)
+            self.assertAlmostEqual(xi / (10 ** (a_s / 10) - 1), 1.0, places=12)
+
+    def test_degree_equation(self):
+        # the nome of 1/xi is the N'th root of the nome of 1/L
+        N = np.arange(1, 65)[:, np.newaxis]
+        a_s = np.linspace(10, 200, 39)[np.newaxis, :]
+        xi = emqf.selectivity_factor(N, a_s)
+        self.assertTrue(np.all(np.isfinite(xi)))
+
+        valid = xi > 1 + 1e-6
+        N, a_s = np.broadcast_arrays(N, a_s)
+        N, a_s, xi = N[valid], a_s[valid], xi[valid]
+
+        K = lambda m: (special.ellipkm1(1 - m), special.ellipkm1(m))
+        L = 10 ** (a_s / 10) - 1
+        K_d, K1_d = K(1 / L**2)
+        K_s, K1_s = K(1 / xi**2)
+        ratio = (K1_d / K_d) / (N * K1_s / K_s)
+        np.testing.assert_allclose(ratio, 1.0, rtol=1e-9)
+
+    def test_tolerance(self):
+        xi = emqf.selectivity_factor(5, 50)
+        self.assertAlmostEqual(emqf.selectivity_factor(5, 50, tol=1e-6), xi, places=5)
+        for tol in (0, 1, -1e-6):
+            with self.assertRaises(ValueError):
+                emqf.selectivity_factor(5, 50, tol=tol)
+
+    def test_non_integer_order(self):
+        with self.assertRaises(ValueError):
+            emqf.selectivity_factor(4.5, 60)
+        with self.assertRaises(ValueError):
+            emqf.selectivity_factor([4.5], 60)
+        self.assertEqual(
+            emqf.selectivity_factor(5.0, 60), emqf.selectivity_factor(5, 60)
+        )
+
 
 class TestAnalogLowpass(unittest.TestCase):
     TEST_SET = [
@@ -195,6 +246,211 @@ class TestAnalogLowpass(unittest.TestCase):
             self._almost_equal_complex_unsorted_lists(p, p_, places=8)
             self.assertAlmostEqual(k, k_, places=6)
 
+    def test_zeros_poles_ordering(self):
+        for t in __class__.TEST_SET:
+            kwargs = t["kwargs"]
+            verified_result = t["verified_result"]
+            z_, p_ = emqf.emqf_analog_zeros_poles(**kwargs)
+
+            self._almost_equal_complex_unsorted_lists(
+                verified_result["zeros"], z_, places=8
+            )
+            self._almost_equal_complex_unsorted_lists(
+                verified_result["poles"], p_, places=8
+            )
+
+            # conjugate pairs are adjacent, the real pole comes last
+            n_pairs = kwargs["N"] // 2
+            np.testing.assert_array_equal(z_[0::2], z_[1::2].conjugate())
+            np.testing.assert_array_equal(
+                p_[0 : 2 * n_pairs : 2], p_[1 : 2 * n_pairs : 2].conjugate()
+            )
+            np.testing.assert_array_less(np.abs(z_[0:-2:2]), np.abs(z_[2::2]))
+            if kwargs["N"] % 2 == 1:
+                self.assertEqual(p_[-1].imag, 0.0)
+
+    def test_invalid_order(self):
+        with self.assertRaises(ValueError):
+            emqf.emqf_analog_zeros_poles(N=0, xi=1.5)
+        with self.assertRaises(ValueError):
+            emqf.emqf_analog_prototype_from_selectivity_factor(N=0, xi=1.5)
+
+
+class TestBatch(unittest.TestCase):
+    ORDERS = [1, 2, 3, 4, 7, 8, 15, 24]
+    ATTENUATIONS = [20, 35.5, 50, 60]
+
+    def test_matches_scalar_design(self):
+        N, a_s = np.meshgrid(__class__.ORDERS, __class__.ATTENUATIONS)
+        for f3db in (False, True):
+            z, p, k = emqf.emqfap_batch(N, a_s, f3db=f3db)
+            self.assertTupleEqual(k.shape, N.shape)
+
+            for idx in np.ndindex(N.shape):
+                n = N[idx]
+                z_, p_, k_ = emqf.emqfap(n, a_s[idx], f3db=f3db)
+                np.testing.assert_allclose(z[idx][: len(z_)], z_, rtol=1e-12)
+                np.testing.assert_allclose(p[idx][:n], p_, rtol=1e-12)
+                self.assertAlmostEqual(k[idx] / k_, 1.0, places=10)
+
+    def test_shapes_and_padding(self):
+        z, p, k = emqf.emqfap_batch([3, 6], [[40], [50], [60]])
+        self.assertTupleEqual(z.shape, (3, 2, 6))
+        self.assertTupleEqual(p.shape, (3, 2, 6))
+        self.assertTupleEqual(k.shape, (3, 2))
+        self.assertTrue(np.all(np.isnan(z[:, 0, 2:])))
+        self.assertTrue(np.all(np.isnan(p[:, 0, 3:])))
+        self.assertFalse(np.any(np.isnan(z[:, 1])))
+        self.assertFalse(np.any(np.isnan(p[:, 1])))
+
+    def test_non_integer_order(self):
+        with self.assertRaises(ValueError):
+            emqf.emqfap_batch([3, 4.5], 60)
+
+    def test_non_positive_order(self):
+        for N in ([3, 0], [-1], 0):
+            with self.assertRaises(ValueError):
+                emqf.emqfap_batch(N, 60)
+
+
+class TestDigitalSos(unittest.TestCase):
+    TEST_SET = [
+        dict(N=3, cutoff=1000, fs=48000, stopband_attenuation=60),
+        dict(N=4, cutoff=1000, fs=48000, stopband_attenuation=60),
+        dict(N=7, cutoff=100, fs=44100, stopband_attenuation=50),
+        dict(N=8, cutoff=0.3, fs=1.0, stopband_attenuation=45),
+        dict(N=13, cutoff=15000, fs=48000, stopband_attenuation=65),
+    ]
+
+    def _scipy_chain(self, N, cutoff, fs, stopband_attenuation, btype):
+        z, p, k = emqf.emqfap(N, stopband_attenuation, f3db=True)
+        wc = 2 * fs * np.tan(np.pi * cutoff / fs)
+        if btype == "lowpass":
+            z, p, k = signal.lp2lp_zpk(z, p, k, wc)
+        else:
+            z, p, k = signal.lp2hp_zpk(z, p, k, wc)
+        return signal.zpk2sos(*signal.bilinear_zpk(z, p, k, fs))
+
+    def test_matches_scipy_chain(self):
+        for kwargs in __class__.TEST_SET:
+            for btype in ("lowpass", "highpass"):
+                sos = emqf.emqf_sos(btype=btype, **kwargs)
+                sos_ = self._scipy_chain(btype=btype, **kwargs)
+                self.assertTupleEqual(sos.shape, ((kwargs["N"] + 1) // 2, 6))
+
+                fs = kwargs["fs"]
+                w, h = signal.sosfreqz(sos, 2048, fs=fs)
+                w, h_ = signal.sosfreqz(sos_, 2048, fs=fs)
+                np.testing.assert_allclose(h, h_, rtol=1e-6, atol=1e-9)
+
+                # -3 dB at the cutoff frequency
+                w, h = signal.sosfreqz(sos, [kwargs["cutoff"]], fs=fs)
+                self.assertAlmostEqual(abs(h[0]), 1 / np.sqrt(2), places=8)
+
+    def test_out_buffer(self):
+        out = np.zeros((4, 6))
+        sos = emqf.emqf_sos(N=7, cutoff=0.2, out=out)
+        self.assertIs(sos, out)
+        np.testing.assert_array_equal(out, emqf.emqf_sos(N=7, cutoff=0.2))
+
+        with self.assertRaises(ValueError):
+            emqf.emqf_sos(N=7, cutoff=0.2, out=np.zeros((3, 6)))
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            emqf.emqf_sos(N=3, cutoff=1.5)
+        with self.assertRaises(ValueError):
+            emqf.emqf_sos(N=3, cutoff=0.5, btype="bandpass")
+        with self.assertRaises(ValueError):
+            emqf.emqf_sos(N=0, cutoff=0.5)
+
+
+class TestAllpassPair(unittest.TestCase):
+    TEST_SET = [
+        dict(N=1, cutoff=1000, fs=48000, stopband_attenuation=60),
+        dict(N=3, cutoff=100, fs=48000, stopband_attenuation=40),
+        dict(N=7, cutoff=1000, fs=44100, stopband_attenuation=60),
+        dict(N=9, cutoff=0.4, fs=1.0, stopband_attenuation=50),
+    ]
+
+    def _response(self, sos, w):
+        if len(sos) == 0:
+            return np.ones(len(w), dtype=complex)
+        return signal.sosfreqz(sos, w)[1]
+
+    def test_matches_digital_design(self):
+        w = np.linspace(0, np.pi, 512)
+        for kwargs in __class__.TEST_SET:
+            sos0, sos1 = emqf.emqf_allpass_pair(**kwargs)
+            self.assertEqual(len(sos0) + len(sos1), (kwargs["N"] + 1) // 2)
+            h0 = self._response(sos0, w)
+            h1 = self._response(sos1, w)
+            np.testing.assert_allclose(np.abs(h0), 1.0, atol=1e-10)
+            np.testing.assert_allclose(np.abs(h1), 1.0, atol=1e-10)
+
+            w_, h_low = signal.sosfreqz(emqf.emqf_sos(**kwargs), w)
+            w_, h_high = signal.sosfreqz(emqf.emqf_sos(btype="highpass", **kwargs), w)
+            np.testing.assert_allclose(0.5 * (h0 + h1), h_low, atol=1e-9)
+            np.testing.assert_allclose(0.5 * (h0 - h1), h_high, atol=1e-9)
+
+    def test_even_order(self):
+        with self.assertRaises(ValueError):
+            emqf.emqf_allpass_pair(N=4, cutoff=0.5)
+
+
+class TestOrderSelection(unittest.TestCase):
+    def _brute_force_order(self, selectivity, stopband_attenuation):
+        N = 1
+        while emqf.selectivity_factor(N, stopband_attenuation) > selectivity:
+            N += 1
+        return N
+
+    def test_matches_brute_force(self):
+        for selectivity in [1.05, 1.2, 1.5, 2.0, 3.0, 5.0]:
+            for gstop in [20, 35, 50, 65]:
+                N, xi, a_s = emqf.emqford(1.0, selectivity, 3.0, gstop, analog=True)
+                self.assertIsInstance(N, int)
+                self.assertEqual(N, self._brute_force_order(selectivity, gstop))
+                self.assertAlmostEqual(a_s, gstop, places=10)
+                self.assertLessEqual(xi, selectivity)
+                self.assertAlmostEqual(xi, emqf.selectivity_factor(N, gstop))
+
+    def test_passband_loss(self):
+        # 0.01 dB passband loss requires about 26.4 dB stopband attenuation
+        N, xi, a_s = emqf.emqford(1.0, 1.5, 0.01, 20, analog=True)
+        L = 10 ** (a_s / 10) - 1
+        self.assertAlmostEqual(10 * np.log10(1 + 1 / L), 0.01)
+        self.assertEqual(N, self._brute_force_order(1.5, a_s))
+
+    def test_digital_highpass(self):
+        fs = 48000
+        N, xi, a_s = emqf.emqford(2000, 1500, 1.0, 60, fs=fs)
+        z, p, k = emqf.emqfap(N, a_s)
+        selectivity = np.tan(np.pi * 2000 / fs) / np.tan(np.pi * 1500 / fs)
+        self.assertLessEqual(xi, selectivity)
+        self.assertGreater(emqf.selectivity_factor(N - 1, a_s), selectivity)
+
+    def test_batch(self):
+        wp = np.array([1000, 2000, 5000])
+        ws = np.array([1200, 2600, 4000])
+        gstop = np.array([[40], [60]])
+        N, xi, a_s = emqf.emqford_batch(wp, ws, 0.5, gstop, fs=48000)
+        self.assertTupleEqual(N.shape, (2, 3))
+        self.assertTupleEqual(a_s.shape, (2, 3))
+        for idx in np.ndindex(N.shape):
+            N_, xi_, a_s_ = emqf.emqford(
+                wp[idx[1]], ws[idx[1]], 0.5, gstop[idx[0], 0], fs=48000
+            )
+            self.assertEqual(N[idx], N_)
+            self.assertAlmostEqual(xi[idx], xi_)
+            self.assertAlmostEqual(a_s[idx], a_s_)
+
+    def test_invalid_specs(self):
+        with self.assertRaises(ValueError):
+            emqf.emqford(1.0, 1.0, 1.0, 40, analog=True)
+        with self.assertRaises(ValueError):
+            emqf.emqford(0.5, 1.2, 1.0, 40)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,137 @@
+import unittest
+
+import numpy as np
+from scipy import signal
+from filterdesign import emqf
+from filterdesign import export
+
+
+class TestQuantize(unittest.TestCase):
+    def test_fixed_point(self):
+        c = np.array([1.9, -0.5, 0.123456789])
+        for fmt, dtype, frac_bits in (("q15", np.int16, 14), ("q31", np.int32, 30)):
+            values, bits = export.quantize(c, fmt)
+            self.assertEqual(values.dtype, dtype)
+            self.assertEqual(bits, frac_bits)
+            error = np.abs(export.dequantize(values, bits) - c)
+            self.assertLessEqual(np.max(error), 0.5 / 2**frac_bits)
+
+        values, bits = export.quantize([0.25, -0.5], "q15")
+        self.assertEqual(bits, 15)
+        self.assertListEqual(list(values), [8192, -16384])
+
+    def test_float32(self):
+        values, bits = export.quantize([1.0, 0.1], "float32")
+        self.assertEqual(values.dtype, np.float32)
+        self.assertIsNone(bits)
+        with self.assertRaises(ValueError):
+            export.quantize([1.0], "q7")
+
+
+class TestScaleSections(unittest.TestCase):
+    def test_response_and_peaks(self):
+        sos = emqf.emqf_sos(8, 1000, fs=48000)
+        scaled = export.scale_sections(sos)
+        f = np.linspace(0, 24000, 1000)
+        _, h = signal.sosfreqz(sos, worN=f, fs=48000)
+        _, h_scaled = signal.sosfreqz(scaled, worN=f, fs=48000)
+        np.testing.assert_allclose(h_scaled, h, atol=1e-12)
+        for i in range(1, len(sos)):
+            _, h_partial = signal.sosfreqz(scaled[:i], worN=f, fs=48000)
+            self.assertLess(np.max(np.abs(h_partial)), 1.0 + 1e-3)
+
+
+class TestPairSections(unittest.TestCase):
+    def test_pairing_and_order(self):
+        sos = emqf.emqf_sos(7, 1000, fs=48000)
+        shuffled = sos[[2, 0, 3, 1]].copy()
+        shuffled[:, :3] = sos[[1, 3, 0, 2], :3]  # mismatched zeros
+        paired = export.pair_sections(shuffled)
+        f = np.linspace(0, 24000, 1000)
+        _, h = signal.sosfreqz(sos, worN=f, fs=48000)
+        _, h_paired = signal.sosfreqz(paired, worN=f, fs=48000)
+        np.testing.assert_allclose(h_paired, h, atol=1e-12)
+        # every section gets back its own zeros, the most resonant comes last
+        normalized = paired / paired[:, [0, 0, 0, 3, 3, 3]]
+        for section in normalized:
+            i = np.flatnonzero(np.isclose(sos[:, 4], section[4]))[0]
+            np.testing.assert_allclose(section[:3], sos[i, :3] / sos[i, 0])
+        peaks = [np.max(np.abs(signal.sosfreqz(s)[1])) for s in normalized]
+        self.assertListEqual(peaks, sorted(peaks))
+
+
+class TestExportEmqf(unittest.TestCase):
+    def test_float32_and_q31(self):
+        for fmt, tol in (("float32", 1e-3), ("q31", 1e-5)):
+            for structure in ("sos", "allpass"):
+                e = export.export_emqf(7, 1000, 48000, fmt=fmt, structure=structure)
+                self.assertEqual(e["structure"], structure)
+                self.assertLess(e["max_error"], tol)
+                self.assertLess(e["max_pole_radius"], 1.0)
+
+    def test_highpass(self):
+        e = export.export_emqf(7, 1000, 48000, btype="highpass", fmt="q31")
+        self.assertLess(e["max_error"], 1e-5)
+        if e["structure"] == "allpass":
+            self.assertEqual(e["sign"], -1)
+
+    def test_q15(self):
+        for structure in ("sos", "allpass"):
+            e = export.export_emqf(7, 1000, 48000, fmt="q15", structure=structure)
+            self.assertEqual(e["structure"], structure)
+            self.assertLess(e["max_error"], 1e-2)
+            self.assertLess(e["max_passband_error_db"], 0.1)
+        e = export.export_emqf(8, 1000, 48000, fmt="q15")
+        self.assertLess(e["max_error"], 5e-3)
+        self.assertEqual(e["coefficients"].dtype, np.int16)
+
+    def test_q15_stays_stable(self):
+        for N, cutoff in ((9, 100), (16, 200)):
+            with self.assertWarns(RuntimeWarning):
+                e = export.export_emqf(N, cutoff, 48000, fmt="q15", structure="sos")
+            self.assertLess(e["max_pole_radius"], 1.0)
+            self.assertLess(e["max_error"], 1.0)
+            values = e["coefficients"]
+            self.assertEqual(values.dtype, np.int16)
+
+    def test_tolerance(self):
+        with self.assertWarns(RuntimeWarning):
+            e = export.export_emqf(15, 50, 48000, fmt="q15")
+        self.assertLess(e["max_pole_radius"], 1.0)
+        e = export.export_emqf(15, 50, 48000, fmt="q15", tolerance=np.inf)
+        self.assertGreater(e["max_error"], 1e-2)
+
+    def test_auto(self):
+        e = export.export_emqf(9, 1000, 48000, fmt="q15")
+        errors = [
+            export.export_emqf(9, 1000, 48000, fmt="q15", structure=s)["max_error"]
+            for s in ("sos", "allpass")
+        ]
+        self.assertEqual(e["max_error"], min(errors))
+        self.assertEqual(export.export_emqf(8, 1000, 48000)["structure"], "sos")
+
+    def test_allpass_sections(self):
+        e = export.export_emqf(9, 1000, 48000, fmt="q15", structure="allpass")
+        self.assertLess(e["max_pole_radius"], 1.0)
+        sos0, sos1 = (export.dequantize(v, e["frac_bits"]) for v in e["coefficients"])
+        for sos in (sos0, sos1):  # quantized sections are still all-pass
+            _, h = signal.sosfreqz(sos, worN=64)
+            np.testing.assert_allclose(np.abs(h), 1.0, atol=1e-12)
+
+    def test_first_order(self):
+        for structure in ("auto", "sos", "allpass"):
+            e = export.export_emqf(1, 1000, 48000, fmt="q15", structure=structure)
+            self.assertLess(e["max_error"], 1e-3)
+        self.assertEqual(len(e["coefficients"][0]), 0)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            export.export_emqf(8, 1000, 48000, structure="allpass")
+        with self.assertRaises(ValueError):
+            export.export_emqf(7, 1000, 48000, structure="lattice")
+        with self.assertRaises(ValueError):
+            export.export_emqf(7, 1000, 48000, btype="bandpass")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,247 @@
+import unittest
+
+import numpy as np
+from scipy import signal
+from filterdesign import emqf
+from filterdesign import filtering
+from filterdesign import hilbert
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+class TestSosFilter(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(7)
+        self.sos = emqf.emqf_sos(N=9, cutoff=1000, fs=48000)
+
+    def test_matches_sosfilt(self):
+        x = self.rng.standard_normal((4, 500))
+        y = filtering.SosFilter(self.sos, n_channels=4).process(x)
+        np.testing.assert_allclose(y, signal.sosfilt(self.sos, x, axis=-1))
+
+    def test_block_sizes(self):
+        x = self.rng.standard_normal((2, 300))
+        y_ref = signal.sosfilt(self.sos, x, axis=-1)
+
+        filt = filtering.SosFilter(self.sos, n_channels=2)
+        blocks, start = [], 0
+        for n in [1, 1, 0, 5, 64, 1, 128, 100]:
+            blocks.append(filt.process(x[:, start : start + n]))
+            start += n
+        np.testing.assert_allclose(np.concatenate(blocks, axis=1), y_ref, atol=1e-12)
+
+    def test_single_channel(self):
+        x = self.rng.standard_normal(200)
+        y = filtering.SosFilter(self.sos).process(x)
+        self.assertTupleEqual(y.shape, (200,))
+        np.testing.assert_allclose(y, signal.sosfilt(self.sos, x))
+
+    def test_out_buffer(self):
+        x = self.rng.standard_normal((3, 64))
+        y_ref = signal.sosfilt(self.sos, x, axis=-1)
+
+        filt = filtering.SosFilter(self.sos, n_channels=3)
+        state = filt.state
+        out = np.empty_like(x)
+        self.assertIs(filt.process(x, out=out), out)
+        np.testing.assert_allclose(out, y_ref)
+
+        # in-place, the state array is reused
+        filt.reset()
+        filt.process(x, out=x)
+        np.testing.assert_allclose(x, y_ref)
+        self.assertIs(filt.state, state)
+
+    def test_backends(self):
+        x = self.rng.standard_normal((3, 300))
+        y_ref = signal.sosfilt(self.sos, x, axis=-1)
+        backends = ["scipy"] + ([] if numba is None else ["numba"])
+        for backend in backends:
+            filt = filtering.SosFilter(self.sos, n_channels=3, backend=backend)
+            self.assertEqual(filt.backend, backend)
+            out = np.empty_like(x)
+            y = [filt.process(x[:, :100], out=out[:, :100])]
+            y.append(filt.process(x[:, 100:]))
+            np.testing.assert_allclose(np.concatenate(y, axis=1), y_ref, atol=1e-12)
+        # a0 != 1 is normalized
+        scaled = self.sos * 2.0
+        y = filtering.SosFilter(scaled, n_channels=3).process(x)
+        np.testing.assert_allclose(y, y_ref, atol=1e-12)
+        with self.assertRaises(ValueError):
+            filtering.SosFilter(self.sos, backend="cuda")
+
+    def test_float32(self):
+        x = self.rng.standard_normal((2, 256)).astype(np.float32)
+        filt = filtering.SosFilter(self.sos, n_channels=2, dtype=np.float32)
+        y = filt.process(x)
+        self.assertEqual(y.dtype, np.float32)
+        self.assertEqual(filt.state.dtype, np.float32)
+        np.testing.assert_allclose(
+            y, signal.sosfilt(self.sos, x.astype(float), axis=-1), atol=1e-4
+        )
+
+    def test_reset(self):
+        x = self.rng.standard_normal(64)
+        filt = filtering.SosFilter(self.sos)
+        y = filt.process(x)
+        filt.reset()
+        np.testing.assert_array_equal(filt.process(x), y)
+
+    def test_invalid_input(self):
+        with self.assertRaises(TypeError):
+            filtering.SosFilter(np.ones((2, 5)))
+        filt = filtering.SosFilter(self.sos, n_channels=2)
+        with self.assertRaises(ValueError):
+            filt.process(np.zeros((3, 16)))
+        with self.assertRaises(ValueError):
+            filt.process(np.zeros((2, 16)), out=np.zeros((2, 8)))
+        with self.assertRaises(ValueError):
+            filt.process(np.zeros((2, 16)), out=np.zeros((2, 16), dtype=np.float32))
+
+
+class TestAllpassFilter(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(11)
+        sos0, sos1 = emqf.emqf_allpass_pair(N=9, cutoff=1000, fs=48000)
+        # includes negated sections and a pure delay
+        self.sos = np.concatenate([sos0, sos1] + list(hilbert.hilbert_sos(7)))
+
+    def check_blocks(self, backend, dtype, atol):
+        x = self.rng.standard_normal((3, 500))
+        y_ref = signal.sosfilt(self.sos, x, axis=-1)
+        filt = filtering.AllpassFilter(
+            self.sos, n_channels=3, dtype=dtype, backend=backend
+        )
+        y = np.concatenate(
+            [
+                filt.process(x[:, :100]),
+                filt.process(x[:, 100:101]),
+                filt.process(x[:, 101:]),
+            ],
+            axis=1,
+        )
+        self.assertEqual(y.dtype, dtype)
+        np.testing.assert_allclose(y, y_ref, atol=atol)
+
+        filt.reset()
+        out = x.astype(dtype)
+        self.assertIs(filt.process(out, out=out), out)
+        np.testing.assert_allclose(out, y_ref, atol=atol)
+
+    def test_scipy_backend(self):
+        self.check_blocks("scipy", np.float64, atol=1e-12)
+        self.check_blocks("scipy", np.float32, atol=1e-4)
+
+    @unittest.skipIf(numba is None, "numba is not installed")
+    def test_numba_backend(self):
+        self.check_blocks("numba", np.float64, atol=1e-12)
+        self.check_blocks("numba", np.float32, atol=1e-4)
+        filt = filtering.AllpassFilter(self.sos[:2], backend="auto")
+        self.assertEqual(filt.backend, "numba")
+        y = filt.process(np.ones(4))
+        self.assertTupleEqual(y.shape, (4,))
+
+    def test_kernel(self):
+        # the uncompiled kernel, run by the numba backend
+        x = self.rng.standard_normal((2, 40))
+        y = np.empty_like(x)
+        c1, c2, second_order, sign = filtering._allpass_sections(self.sos)
+        state = np.zeros((2, len(self.sos), 4))
+        filtering._allpass_kernel(c1, c2, second_order, x, y, state)
+        np.testing.assert_allclose(
+            sign * y, signal.sosfilt(self.sos, x, axis=-1), atol=1e-12
+        )
+
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            filtering.AllpassFilter(emqf.emqf_sos(N=5, cutoff=0.1))
+        with self.assertRaises(ValueError):
+            filtering.AllpassFilter(self.sos, backend="cuda")
+        with self.assertRaises(TypeError):
+            filtering.AllpassFilter(np.ones((2, 5)))
+
+
+class TestLatticeAllpassFilter(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(12)
+        sos0, sos1 = emqf.emqf_allpass_pair(N=9, cutoff=1000, fs=48000)
+        self.sos = np.concatenate([sos0, sos1] + list(hilbert.hilbert_sos(7)))
+
+    def check_static(self, backend):
+        x = self.rng.standard_normal((3, 500))
+        y_ref = signal.sosfilt(self.sos, x, axis=-1)
+        filt = filtering.LatticeAllpassFilter(self.sos, n_channels=3, backend=backend)
+        # constant per-block and per-sample coefficients
+        y = np.concatenate(
+            [
+                filt.process(x[:, :100]),
+                filt.process(x[:, 100:101], self.sos),
+                filt.process(
+                    x[:, 101:], np.broadcast_to(self.sos, (399,) + self.sos.shape)
+                ),
+            ],
+            axis=1,
+        )
+        np.testing.assert_allclose(y, y_ref, atol=1e-12)
+
+    def check_modulation(self, backend):
+        cutoffs = np.geomspace(20.0, 20000.0, 8)
+        pairs = [emqf.emqf_allpass_pair(N=9, cutoff=f, fs=48000) for f in cutoffs]
+        trajectory = np.stack([np.concatenate(pair) for pair in pairs])
+        filt = filtering.LatticeAllpassFilter(
+            trajectory[0], n_channels=2, backend=backend
+        )
+
+        # jumps between extreme coefficients every sample
+        x = self.rng.standard_normal((2, 400))
+        index = self.rng.integers(0, len(cutoffs), 400)
+        y = filt.process(x, trajectory[index])
+        # the lattice is lossless, the output energy never exceeds the input
+        excess = np.cumsum(y**2, axis=1) - np.cumsum(x**2, axis=1)
+        self.assertLess(np.max(excess), 1e-9)
+
+        # a ramp ends at the new coefficients
+        filt.process(x, trajectory[3])
+        expected = filtering.LatticeAllpassFilter(trajectory[3]).reflection
+        np.testing.assert_allclose(filt.reflection, expected)
+        return y
+
+    def test_numpy_backend(self):
+        self.check_static("numpy")
+        self.check_modulation("numpy")
+
+    @unittest.skipIf(numba is None, "numba is not installed")
+    def test_numba_backend(self):
+        self.check_static("numba")
+        self.rng = np.random.default_rng(12)
+        y = self.check_modulation("numba")
+        self.rng = np.random.default_rng(12)
+        np.testing.assert_allclose(y, self.check_modulation("numpy"), atol=1e-12)
+
+    def test_invalid_input(self):
+        filt = filtering.LatticeAllpassFilter(self.sos[:4])
+        with self.assertRaises(ValueError):
+            filt.process(np.zeros(8), self.sos[:3])
+        with self.assertRaises(ValueError):
+            filt.process(np.zeros(8), self.sos[[2, 1, 0, 3]])  # first order
+        with self.assertRaises(ValueError):
+            filt.process(np.zeros(8), np.broadcast_to(self.sos[:4], (7, 4, 6)))
+        # an empty block cannot take new sections
+        with self.assertRaises(ValueError):
+            filt.process(np.zeros(0), self.sos[:4])
+        with self.assertRaises(ValueError):
+            filt.process(np.zeros(0), self.sos[np.newaxis, :4])
+        self.assertEqual(
+            filt.process(np.zeros(0), self.sos[np.newaxis, :4][:0]).shape, (0,)
+        )
+        with self.assertRaises(ValueError):
+            filtering.LatticeAllpassFilter(emqf.emqf_sos(N=5, cutoff=0.1))
+        with self.assertRaises(ValueError):
+            filtering.LatticeAllpassFilter(self.sos, backend="scipy")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,8 @@ import unittest
 import helpers
 
 import numpy as np
+from scipy import signal
+from filterdesign import emqf
 from filterdesign import filterutils
 
 
@@ -108,6 +110,13 @@ class Test_Filterutils_Cascade_Sos(unittest.TestCase):
             self.assertEqual(test_data["expected_result"], result)
 
 
+def _build(*sections):
+    builder = filterutils.CascadeBuilder(capacity=1)
+    for section in sections:
+        builder.append(section)
+    return builder.result()
+
+
 class Test_Filterutils_Cascade_Main(unittest.TestCase):
     def cascade_zpk(self, cascade_func):
         zpk_a = [np.array([1 + 1j, 2 + 2j]), np.array([11 + 11j, 22 + 22j]), 1.0]
@@ -124,7 +133,7 @@ class Test_Filterutils_Cascade_Main(unittest.TestCase):
         self.assertAlmostEqual(zpk_expected[2], zpk_actual[2])
 
     def test_cascade_zpk(self):
-        self.cascade_zpk(cascade_func=filterutils._cascade_zpk_pair)
+        self.cascade_zpk(cascade_func=_build)
 
     def test_cascade_zpk_public(self):
         self.cascade_zpk(cascade_func=filterutils.cascade)
@@ -139,11 +148,94 @@ class Test_Filterutils_Cascade_Main(unittest.TestCase):
         helpers.list_1d_almost_equal(self, sos_expected.flatten(), sos.flatten())
 
     def test_cascade_sos(self):
-        self.cascade_sos(cascade_func=filterutils._cascade_sos_pair)
+        self.cascade_sos(cascade_func=_build)
 
     def test_cascade_sos_public(self):
         self.cascade_sos(cascade_func=filterutils.cascade)
 
+    def test_cascade_many(self):
+        sections = [np.full((1, 6), float(i)) for i in range(200)]
+        sos = filterutils.cascade(*sections)
+        self.assertEqual(sos.shape, (200, 6))
+        helpers.list_1d_almost_equal(self, sos[:, 0], np.arange(200.0))
+
+        zpk = [(np.array([i]), np.array([-i, -i]), 2) for i in range(20)]
+        z, p, k = filterutils.cascade(*zpk)
+        self.assertEqual(len(z), 20)
+        self.assertEqual(len(p), 40)
+        self.assertEqual(k, 2**20)
+
+
+class Test_Filterutils_CascadeBuilder(unittest.TestCase):
+    def test_sos(self):
+        sections = [np.full((i % 3 + 1, 6), float(i)) for i in range(50)]
+        builder = filterutils.CascadeBuilder(capacity=2)
+        for sos in sections:
+            builder.append(sos)
+        self.assertEqual(len(builder), 50)
+        np.testing.assert_array_equal(builder.result(), filterutils.cascade(*sections))
+
+    def test_zpk(self):
+        zpk_a = (np.array([1 + 1j, 2 + 2j]), np.array([11 + 11j, 22 + 22j]), 1.0)
+        zpk_b = (np.array([3 + 3j]), np.array([33 + 33j, 44 + 44j]), 0.5)
+        z, p, k = (
+            filterutils.CascadeBuilder(capacity=1).append(zpk_a).append(zpk_b).result()
+        )
+        z_, p_, k_ = filterutils.cascade(zpk_a, zpk_b)
+        np.testing.assert_array_equal(z, z_)
+        np.testing.assert_array_equal(p, p_)
+        self.assertEqual(k, k_)
+
+    def test_result_is_a_copy(self):
+        builder = filterutils.CascadeBuilder().append(np.ones((1, 6)))
+        sos = builder.result()
+        builder.append(np.zeros((1, 6)))
+        self.assertEqual(sos.shape, (1, 6))
+
+    def test_invalid(self):
+        builder = filterutils.CascadeBuilder()
+        with self.assertRaises(ValueError):
+            builder.result()
+        builder.append(np.ones((1, 6)))
+        with self.assertRaises(TypeError):
+            builder.append((np.array([1.0]), np.array([2.0]), 1.0))
+        with self.assertRaises(TypeError):
+            builder.append(np.ones(6))
+        builder.clear()
+        self.assertEqual(len(builder), 0)
+        builder.append((np.array([1.0]), np.array([2.0]), 1.0))
+
+
+class Test_Filterutils_Analog_Response(unittest.TestCase):
+    def test_single_pole(self):
+        # H(s) = 2 / (s + 1)
+        zpk = (np.array([]), np.array([-1.0]), 2.0)
+        w = np.array([0.0, 1.0, 10.0])
+        h = filterutils.analog_zpk_response(zpk, w)
+        helpers.list_1d_almost_equal(self, h, 2.0 / (1j * w + 1.0))
+
+    def test_matches_freqs_zpk(self):
+        zpk = emqf.emqfap(N=9, stopband_attenuation=60, f3db=True)
+        w = np.logspace(-2, 2, 500)
+        h = filterutils.analog_zpk_response(zpk, w)
+        w_, h_ = signal.freqs_zpk(*zpk, worN=w)
+        np.testing.assert_allclose(h, h_, rtol=1e-10, atol=1e-14)
+
+    def test_high_order(self):
+        for N in (63, 64):
+            zpk = emqf.emqfap(N=N, stopband_attenuation=60, f3db=True)
+            h = filterutils.analog_zpk_response(zpk, [1.0, 1e5, 1e6])
+            self.assertTrue(np.all(np.isfinite(h)))
+            self.assertAlmostEqual(np.abs(h[0]), np.sqrt(0.5))
+            # far in the stopband, the gain is at most the attenuation
+            np.testing.assert_array_less(np.abs(h[1:]), 10 ** (-60 / 20) * 1.001)
+
+    def test_shape(self):
+        zpk = emqf.emqfap(N=4)
+        w = np.ones((3, 2))
+        self.assertTupleEqual(filterutils.analog_zpk_response(zpk, w).shape, (3, 2))
+        self.assertTupleEqual(filterutils.analog_zpk_response(zpk, 1.0).shape, ())
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+
+import numpy as np
+from scipy import signal
+from filterdesign import emqf
+from filterdesign import filtering
+from filterdesign import halfband
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+def _allpass_response(a, z):
+    h = np.ones_like(z)
+    for a_i in a:
+        h *= (a_i + z**-1) / (1 + a_i * z**-1)
+    return h
+
+
+class TestHalfbandDesign(unittest.TestCase):
+    TEST_SET = [
+        dict(N=3, stopband_attenuation=40),
+        dict(N=5, stopband_attenuation=60),
+        dict(N=7, stopband_attenuation=55.55),
+        dict(N=11, stopband_attenuation=70),
+    ]
+
+    def test_matches_digital_design(self):
+        w = np.linspace(0.0, np.pi, 512)
+        z = np.exp(1j * w)
+        for kwargs in __class__.TEST_SET:
+            a0, a1 = halfband.halfband_allpass_coefficients(**kwargs)
+            self.assertEqual(len(a0) + len(a1), kwargs["N"] // 2)
+
+            h = 0.5 * (_allpass_response(a0, z**2) + _allpass_response(a1, z**2) / z)
+            sos = emqf.emqf_sos(cutoff=0.25, fs=1.0, **kwargs)
+            w_, h_ = signal.sosfreqz(sos, w)
+            np.testing.assert_allclose(h, h_, atol=1e-10)
+
+    def test_even_order(self):
+        with self.assertRaises(ValueError):
+            halfband.halfband_allpass_coefficients(N=6)
+
+
+class TestHalfbandDecimator(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(1)
+        self.a0, self.a1 = halfband.halfband_allpass_coefficients(N=7)
+        self.sos = emqf.emqf_sos(N=7, cutoff=0.25, fs=1.0)
+
+    def test_matches_filter_then_downsample(self):
+        x = self.rng.standard_normal(1000)
+        dec = halfband.HalfbandDecimator(self.a0, self.a1)
+        y = dec.process(x)
+        np.testing.assert_allclose(y, signal.sosfilt(self.sos, x)[0::2], atol=1e-12)
+
+    def test_highpass_band(self):
+        x = self.rng.standard_normal(1000)
+        sos_hp = self.sos * np.array([1, -1, 1, 1, -1, 1])  # H(-z)
+        dec = halfband.HalfbandDecimator(self.a0, self.a1)
+        low, high = dec.split(x)
+        np.testing.assert_allclose(low, signal.sosfilt(self.sos, x)[0::2], atol=1e-12)
+        np.testing.assert_allclose(high, signal.sosfilt(sos_hp, x)[0::2], atol=1e-12)
+
+    def test_block_processing(self):
+        x = self.rng.standard_normal((3, 999))
+        y_ref = halfband.HalfbandDecimator(self.a0, self.a1, n_channels=3).process(x)
+
+        dec = halfband.HalfbandDecimator(self.a0, self.a1, n_channels=3)
+        blocks, start = [], 0
+        for n in [1, 1, 2, 7, 64, 100, 3, 821]:
+            blocks.append(dec.process(x[:, start : start + n]))
+            start += n
+        y = np.concatenate(blocks, axis=1)
+        self.assertTupleEqual(y.shape, (3, 499))
+        np.testing.assert_allclose(y, y_ref, atol=1e-12)
+
+    def test_allpass_kernel(self):
+        x = self.rng.standard_normal((2, 301))
+        y_ref = signal.sosfilt(self.sos, x, axis=-1)[:, 0:300:2]
+        backends = ["scipy"] + ([] if numba is None else ["numba"])
+        for backend in backends:
+            dec = halfband.HalfbandDecimator(
+                self.a0, self.a1, n_channels=2, backend=backend
+            )
+            for branch in (dec._branch0, dec._branch1):
+                self.assertIsInstance(branch, filtering.AllpassFilter)
+                self.assertEqual(branch.backend, backend)
+            np.testing.assert_allclose(dec.process(x), y_ref, atol=1e-12)
+        dec = halfband.HalfbandDecimator(self.a0, self.a1)
+        self.assertEqual(dec._branch0.backend, "scipy" if numba is None else "numba")
+
+    def test_reset(self):
+        x = self.rng.standard_normal(64)
+        dec = halfband.HalfbandDecimator(self.a0, self.a1)
+        y = dec.process(x)
+        dec.reset()
+        np.testing.assert_array_equal(dec.process(x), y)
+
+    def test_channel_mismatch(self):
+        dec = halfband.HalfbandDecimator(self.a0, self.a1, n_channels=2)
+        with self.assertRaises(ValueError):
+            dec.process(np.zeros((3, 16)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+
+import numpy as np
+from scipy import signal
+from filterdesign import emqf, hilbert
+
+
+class TestHilbertTransformer(unittest.TestCase):
+    TEST_SET = [
+        dict(N=7, stopband_attenuation=60),
+        dict(N=11, stopband_attenuation=70),
+        dict(N=13, stopband_attenuation=70),
+    ]
+
+    def test_rejects_negative_frequencies(self):
+        x = np.zeros(1 << 14)
+        x[0] = 1.0
+        f = np.fft.fftfreq(len(x))
+        positive = (f > 0.05) & (f < 0.45)
+        for kwargs in __class__.TEST_SET:
+            h = np.fft.fft(hilbert.HilbertTransformer(**kwargs).process(x))
+            np.testing.assert_allclose(np.abs(h[positive]), 2.0, atol=1e-3)
+
+            # stopband edge of the half-band lowpass, shifted by fs/4
+            xi = emqf.selectivity_factor(kwargs["N"], kwargs["stopband_attenuation"])
+            f_s = np.arctan(np.sqrt(xi)) / np.pi
+            negative = (f > f_s - 0.75) & (f < 0.25 - f_s)
+            attenuation = kwargs["stopband_attenuation"] - 0.1
+            self.assertLess(
+                np.max(np.abs(h[negative])), 2.0 * 10 ** (-attenuation / 20)
+            )
+
+    def test_envelope(self):
+        # amplitude modulated tone, compare envelope with scipy.signal.hilbert
+        n = np.arange(8000)
+        envelope = 1.0 + 0.5 * np.sin(2 * np.pi * 0.0002 * n)
+        x = envelope * np.cos(2 * np.pi * 0.1 * n)
+
+        y = hilbert.HilbertTransformer(N=11, stopband_attenuation=70).process(x)
+        y_ = signal.hilbert(x)
+        np.testing.assert_allclose(
+            np.abs(y[1000:-1000]), envelope[1000:-1000], atol=5e-3
+        )
+        np.testing.assert_allclose(
+            np.abs(y[1000:-1000]), np.abs(y_[1000:-1000]), atol=5e-3
+        )
+
+    def test_block_processing(self):
+        x = np.random.default_rng(5).standard_normal((2, 500))
+        y_ref = hilbert.HilbertTransformer(n_channels=2).process(x)
+
+        ht = hilbert.HilbertTransformer(n_channels=2)
+        out = np.empty((2, 50), dtype=complex)
+        blocks = [
+            ht.process(x[:, i : i + 50], out=out).copy() for i in range(0, 500, 50)
+        ]
+        np.testing.assert_allclose(np.concatenate(blocks, axis=1), y_ref)
+
+    def test_even_order(self):
+        with self.assertRaises(ValueError):
+            hilbert.hilbert_sos(N=8)
+
+
+if __name__ == "__main__":
+    unittest.main()
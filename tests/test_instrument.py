@@ -0,0 +1,89 @@
+import json
+import threading
+import unittest
+
+import filterdesign
+from filterdesign import emqf, filterutils, instrument
+
+
+class TestInstrument(unittest.TestCase):
+    def tearDown(self):
+        instrument.disable()
+        instrument.reset()
+
+    def test_recording(self):
+        original = emqf.emqf_sos
+        with instrument.recording() as stats:
+            self.assertTrue(instrument.is_enabled())
+            self.assertIsNot(emqf.emqf_sos, original)
+            emqf.emqf_sos(9, 1000.0, fs=48000.0)
+            emqf.emqf_sos(5, 1000.0, fs=48000.0, btype="highpass")
+        self.assertFalse(instrument.is_enabled())
+        self.assertIs(emqf.emqf_sos, original)
+
+        self.assertEqual(stats["emqf.emqf_sos"]["calls"], 2)
+        self.assertEqual(stats["emqf.emqf_sos"]["bytes"], (5 + 3) * 6 * 8)
+        for stage in (
+            "emqf.selectivity_factor",
+            "emqf.ellipj",
+            "filterutils.analog_zpk_response",
+        ):
+            self.assertEqual(stats[stage]["calls"], 2, stage)
+        # the nome of the discrimination modulus takes K(m) and K(1 - m)
+        self.assertEqual(stats["emqf.ellipkm1"]["calls"], 4)
+
+        # inclusive time covers the instrumented callees
+        total = stats["emqf.emqf_sos"]
+        self.assertLessEqual(total["self_seconds"], total["seconds"])
+        self.assertGreaterEqual(
+            total["seconds"], stats["emqf.selectivity_factor"]["seconds"]
+        )
+
+        self.assertEqual(json.loads(instrument.to_json()), stats)
+
+    def test_package_attributes(self):
+        filterdesign.emqfap  # cached by the lazy loader
+        instrument.enable()
+        filterdesign.emqfap(5, 60)
+        filterutils.cascade(emqf.emqfap(3), emqf.emqfap(3))
+        instrument.disable()
+        self.assertIs(filterdesign.emqfap, emqf.emqfap)
+
+        stats = instrument.snapshot()
+        self.assertEqual(stats["emqf.emqfap"]["calls"], 3)
+        self.assertEqual(stats["filterutils.cascade"]["calls"], 1)
+
+        # statistics are kept until reset
+        emqf.emqfap(5, 60)
+        self.assertEqual(instrument.snapshot()["emqf.emqfap"]["calls"], 3)
+        instrument.reset()
+        self.assertEqual(instrument.snapshot(), {})
+
+    def test_threads(self):
+        names = [p[5:] for p in instrument.STAGES if p.startswith("emqf.")]
+        originals = {name: getattr(emqf, name) for name in names}
+
+        def toggle():
+            for _ in range(200):
+                instrument.enable()
+                instrument.disable()
+
+        threads = [threading.Thread(target=toggle) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertFalse(instrument.is_enabled())
+        for name, original in originals.items():
+            self.assertIs(getattr(emqf, name), original, name)
+
+    def test_exceptions(self):
+        with instrument.recording() as stats:
+            with self.assertRaises(ValueError):
+                emqf.emqf_sos(5, 30000.0, fs=48000.0)
+        self.assertEqual(stats["emqf.emqf_sos"]["calls"], 1)
+        self.assertEqual(stats["emqf.emqf_sos"]["bytes"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
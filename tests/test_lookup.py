@@ -0,0 +1,79 @@
+import io
+import unittest
+
+import numpy as np
+from scipy import signal
+from filterdesign import emqf
+from filterdesign import lookup
+
+
+def _max_pole_radius(sos):
+    return max(np.max(np.abs(np.roots(row[3:]))) for row in sos)
+
+
+class TestCoefficientTable(unittest.TestCase):
+    FREQUENCIES = np.geomspace(1e-5, 0.499, 200)
+
+    def check_accuracy(self, table, design):
+        midpoints = np.sqrt(table.cutoffs[:-1] * table.cutoffs[1:])
+        for cutoff in midpoints[::50]:
+            sos = table.lookup(cutoff * 48000, fs=48000)
+            if table.kind == "allpass":
+                sos = np.concatenate(sos)
+            _, h = signal.sosfreqz(sos, __class__.FREQUENCIES, fs=1.0)
+            _, h_direct = signal.sosfreqz(design(cutoff), __class__.FREQUENCIES, fs=1.0)
+            np.testing.assert_allclose(h, h_direct, atol=1e-3)
+            self.assertLess(_max_pole_radius(sos), 1.0)
+
+    def test_lowpass_and_highpass(self):
+        for btype in ("lowpass", "highpass"):
+            table = lookup.CoefficientTable(N=6, kind=btype)
+            self.assertEqual(table.n_sections, 3)
+            self.check_accuracy(
+                table, lambda f: emqf.emqf_sos(6, f, fs=1.0, btype=btype)
+            )
+
+    def test_allpass(self):
+        for N in (5, 7):
+            table = lookup.CoefficientTable(N=N, kind="allpass")
+            self.check_accuracy(
+                table, lambda f: np.concatenate(emqf.emqf_allpass_pair(N, f, fs=1.0))
+            )
+            sos0, sos1 = table.lookup(0.01234)
+            sos0_, sos1_ = emqf.emqf_allpass_pair(N, 0.01234, fs=1.0)
+            self.assertTupleEqual(sos0.shape, sos0_.shape)
+            self.assertTupleEqual(sos1.shape, sos1_.shape)
+            _, h = signal.sosfreqz(sos1, __class__.FREQUENCIES, fs=1.0)
+            np.testing.assert_allclose(np.abs(h), 1.0)
+
+    def test_stable_everywhere(self):
+        table = lookup.CoefficientTable(N=9, n_points=64, f_min=1e-5)
+        out = np.empty((5, 6))
+        for cutoff in np.random.default_rng(0).uniform(1e-5, 0.45, 200):
+            self.assertIs(table.lookup(cutoff, out=out), out)
+            self.assertLess(_max_pole_radius(out), 1.0)
+        np.testing.assert_array_equal(table.lookup(0.45), table.sos[-1])
+        np.testing.assert_array_equal(table.lookup(1e-5), table.sos[0])
+
+    def test_save_load(self):
+        table = lookup.CoefficientTable(N=5, kind="allpass", n_points=16)
+        f = io.BytesIO()
+        table.save(f)
+        f.seek(0)
+        loaded = lookup.CoefficientTable.load(f)
+        self.assertEqual(loaded.kind, "allpass")
+        for a, b in zip(loaded.lookup(0.1), table.lookup(0.1)):
+            np.testing.assert_array_equal(a, b)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            lookup.CoefficientTable(N=5, kind="bandpass")
+        with self.assertRaises(ValueError):
+            lookup.CoefficientTable(N=5, f_max=0.5)
+        table = lookup.CoefficientTable(N=5, n_points=4)
+        with self.assertRaises(ValueError):
+            table.lookup(0.46)
+
+
+if __name__ == "__main__":
+    unittest.main()
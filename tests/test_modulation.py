@@ -0,0 +1,68 @@
+import unittest
+
+import numpy as np
+from filterdesign import emqf, filtering, modulation
+
+
+class TestModulatedEMQF(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(8)
+
+    def test_static(self):
+        x = self.rng.standard_normal((2, 1000))
+        for btype in ("lowpass", "highpass"):
+            filt = modulation.ModulatedEMQF(
+                7, 1000.0, fs=48000.0, btype=btype, n_channels=2
+            )
+            sos = emqf.emqf_sos(7, 1000.0, 48000.0, btype=btype)
+            y_ref = filtering.SosFilter(sos, n_channels=2).process(x)
+            y = np.concatenate(
+                [
+                    filt.process(x[:, :300]),
+                    filt.process(x[:, 300:600], cutoff=1000.0),
+                    filt.process(x[:, 600:], cutoff=np.full(400, 1000.0)),
+                ],
+                axis=1,
+            )
+            np.testing.assert_allclose(y, y_ref, atol=1e-12)
+
+    def test_modulation(self):
+        filt = modulation.ModulatedEMQF(9, 1000.0, fs=48000.0)
+        x = self.rng.standard_normal(4000)
+        cutoffs = np.exp(self.rng.uniform(np.log(20.0), np.log(20000.0), 4000))
+        y = filt.process(x, cutoff=cutoffs)
+        self.assertEqual(filt.cutoff, cutoffs[-1])
+        # both branches are lossless, the output energy is bounded
+        self.assertLessEqual(np.sum(y**2), np.sum(x**2))
+
+        # a sweep in blocks leaves a sine in the passband untouched
+        filt = modulation.ModulatedEMQF(9, 2000.0, fs=48000.0)
+        t = np.arange(48000) / 48000.0
+        x = np.sin(2 * np.pi * 100.0 * t)
+        blocks = np.split(x, 375)
+        cutoffs = np.geomspace(2000.0, 8000.0, len(blocks))
+        y = np.concatenate([filt.process(b, f) for b, f in zip(blocks, cutoffs)])
+        envelope = np.max(np.abs(y[4800:]).reshape(-1, 480), axis=1)
+        np.testing.assert_allclose(envelope, 1.0, atol=1e-3)
+        # no clicks at the block boundaries
+        slope = np.max(np.abs(np.diff(x)))
+        self.assertLess(np.max(np.abs(np.diff(y[4800:]))), 1.01 * slope)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            modulation.ModulatedEMQF(4, 0.1)
+        with self.assertRaises(ValueError):
+            modulation.ModulatedEMQF(5, 0.1, btype="bandpass")
+        filt = modulation.ModulatedEMQF(5, 0.1)
+        with self.assertRaises(ValueError):
+            filt.process(np.zeros(4), cutoff=np.full(3, 0.1))
+        with self.assertRaises(ValueError):
+            filt.process(np.zeros(4), cutoff=1.5)
+        with self.assertRaises(ValueError):
+            filt.process(np.zeros(0), cutoff=0.2)
+        # the cutoff only changes with the coefficients
+        self.assertEqual(filt.cutoff, 0.1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,163 @@
+import unittest
+
+import numpy as np
+from filterdesign import oversampling
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+def _allpass(a, z):
+    h = np.ones_like(z)
+    for a_i in a:
+        h *= (a_i + 1 / z) / (1 + a_i / z)
+    return h
+
+
+def _spectrum_db(x):
+    window = np.blackman(len(x))
+    magnitude = np.abs(np.fft.rfft(x * window))
+    return 20 * np.log10(magnitude / np.max(magnitude) + 1e-300)
+
+
+class TestHalfbandStages(unittest.TestCase):
+    def test_orders(self):
+        stages = oversampling.halfband_stages(8, passband=0.4)
+        self.assertEqual(len(stages), 3)
+        # later stages have wider transition bands and need fewer sections
+        n_sections = [len(a0) + len(a1) for a0, a1 in stages]
+        self.assertEqual(n_sections, sorted(n_sections, reverse=True))
+        self.assertLess(n_sections[-1], n_sections[0])
+
+    def test_allocation(self):
+        for factor, stopband_attenuation in ((2, 60), (8, 60), (8, 97), (16, 120)):
+            stages = oversampling.halfband_stages(factor, 0.4, stopband_attenuation)
+            leakage = 0.0
+            for k, (a0, a1) in enumerate(stages, start=1):
+                # stopband of stage k at its own sampling rate
+                f = np.linspace(0.5 - 0.4 / 2**k, 0.5, 2000)
+                z = np.exp(2j * np.pi * f)
+                h = 0.5 * (_allpass(a0, z**2) + _allpass(a1, z**2) / z)
+                leakage += np.max(np.abs(h)) ** 2
+            self.assertLessEqual(leakage, 10 ** (-stopband_attenuation / 10) * 1.001)
+
+        # the last, fastest stage is spared by raising the cheaper ones
+        stages = oversampling.halfband_stages(8, 0.4, 60)
+        orders = [2 * (len(a0) + len(a1)) + 1 for a0, a1 in stages]
+        self.assertListEqual(orders, [11, 7, 3])
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            oversampling.halfband_stages(6)
+        with self.assertRaises(ValueError):
+            oversampling.halfband_stages(1)
+        with self.assertRaises(ValueError):
+            oversampling.halfband_stages(2, passband=0.5)
+
+
+class TestUpsampler(unittest.TestCase):
+    def test_images(self):
+        for factor in (2, 4, 8):
+            upsampler = oversampling.Upsampler(factor, stopband_attenuation=80)
+            x = np.sin(2 * np.pi * 0.11 * np.arange(4096))
+            y = upsampler.process(x)[factor * 512 :]
+            self.assertEqual(len(y), factor * 3584)
+
+            spectrum = _spectrum_db(y)
+            f = np.fft.rfftfreq(len(y))
+            self.assertLess(np.max(spectrum[f > 0.5 / factor]), -75)
+            # unity passband gain
+            self.assertAlmostEqual(np.max(np.abs(y)), 1.0, places=2)
+
+    def test_streaming(self):
+        rng = np.random.default_rng(3)
+        upsampler = oversampling.Upsampler(4, n_channels=3)
+        x = rng.standard_normal((3, 1000))
+        y = upsampler.process(x)
+        self.assertEqual(y.shape, (3, 4000))
+
+        upsampler.reset()
+        blocks = np.split(x, [1, 17, 400], axis=1)
+        y_blocks = np.concatenate([upsampler.process(b) for b in blocks], axis=1)
+        np.testing.assert_allclose(y_blocks, y, atol=1e-12)
+
+    def test_latency(self):
+        upsampler = oversampling.Upsampler(4)
+        impulse = np.zeros(2048)
+        impulse[0] = 1.0
+        h = upsampler.process(impulse)
+        # group delay at a low frequency, converted to input samples
+        w = 2 * np.pi * np.array([1e-3, 1.01e-3])
+        H = np.exp(-1j * np.outer(w, np.arange(len(h)))) @ h
+        delay = -np.angle(H[1] / H[0]) / (w[1] - w[0])
+        self.assertAlmostEqual(delay / 4, upsampler.latency, places=3)
+
+    def test_backends(self):
+        rng = np.random.default_rng(5)
+        x = rng.standard_normal((2, 256))
+        y_ref = oversampling.Upsampler(4, n_channels=2, backend="scipy").process(x)
+        backends = ["scipy"] + ([] if numba is None else ["numba"])
+        for backend in backends:
+            upsampler = oversampling.Upsampler(4, n_channels=2, backend=backend)
+            downsampler = oversampling.Downsampler(4, n_channels=2, backend=backend)
+            np.testing.assert_allclose(upsampler.process(x), y_ref, atol=1e-12)
+            n_sections = sum(
+                (len(a0) + len(a1)) * 2**k
+                for k, (a0, a1) in enumerate(upsampler.stages)
+            )
+            # one multiply per first-order all-pass section, five per biquad
+            per_section = 1 if backend == "numba" else 5
+            for resampler in (upsampler, downsampler):
+                self.assertEqual(resampler.backend, backend)
+                self.assertEqual(
+                    resampler.multiplies_per_sample, per_section * n_sections
+                )
+
+    def test_channels(self):
+        upsampler = oversampling.Upsampler(2, n_channels=2)
+        with self.assertRaises(ValueError):
+            upsampler.process(np.zeros((3, 16)))
+
+
+class TestDownsampler(unittest.TestCase):
+    def test_aliases(self):
+        for factor in (2, 4, 8):
+            downsampler = oversampling.Downsampler(factor, stopband_attenuation=80)
+            n = 4096 * factor
+            # one tone in the passband and one that would alias
+            t = np.arange(n)
+            x = np.sin(2 * np.pi * 0.1 / factor * t)
+            x += np.sin(2 * np.pi * (1 - 0.3 / factor) * 0.5 * t)
+            y = downsampler.process(x)[512:]
+            self.assertEqual(len(y), 3584)
+
+            spectrum = _spectrum_db(y)
+            f = np.fft.rfftfreq(len(y))
+            self.assertLess(np.max(spectrum[np.abs(f - 0.1) > 0.01]), -75)
+
+    def test_roundtrip(self):
+        rng = np.random.default_rng(4)
+        upsampler = oversampling.Upsampler(8, n_channels=2)
+        downsampler = oversampling.Downsampler(8, n_channels=2)
+        x = rng.standard_normal((2, 512))
+        self.assertAlmostEqual(downsampler.latency, upsampler.latency)
+
+        # odd block lengths are buffered until a full output sample exists
+        y = upsampler.process(x)
+        blocks = np.split(y, [3, 1001, 1002], axis=1)
+        z = np.concatenate([downsampler.process(b) for b in blocks], axis=1)
+        self.assertEqual(z.shape, (2, 512))
+
+        # unity gain of the roundtrip in the passband
+        impulse = np.zeros(1 << 14)
+        impulse[0] = 1.0
+        upsampler, downsampler = oversampling.Upsampler(8), oversampling.Downsampler(8)
+        h = np.fft.rfft(downsampler.process(upsampler.process(impulse)))
+        f = np.fft.rfftfreq(len(h) * 2 - 2)
+        np.testing.assert_allclose(np.abs(h[f < 0.4]), 1.0, atol=1e-3)
+
+
+if __name__ == "__main__":
+    unittest.main()
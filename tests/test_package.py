@@ -0,0 +1,34 @@
+import subprocess
+import sys
+import unittest
+
+import filterdesign
+
+
+class TestLazyImports(unittest.TestCase):
+    def test_import_is_lightweight(self):
+        code = (
+            "import sys, filterdesign; "
+            "filterdesign.emqf.emqfap(5, 60); "
+            "print(','.join(m for m in ('scipy.signal', 'matplotlib') "
+            "if m in sys.modules))"
+        )
+        output = subprocess.run(
+            [sys.executable, "-c", code], check=True, capture_output=True, text=True
+        ).stdout
+        self.assertEqual(output.strip(), "")
+
+    def test_attributes(self):
+        from filterdesign import emqf
+
+        self.assertIs(filterdesign.emqfap, emqf.emqfap)
+        self.assertIs(filterdesign.emqf, emqf)
+        self.assertIn("response", dir(filterdesign))
+        for name in filterdesign.__all__:
+            self.assertTrue(hasattr(filterdesign, name), name)
+        with self.assertRaises(AttributeError):
+            filterdesign.does_not_exist
+
+
+if __name__ == "__main__":
+    unittest.main()
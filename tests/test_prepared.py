@@ -0,0 +1,84 @@
+import unittest
+
+import numpy as np
+from scipy import signal
+from filterdesign import emqf, prepared
+
+
+class TestPreparedDesign(unittest.TestCase):
+    def test_sos(self):
+        for N in (1, 2, 5, 8, 33, 64):
+            design = prepared.PreparedDesign(N, stopband_attenuation=70)
+            for btype in ("lowpass", "highpass"):
+                for cutoff in (10.0, 1000.0, 20000.0):
+                    expected = emqf.emqf_sos(
+                        N, cutoff, 48000.0, btype=btype, stopband_attenuation=70
+                    )
+                    sos = design.sos(cutoff, fs=48000.0, btype=btype)
+                    np.testing.assert_allclose(sos, expected, rtol=1e-9, atol=1e-12)
+
+    def test_scalar_types(self):
+        design = prepared.PreparedDesign(7)
+        expected = design.sos(1000.0, fs=48000.0)
+        for cutoff in (1000, np.float32(1000.0), np.array(1000.0)):
+            sos = design.sos(cutoff, fs=48000.0)
+            self.assertTupleEqual(sos.shape, (design.n_sections, 6))
+            np.testing.assert_allclose(sos, expected, rtol=1e-12)
+        out = np.empty((design.n_sections, 6))
+        self.assertIs(design.sos(1000.0, fs=48000.0, out=out), out)
+        np.testing.assert_array_equal(out, expected)
+
+    def test_batch(self):
+        design = prepared.PreparedDesign(7)
+        cutoffs = np.geomspace(0.001, 0.49, 12).reshape(3, 4)
+        out = np.empty((3, 4, design.n_sections, 6))
+        sos = design.sos(cutoffs, fs=1.0, btype="highpass", out=out)
+        self.assertIs(sos, out)
+        for index in np.ndindex(cutoffs.shape):
+            expected = emqf.emqf_sos(7, cutoffs[index], 1.0, btype="highpass")
+            np.testing.assert_allclose(sos[index], expected, rtol=1e-9, atol=1e-12)
+
+    def test_allpass_pair(self):
+        for N in (3, 9, 31):
+            design = prepared.PreparedDesign(N, stopband_attenuation=80)
+            cutoffs = np.array([0.001, 0.1, 0.45])
+            sos0, sos1 = design.allpass_pair(cutoffs, fs=1.0)
+            for i, cutoff in enumerate(cutoffs):
+                expected = emqf.emqf_allpass_pair(N, cutoff, 1.0, 80)
+                np.testing.assert_allclose(sos0[i], expected[0], atol=1e-12)
+                np.testing.assert_allclose(sos1[i], expected[1], atol=1e-12)
+                for sos, sos_ in zip(design.allpass_pair(cutoff, fs=1.0), expected):
+                    np.testing.assert_allclose(sos, sos_, atol=1e-12)
+        with self.assertRaises(ValueError):
+            prepared.PreparedDesign(4).allpass_pair(0.1)
+
+    def test_zpk(self):
+        for N in (4, 5):
+            design = prepared.PreparedDesign(N)
+            z, p, k = design.zpk([2.0, 30.0], btype="highpass")
+            for i, wc in enumerate([2.0, 30.0]):
+                z_, p_, k_ = signal.lp2hp_zpk(design.z, design.p, design.k, wc)
+                np.testing.assert_allclose(np.sort_complex(z[i]), np.sort_complex(z_))
+                np.testing.assert_allclose(np.sort_complex(p[i]), np.sort_complex(p_))
+                self.assertAlmostEqual(k[i], k_)
+
+            z, p, k = design.zpk(3.0)
+            z_, p_, k_ = signal.lp2lp_zpk(design.z, design.p, design.k, 3.0)
+            np.testing.assert_allclose(z, z_)
+            np.testing.assert_allclose(p, p_)
+            self.assertAlmostEqual(k, k_)
+
+    def test_invalid(self):
+        design = prepared.PreparedDesign(5)
+        with self.assertRaises(ValueError):
+            design.sos(1.0, fs=2.0)
+        with self.assertRaises(ValueError):
+            design.sos([0.1, 0.0])
+        with self.assertRaises(ValueError):
+            design.sos(0.1, btype="bandpass")
+        with self.assertRaises(ValueError):
+            design.sos(0.1, out=np.empty((2, 6)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+
+import numpy as np
+from scipy import signal
+from filterdesign import qmf
+
+
+def _upsampled_sosfilt(sos, x, M):
+    phases = x.reshape(x.shape[0], -1, M).transpose(0, 2, 1)
+    y = signal.sosfilt(sos, phases, axis=-1)
+    return y.transpose(0, 2, 1).reshape(x.shape)
+
+
+class TestOctaveFilterbank(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(5)
+
+    def expected_reconstruction(self, fb, x):
+        y = x
+        for j in range(fb.levels):
+            y = _upsampled_sosfilt(fb.transfer_sos(), y, 2**j)
+        return y
+
+    def test_reconstruction(self):
+        fb = qmf.OctaveFilterbank(levels=4, N=7, n_channels=3)
+        x = self.rng.standard_normal((3, 4096))
+        bands = fb.analysis(x)
+        self.assertListEqual(
+            [b.shape for b in bands],
+            [(3, 2048), (3, 1024), (3, 512), (3, 256), (3, 256)],
+        )
+        y = fb.synthesis(bands)
+        error = np.max(np.abs(y - self.expected_reconstruction(fb, x)))
+        self.assertLess(error, 1e-12)
+
+        # the reconstruction is all-pass
+        impulse = np.zeros((3, 1 << 14))
+        impulse[:, 0] = 1.0
+        fb.reset()
+        h = np.fft.rfft(fb.synthesis(fb.analysis(impulse))[0])
+        np.testing.assert_allclose(np.abs(h), 1.0, atol=1e-6)
+
+    def test_streaming(self):
+        fb = qmf.OctaveFilterbank(levels=3, N=9)
+        x = self.rng.standard_normal(2048)
+        y = fb.synthesis(fb.analysis(x))
+
+        fb.reset()
+        blocks = np.split(x, [8, 64, 72, 1024])
+        y_blocks = [fb.synthesis(fb.analysis(block)) for block in blocks]
+        np.testing.assert_allclose(np.concatenate(y_blocks), y, atol=1e-13)
+
+    def test_band_separation(self):
+        fb = qmf.OctaveFilterbank(levels=3, N=9, stopband_attenuation=70)
+        n = np.arange(8192)
+        # centre frequencies of the bands as fraction of fs
+        for band, f in enumerate([0.35, 0.18, 0.09, 0.03]):
+            fb.reset()
+            bands = fb.analysis(np.sin(2 * np.pi * f * n))
+            energy = [np.mean(b[len(b) // 2 :] ** 2) for b in bands]
+            self.assertEqual(np.argmax(energy), band)
+            self.assertLess(np.sort(energy)[-2], 1e-5 * energy[band])
+
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            qmf.OctaveFilterbank(levels=0)
+        with self.assertRaises(ValueError):
+            qmf.OctaveFilterbank(levels=2, N=6)
+        fb = qmf.OctaveFilterbank(levels=2, n_channels=2)
+        with self.assertRaises(ValueError):
+            fb.analysis(np.zeros((2, 6)))
+        with self.assertRaises(ValueError):
+            fb.analysis(np.zeros((1, 8)))
+        with self.assertRaises(ValueError):
+            fb.synthesis(fb.analysis(np.zeros((2, 8)))[:2])
+
+
+if __name__ == "__main__":
+    unittest.main()
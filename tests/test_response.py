@@ -0,0 +1,104 @@
+import unittest
+
+import numpy as np
+from scipy import signal
+from filterdesign import emqf
+from filterdesign import hilbert
+from filterdesign import response
+
+
+class TestZpkResponse(unittest.TestCase):
+    def test_analog(self):
+        zpk = emqf.emqfap(N=9, stopband_attenuation=60, f3db=True)
+        w = np.logspace(-2, 2, 1000)
+        magnitude, phase, group_delay = response.zpk_response(zpk, w)
+        _, h = signal.freqs_zpk(*zpk, worN=w)
+        np.testing.assert_allclose(magnitude, np.abs(h), rtol=1e-10, atol=1e-14)
+        np.testing.assert_allclose(np.exp(1j * phase), h / np.abs(h), atol=1e-10)
+
+        # group delay is the derivative of the phase
+        w = np.linspace(0.01, 1.2, 20001)
+        _, phase, group_delay = response.zpk_response(zpk, w)
+        np.testing.assert_allclose(
+            group_delay[5:-5], -np.gradient(phase, w)[5:-5], atol=1e-5
+        )
+
+    def test_digital(self):
+        sos = emqf.emqf_sos(7, 1000, fs=48000)
+        z, p, k = signal.sos2zpk(sos)
+        f = np.linspace(0, 24000, 2001)
+        magnitude, phase, group_delay = response.zpk_response((z, p, k), f, fs=48000)
+        _, h = signal.freqz_zpk(z, p, k, worN=f, fs=48000)
+        np.testing.assert_allclose(magnitude, np.abs(h), rtol=1e-9, atol=1e-14)
+        mask = magnitude > 1e-6
+        np.testing.assert_allclose(
+            np.exp(1j * phase[mask]), (h / np.abs(h))[mask], atol=1e-9
+        )
+
+    def test_batch(self):
+        orders = [3, 5, 8]
+        attenuations = [40, 60, 80]
+        zpk = emqf.emqfap_batch(orders, attenuations)
+        w = np.logspace(-1, 1, 100)
+        magnitude, phase, group_delay = response.zpk_response(zpk, w, chunk_size=7)
+        self.assertTupleEqual(magnitude.shape, (3, 100))
+        for N, a_s, m in zip(orders, attenuations, magnitude):
+            _, h = signal.freqs_zpk(*emqf.emqfap(N, a_s), worN=w)
+            np.testing.assert_allclose(m, np.abs(h), rtol=1e-10, atol=1e-14)
+
+    def test_high_order(self):
+        zpk = emqf.emqfap(N=64, stopband_attenuation=60, f3db=True)
+        magnitude, _, _ = response.zpk_response(zpk, [1.0, 1e3, 1e6])
+        self.assertTrue(np.all(np.isfinite(magnitude)))
+        self.assertAlmostEqual(magnitude[0], np.sqrt(0.5), places=6)
+
+
+class TestSosResponse(unittest.TestCase):
+    def test_matches_sosfreqz(self):
+        sos = emqf.emqf_sos(8, 1000, fs=48000, btype="highpass")
+        f = np.linspace(0, 24000, 2001)
+        magnitude, phase, group_delay = response.sos_response(sos, f, fs=48000)
+        _, h = signal.sosfreqz(sos, worN=f, fs=48000)
+        np.testing.assert_allclose(magnitude, np.abs(h), rtol=1e-9, atol=1e-14)
+
+        _, _, group_delay_zpk = response.zpk_response(signal.sos2zpk(sos), f, fs=48000)
+        mask = magnitude > 1e-3
+        np.testing.assert_allclose(group_delay[mask], group_delay_zpk[mask], atol=1e-8)
+
+    def test_allpass_and_delay(self):
+        # the imaginary branch contains a pure delay section
+        f = np.linspace(100, 20000, 20001)
+        for sos in hilbert.hilbert_sos(7):
+            magnitude, phase, group_delay = response.sos_response(sos, f, fs=48000)
+            _, h = signal.sosfreqz(sos, worN=f, fs=48000)
+            np.testing.assert_allclose(magnitude, 1.0)
+            np.testing.assert_allclose(np.exp(1j * phase), h, atol=1e-12)
+            self.assertLess(np.max(np.abs(np.diff(phase))), 0.1)  # continuous
+            theta = 2 * np.pi * f / 48000
+            np.testing.assert_allclose(
+                group_delay[5:-5], -np.gradient(phase, theta)[5:-5], rtol=1e-5
+            )
+
+    def test_batch(self):
+        sos = np.stack([emqf.emqf_sos(6, fc, fs=48000) for fc in (500, 1000)])
+        magnitude, _, _ = response.sos_response(sos, [500, 1000], fs=48000)
+        self.assertTupleEqual(magnitude.shape, (2, 2))
+        np.testing.assert_allclose(np.diag(magnitude), np.sqrt(0.5), rtol=1e-6)
+
+    def test_empty_cascade(self):
+        for sos in (np.zeros((0, 6)), np.zeros((2, 0, 6))):
+            magnitude, phase, group_delay = response.sos_response(sos, [0.1, 0.5])
+            self.assertTupleEqual(magnitude.shape, sos.shape[:-2] + (2,))
+            np.testing.assert_array_equal(magnitude, 1.0)
+            np.testing.assert_array_equal(phase, 0.0)
+            np.testing.assert_array_equal(group_delay, 0.0)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            response.sos_response(np.ones(6), [0.1])
+        with self.assertRaises(ValueError):
+            response.sos_response(np.ones((1, 6)), [0.1], chunk_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from filterdesign import emqf
+from filterdesign import sweep
+
+
+class _Interrupt(Exception):
+    pass
+
+
+class TestDesignSweep(unittest.TestCase):
+    GRID = dict(
+        N=[3, 4, 7],
+        stopband_attenuation=[40, 60],
+        cutoff=[1000, 30000],
+        fs=[48000, 96000],
+    )
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.tmp.name, "table")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def check_table(self, table):
+        self.assertTrue(np.all(table["done"]))
+        self.assertTupleEqual(table["sos"].shape, (24, 4, 6))
+        for i in range(24):
+            N = int(table["N"][i])
+            fs, cutoff = table["fs"][i], table["cutoff"][i]
+            sos = table["sos"][i]
+            if cutoff >= fs / 2:
+                self.assertTrue(np.all(np.isnan(sos)))
+                continue
+            expected = emqf.emqf_sos(
+                N, cutoff, fs=fs, stopband_attenuation=table["stopband_attenuation"][i]
+            )
+            np.testing.assert_array_equal(sos[: len(expected)], expected)
+            np.testing.assert_array_equal(sos[len(expected) :, 0], 1.0)
+
+    def test_serial(self):
+        infos = list()
+        table = sweep.design_sweep(
+            self.directory,
+            chunk_size=5,
+            processes=0,
+            progress=infos.append,
+            **__class__.GRID,
+        )
+        self.check_table(table)
+        self.assertEqual(len(infos), 5)
+        self.assertEqual(infos[-1]["n_done"], 5)
+        self.assertEqual(infos[-1]["n_chunks"], 5)
+
+    def test_pool(self):
+        table = sweep.design_sweep(
+            self.directory, chunk_size=7, processes=2, **__class__.GRID
+        )
+        self.check_table(table)
+        self.check_table(sweep.load_sweep(self.directory))
+
+    def test_resume(self):
+        def interrupt(info):
+            if info["n_done"] == 2:
+                raise _Interrupt()
+
+        with self.assertRaises(_Interrupt):
+            sweep.design_sweep(
+                self.directory,
+                chunk_size=5,
+                processes=0,
+                progress=interrupt,
+                **__class__.GRID,
+            )
+        self.assertEqual(np.count_nonzero(sweep.load_sweep(self.directory)["done"]), 2)
+
+        infos = list()
+        table = sweep.design_sweep(
+            self.directory,
+            chunk_size=5,
+            processes=0,
+            progress=infos.append,
+            **__class__.GRID,
+        )
+        self.assertEqual([info["chunk"] for info in infos], [2, 3, 4])
+        self.check_table(table)
+
+        grid = dict(__class__.GRID, N=[3, 5])
+        with self.assertRaises(ValueError):
+            sweep.design_sweep(self.directory, chunk_size=5, processes=0, **grid)
+        table = sweep.design_sweep(
+            self.directory, chunk_size=5, processes=0, resume=False, **grid
+        )
+        self.assertEqual(len(table["N"]), 16)
+
+
+if __name__ == "__main__":
+    unittest.main()